@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 ROOT = Path(__file__).parent.parent
@@ -5,11 +6,17 @@ SRC = ROOT / 'src'
 
 SIMULATION_RUNS = ROOT.parent / "simulation_runs"
 
-RESOURCES = ROOT / 'resources'
+# input files of the simulation (a parameter sweep gives every design point its own copy)
+RESOURCES = Path(os.environ.get("SIMULATION_RESOURCES", ROOT / 'resources'))
 SIMULATION_BASIS_FOR_TOPOLOGIE_MANAGER = RESOURCES/ "simulation_basis_for_topologie_manager"
+# driving distances between the potential positions, keyed by a hash of the layout (see PositionsDistanceMatrix)
+DISTANCE_MATRIX_CACHE = RESOURCES / "distance_matrix_cache"
 
-ANALYSIS_SOLUTION = ROOT / 'analysis_solution'
-SIMULATION_OUTPUT_DATA = ROOT / 'simulation_output_data'
+# every output of one simulation run is written below this root (set per run by the ReplicationRunner)
+SIMULATION_OUTPUT_ROOT = Path(os.environ.get("SIMULATION_OUTPUT_ROOT", ROOT))
+
+ANALYSIS_SOLUTION = SIMULATION_OUTPUT_ROOT / 'analysis_solution'
+SIMULATION_OUTPUT_DATA = SIMULATION_OUTPUT_ROOT / 'simulation_output_data'
 
 ENTITIES_DURING_SIMULATION_DATA = SIMULATION_OUTPUT_DATA / 'entities_during_simulation_data'
 MACHINES_DURING_SIMULATION_DATA = ENTITIES_DURING_SIMULATION_DATA / 'machine'
@@ -29,3 +36,10 @@ MACHINE_WORKLOAD = MACHINE_STATISTICS/ "workload"
 PRODUCTION_TOPOLOGY = ANALYSIS_SOLUTION / "production_topology"
 GENETIC_ALGORITHM = ANALYSIS_SOLUTION / "genetic_algorithm"
 FORCED_DIRECTED_PLACEMENT = ANALYSIS_SOLUTION / "forced_directed_placement"
+
+OUTPUT_DIRECTORIES = [SIMULATION_OUTPUT_DATA, ENTITIES_DURING_SIMULATION_DATA, MACHINES_DURING_SIMULATION_DATA,
+                      TR_DURING_SIMULATION_DATA, WR_DURING_SIMULATION_DATA, SINK_DURING_SIMULATION_DATA,
+                      INTERMEDIATE_STORE_DURING_SIMULATION_DATA, DAILY_PLANS, ANALYSIS_SOLUTION,
+                      GRAPH_PRODUCTION_MATERIAL, MACHINE_STATISTICS, MACHINE_STATISTICS_GRAPH, TR_STATISTICS,
+                      PRODUCT_TRANSPORTING_TIME, WR_STATISTICS, MACHINE_WORKLOAD, PRODUCTION_TOPOLOGY,
+                      GENETIC_ALGORITHM, FORCED_DIRECTED_PLACEMENT]
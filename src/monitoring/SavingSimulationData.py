@@ -15,6 +15,9 @@ from src.entity.transport_robot.transport_robot import TransportRobot
 from src.entity.working_robot.working_robot import WorkingRobot
 from src.monitoring.converting_classes_to_dict.convert_cell_to_dict import ConvertCellToDict
 from src.monitoring.converting_classes_to_dict.convert_order_to_dict import ConvertOrderToDict
+from src.monitoring.columnar_trace import ColumnarTraceWriter, PRODUCT_COLUMN_DTYPE_DICT
+from src.monitoring.delta_trace import DeltaTraceEncoder
+from src.monitoring.trace_writer import TraceWriter, BackgroundTraceWriter
 from src.order_data.order import Order
 from src.order_data.production_material import ProductionMaterial
 from src.process_logic.good_receipt import GoodReceipt
@@ -53,11 +56,47 @@ class SavingSimulationData:
         self.simulation_sink_data_list = []
         self.simulation_intermediate_store_data_list = []
 
-        self.time_variable_machine = 0
-        self.time_variable_tr = 0
-        self.time_variable_wr = 0
-        self.time_variable_sink = 0
-        self.time_variable_intermediate_store = 0
+        self.trace_writer = self.create_trace_writer()
+        # delta trace: only the changed fields of an entity are saved (None -> complete snapshot of every action)
+        self.delta_trace_encoder = None
+        self.trace_name = "trace"
+        if self.production.service_starting_conditions.get_delta_trace():
+            self.delta_trace_encoder = DeltaTraceEncoder()
+            self.trace_name = "delta_trace"
+        # columnar trace: every action is also saved as memory-mappable columns for the analysis
+        self.columnar_trace_writer_dict = {}  # {entity class, ColumnarTraceWriter}
+        self.product_columnar_trace_writer_dict = {}  # {file name of the product data, ColumnarTraceWriter}
+        if self.production.service_starting_conditions.get_columnar_trace():
+            self.columnar_trace_writer_dict = {
+                Machine: ColumnarTraceWriter(MACHINES_DURING_SIMULATION_DATA, "machine"),
+                TransportRobot: ColumnarTraceWriter(TR_DURING_SIMULATION_DATA, "tr"),
+                WorkingRobot: ColumnarTraceWriter(WR_DURING_SIMULATION_DATA, "wr"),
+                Sink: ColumnarTraceWriter(SINK_DURING_SIMULATION_DATA, "sink"),
+                IntermediateStore: ColumnarTraceWriter(INTERMEDIATE_STORE_DURING_SIMULATION_DATA, "intermediate_store")
+            }
+            self.product_columnar_trace_writer_dict = {
+                file_name: ColumnarTraceWriter(SIMULATION_OUTPUT_DATA, file_name, PRODUCT_COLUMN_DTYPE_DICT) for
+                file_name in ["data_finished_products_leaving_production", "data_goods_entering_production"]}
+
+        self.entity_action_listener_list = []  # called with the entity after every saved action
+        self.goods_receipt_listener_list = []  # called with (product group, quantity, time) of every goods receipt
+        self.order_completed_listener_list = []  # called with (product group, quantity, time) of every product leaving
+
+    def create_trace_writer(self) -> TraceWriter | BackgroundTraceWriter:
+        service_starting_conditions = self.production.service_starting_conditions
+        trace_writer = TraceWriter(service_starting_conditions.get_compress_trace())
+        if service_starting_conditions.get_background_trace_writer():
+            return BackgroundTraceWriter(trace_writer, service_starting_conditions.get_trace_queue_size())
+        return trace_writer
+
+    def add_entity_action_listener(self, listener):
+        self.entity_action_listener_list.append(listener)
+
+    def add_goods_receipt_listener(self, listener):
+        self.goods_receipt_listener_list.append(listener)
+
+    def add_order_completed_listener(self, listener):
+        self.order_completed_listener_list.append(listener)
 
     def save_every_entity_identification_str(self):
         self.entities_located = self.production.entities_located.copy()
@@ -76,6 +115,8 @@ class SavingSimulationData:
             cell = self.save_one_cell_from_entity(entity)
 
         self.append_current_data_to_file_during_simulation(cell)
+        for listener in self.entity_action_listener_list:
+            listener(entity)
 
     def save_one_cell_of_every_entity(self):
         self.saving_entity_data_list = []
@@ -101,6 +142,15 @@ class SavingSimulationData:
                 self.convert_cell_to_dict.start_converting_cell_during_simulation(entity_cell)
             ]
         }
+        for entity_class, columnar_trace_writer in self.columnar_trace_writer_dict.items():
+            if isinstance(entity_cell.placed_entity, entity_class):
+                columnar_trace_writer.add_data_entry(data_entry)
+
+        if self.delta_trace_encoder is not None:
+            data_entry = self.delta_trace_encoder.encode(data_entry)
+            if data_entry is None:
+                return
+
         if isinstance(entity_cell.placed_entity, Machine):
             self.simulation_machine_data_list.append(data_entry)
 
@@ -116,108 +166,69 @@ class SavingSimulationData:
         if isinstance(entity_cell.placed_entity, IntermediateStore):
             self.simulation_intermediate_store_data_list.append(data_entry)
 
-    def convert_simulating_machine_data_to_json(self):
-
-        if len(self.simulation_machine_data_list) != 0:
-            data_file_name = f"simulation_machine_run_data_from_{self.time_variable_machine}_sec_to_{self.env.now}_sec.json"
-            output_file = MACHINES_DURING_SIMULATION_DATA / data_file_name
-
-            if not os.path.exists(output_file):
-                with open(output_file, "w") as f:
-                    json.dump([], f)
-
-            with open(output_file, "r") as f:
-                data = json.load(f)
+    def append_closing_records_of_delta_trace(self):
+        """Saves the last unchanged action of every entity, so the delta trace ends at the same time as a complete
+        trace."""
+        entity_type_data_list_dict = {"Machine": self.simulation_machine_data_list,
+                                      "TransportRobot": self.simulation_tr_data_list,
+                                      "WorkingRobot": self.simulation_wr_data_list,
+                                      "Sink": self.simulation_sink_data_list,
+                                      "IntermediateStore": self.simulation_intermediate_store_data_list}
+        for record in self.delta_trace_encoder.get_closing_records():
+            entity_type = record["key"].split(":")[0]
+            entity_type_data_list_dict[entity_type].append(record)
 
-            data.append(self.simulation_machine_data_list)
-
-            with open(output_file, "w") as f:
-                json.dump(data, f, indent=4)
-
-            self.time_variable_machine = self.env.now
-            self.simulation_machine_data_list = []
+    def convert_simulating_machine_data_to_json(self):
+        self.trace_writer.append_records(
+            MACHINES_DURING_SIMULATION_DATA / f"simulation_machine_{self.trace_name}.jsonl",
+            self.simulation_machine_data_list)
+        self.simulation_machine_data_list = []
 
     def convert_simulating_tr_data_to_json(self):
-
-        if len(self.simulation_tr_data_list) != 0:
-            data_file_name = f"simulation_tr_run_data_from_{self.time_variable_tr}_sec_to_{self.env.now}_sec.json"
-            output_file = TR_DURING_SIMULATION_DATA / data_file_name
-
-            if not os.path.exists(output_file):
-                with open(output_file, "w") as f:
-                    json.dump([], f)
-
-            with open(output_file, "r") as f:
-                data = json.load(f)
-
-            data.append(self.simulation_tr_data_list)
-
-            with open(output_file, "w") as f:
-                json.dump(data, f, indent=4)
-
-            self.time_variable_tr = self.env.now
-            self.simulation_tr_data_list = []
+        self.trace_writer.append_records(TR_DURING_SIMULATION_DATA / f"simulation_tr_{self.trace_name}.jsonl",
+                                         self.simulation_tr_data_list)
+        self.simulation_tr_data_list = []
 
     def convert_simulating_wr_data_to_json(self):
-
-        if len(self.simulation_wr_data_list) != 0:
-            data_file_name = f"simulation_wr_run_data_from_{self.time_variable_wr}_sec_to_{self.env.now}_sec.json"
-            output_file = WR_DURING_SIMULATION_DATA / data_file_name
-
-            if not os.path.exists(output_file):
-                with open(output_file, "w") as f:
-                    json.dump([], f)
-
-            with open(output_file, "r") as f:
-                data = json.load(f)
-
-            data.append(self.simulation_wr_data_list)
-
-            with open(output_file, "w") as f:
-                json.dump(data, f, indent=4)
-
-            self.time_variable_wr = self.env.now
-            self.simulation_wr_data_list = []
+        self.trace_writer.append_records(WR_DURING_SIMULATION_DATA / f"simulation_wr_{self.trace_name}.jsonl",
+                                         self.simulation_wr_data_list)
+        self.simulation_wr_data_list = []
 
     def convert_simulating_sink_data_to_json(self):
-        if len(self.simulation_sink_data_list) != 0:
-            data_file_name = f"simulation_sink_run_data_from_{self.time_variable_sink}_sec_to_{self.env.now}_sec.json"
-            output_file = SINK_DURING_SIMULATION_DATA / data_file_name
-
-            if not os.path.exists(output_file):
-                with open(output_file, "w") as f:
-                    json.dump([], f)
-
-            with open(output_file, "r") as f:
-                data = json.load(f)
-
-            data.append(self.simulation_sink_data_list)
-
-            with open(output_file, "w") as f:
-                json.dump(data, f, indent=4)
-
-            self.time_variable_sink = self.env.now
-            self.simulation_sink_data_list = []
+        self.trace_writer.append_records(SINK_DURING_SIMULATION_DATA / f"simulation_sink_{self.trace_name}.jsonl",
+                                         self.simulation_sink_data_list)
+        self.simulation_sink_data_list = []
 
     def convert_simulating_intermediate_store_data_to_json(self):
-        if len(self.simulation_intermediate_store_data_list) != 0:
-            data_file_name = f"simulation_intermediate_store_run_data_from_{self.time_variable_intermediate_store}_sec_to_{self.env.now}_sec.json"
-            output_file = INTERMEDIATE_STORE_DURING_SIMULATION_DATA / data_file_name
-
-            if not os.path.exists(output_file):
-                with open(output_file, "w") as f:
-                    json.dump([], f)
-
-            with open(output_file, "r") as f:
-                data = json.load(f)
-
-            data.append(self.simulation_intermediate_store_data_list)
-
-            with open(output_file, "w") as f:
-                json.dump(data, f, indent=4)
+        self.trace_writer.append_records(
+            INTERMEDIATE_STORE_DURING_SIMULATION_DATA / f"simulation_intermediate_store_{self.trace_name}.jsonl",
+            self.simulation_intermediate_store_data_list)
+        self.simulation_intermediate_store_data_list = []
 
-            self.time_variable_intermediate_store = self.env.now
-            self.simulation_intermediate_store_data_list = []
+    def save_simulation_data(self):
+        """Appends every collected entity action to the trace files."""
+        self.convert_simulating_machine_data_to_json()
+        self.convert_simulating_tr_data_to_json()
+        self.convert_simulating_wr_data_to_json()
+        self.convert_simulating_sink_data_to_json()
+        self.convert_simulating_intermediate_store_data_to_json()
+        self.trace_writer.flush()
+        for columnar_trace_writer in [*self.columnar_trace_writer_dict.values(),
+                                      *self.product_columnar_trace_writer_dict.values()]:
+            columnar_trace_writer.flush()
+
+    def close_trace_files(self):
+        """Saves the entity actions since the last monitoring step and closes the trace files (end of simulation)."""
+        if self.delta_trace_encoder is not None:
+            self.append_closing_records_of_delta_trace()
+        self.save_simulation_data()
+        self.trace_writer.close()
+        for columnar_trace_writer in [*self.columnar_trace_writer_dict.values(),
+                                      *self.product_columnar_trace_writer_dict.values()]:
+            columnar_trace_writer.close()
+        if isinstance(self.trace_writer, BackgroundTraceWriter):
+            print(f"trace writer: the simulation waited {self.trace_writer.number_of_backpressure_waits} times for "
+                  f"the writer thread")
 
     def data_of_entities(self):
         """Creating a file with the complete data of every entity"""
@@ -232,45 +243,38 @@ class SavingSimulationData:
 
     def data_order_completed(self, product: ProductionMaterial, quantity: int):
         """Creating a file with every output material and the time"""
-        output_file = SIMULATION_OUTPUT_DATA / "data_finished_products_leaving_production.json"
+        output_file = SIMULATION_OUTPUT_DATA / "data_finished_products_leaving_production.jsonl"
         data_entry = {
             "Time": self.env.now,
             f"Product Group": product.production_material_id.name,
             f"Quantity": quantity
         }
 
-        if not os.path.exists(output_file):
-            with open(output_file, "w") as f:
-                json.dump([], f)
-
-        with open(output_file, "r") as f:
-            data = json.load(f)
-
-        data.append(data_entry)
-
-        with open(output_file, "w") as f:
-            json.dump(data, f, indent=4)
+        self.trace_writer.append_records(output_file, [data_entry])
+        self.add_product_event_to_columnar_trace("data_finished_products_leaving_production", data_entry)
+        for listener in self.order_completed_listener_list:
+            listener(product.production_material_id.name, quantity, self.env.now)
 
     def data_goods_receipt(self, goods_receipt: GoodReceipt):
         """Creating a file with every input material (in production) and the time"""
-        output_file = SIMULATION_OUTPUT_DATA / "data_goods_entering_production.json"
+        output_file = SIMULATION_OUTPUT_DATA / "data_goods_entering_production.jsonl"
         data_entry = {
             "Time": goods_receipt.time,
             f"Product Group": goods_receipt.production_material.production_material_id.name,
             f"Quantity": goods_receipt.quantity
         }
 
-        if not os.path.exists(output_file):
-            with open(output_file, "w") as f:
-                json.dump([], f)
-
-        with open(output_file, "r") as f:
-            data = json.load(f)
-
-        data.append(data_entry)
-
-        with open(output_file, "w") as f:
-            json.dump(data, f, indent=4)
+        self.trace_writer.append_records(output_file, [data_entry])
+        self.add_product_event_to_columnar_trace("data_goods_entering_production", data_entry)
+        for listener in self.goods_receipt_listener_list:
+            listener(goods_receipt.production_material.production_material_id.name, goods_receipt.quantity,
+                     goods_receipt.time)
+
+    def add_product_event_to_columnar_trace(self, file_name: str, data_entry: dict):
+        columnar_trace_writer = self.product_columnar_trace_writer_dict.get(file_name)
+        if columnar_trace_writer is not None:
+            columnar_trace_writer.add_product_event(data_entry["Time"], data_entry["Product Group"],
+                                                    data_entry["Quantity"])
 
     def save_daily_manufacturing_plan(self, current_date: date, daily_manufacturing_plan: list[Order]):
         """Saves the daily production plan in a JSON file with a date in the file name."""
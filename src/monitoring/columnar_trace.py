@@ -0,0 +1,182 @@
+import json
+import pathlib
+from typing import BinaryIO
+
+import numpy as np
+
+# Every column is saved as raw binary file (simulation_{kind}_column_{name}.bin), so it can be appended during the
+# simulation and memory-mapped by the analysis. Strings are saved as int ids of the string tables (-1 -> no value),
+# a transport order without quantity as quantity -1.
+COLUMN_DTYPE_DICT = {
+    "timestamp": np.float64,
+    "entity": np.int32,
+    "status": np.int32,
+    "x": np.int32,
+    "y": np.int32,
+    "quantity": np.int32,
+    "pick_up_station": np.int32,
+    "unload_station": np.int32,
+    "processing_orders": np.int32  # length of the processing order list of a machine
+}
+# goods entering and finished products leaving the production (one row per event)
+PRODUCT_COLUMN_DTYPE_DICT = {
+    "timestamp": np.float64,
+    "product_group": np.int32,
+    "quantity": np.int32
+}
+STRING_TABLE_COLUMN_DICT = {"entity": "entity", "status": "status", "pick_up_station": "station",
+                            "unload_station": "station", "product_group": "product_group"}  # {column, string table}
+
+
+class ColumnarTraceWriter:
+    """Saves the entity actions ({"timestamp", "entities": [snapshot]}) of one entity kind as columns (see
+    COLUMN_DTYPE_DICT) or the product events of one kind (see PRODUCT_COLUMN_DTYPE_DICT). The columns, the string
+    tables and the number of rows are saved in simulation_{kind}_columns.json."""
+    row_list: list[tuple]  # rows since the last flush, values in the order of column_dtype_dict
+    string_table_dict: dict[str, dict[str, int]]  # {string table, {string, id}}
+    open_file_dict: dict[str, BinaryIO]  # {column, opened file}
+
+    def __init__(self, folder: pathlib.Path, kind: str, column_dtype_dict: dict[str, type] = COLUMN_DTYPE_DICT):
+        self.folder = folder
+        self.kind = kind
+        self.column_dtype_dict = column_dtype_dict
+        self.row_list = []
+        self.number_of_rows = 0
+        self.string_table_dict = {STRING_TABLE_COLUMN_DICT[column]: {} for column in column_dtype_dict
+                                  if column in STRING_TABLE_COLUMN_DICT}
+        self.open_file_dict = {}
+
+    def add_data_entry(self, data_entry: dict):
+        for snapshot in data_entry["entities"]:
+            self.row_list.append(self.convert_snapshot_to_row(data_entry["timestamp"], snapshot))
+
+    def add_product_event(self, timestamp: float, product_group: str, quantity: int):
+        """Row of a trace with the PRODUCT_COLUMN_DTYPE_DICT columns."""
+        self.row_list.append((timestamp, self.get_string_id("product_group", product_group), quantity))
+
+    def convert_snapshot_to_row(self, timestamp: float, snapshot: dict) -> tuple:
+        entity_data = snapshot["entity_data"] or {}
+        working_status = entity_data.get("working_status") or {}
+        transport_order = entity_data.get("transport_order") or {}
+        quantity = transport_order.get("quantity")
+        # machines have no status, but the status of their wr and storages
+        status = working_status.get("status")
+        if status is None and "storage_status" in working_status:
+            status = f"{working_status.get('working_robot_status')}|{working_status['storage_status']}"
+
+        return (timestamp,
+                self.get_string_id("entity", entity_data.get("identification_str")),
+                self.get_string_id("status", status),
+                snapshot["x"],
+                snapshot["y"],
+                quantity if quantity is not None else -1,
+                self.get_string_id("station", transport_order.get("pick up station")),
+                self.get_string_id("station", transport_order.get("unload destination")),
+                len(entity_data.get("Processing Order List") or []))
+
+    def get_string_id(self, string_table: str, value: str | None) -> int:
+        if not value:
+            return -1
+        string_id_dict = self.string_table_dict[string_table]
+        string_id = string_id_dict.get(value)
+        if string_id is None:
+            string_id = len(string_id_dict)
+            string_id_dict[value] = string_id
+        return string_id
+
+    def flush(self):
+        """Appends the rows since the last flush to the column files and saves the string tables."""
+        if len(self.row_list) == 0:
+            return
+
+        for column, values in zip(self.column_dtype_dict, zip(*self.row_list)):
+            file = self.open_file_dict.get(column)
+            if file is None:
+                self.folder.mkdir(parents=True, exist_ok=True)
+                file = open(get_column_file(self.folder, self.kind, column), "ab")
+                self.open_file_dict[column] = file
+            np.asarray(values, dtype=self.column_dtype_dict[column]).tofile(file)
+            file.flush()
+        self.number_of_rows += len(self.row_list)
+        self.row_list = []
+
+        # the meta file is written last, so the analysis never reads more rows than every column file contains
+        with open(get_meta_file(self.folder, self.kind), "w", encoding="utf-8") as f:
+            json.dump({"number_of_rows": self.number_of_rows,
+                       "columns": {column: np.dtype(dtype).name for column, dtype in self.column_dtype_dict.items()},
+                       "string_tables": {string_table: list(string_id_dict) for string_table, string_id_dict in
+                                         self.string_table_dict.items()}}, f)
+
+    def close(self):
+        self.flush()
+        for file in self.open_file_dict.values():
+            file.close()
+        self.open_file_dict = {}
+
+
+class ColumnarTrace:
+    """Memory-mapped columns of a ColumnarTraceWriter. Only the rows which are used are loaded from the disk."""
+    column_dict: dict[str, np.ndarray]  # {column, values of every row}
+    string_table_dict: dict[str, list[str]]  # {string table, strings (index = id)}
+
+    def __init__(self, folder: pathlib.Path, kind: str):
+        with open(get_meta_file(folder, kind), "r", encoding="utf-8") as f:
+            meta_data = json.load(f)
+        self.number_of_rows = meta_data["number_of_rows"]
+        self.string_table_dict = meta_data["string_tables"]
+        column_dtype_dict = meta_data.get("columns", COLUMN_DTYPE_DICT)
+
+        self.column_dict = {}
+        for column, dtype in column_dtype_dict.items():
+            if self.number_of_rows == 0:
+                self.column_dict[column] = np.zeros(0, dtype=dtype)
+            else:
+                self.column_dict[column] = np.memmap(get_column_file(folder, kind, column), dtype=dtype, mode="r",
+                                                     shape=(self.number_of_rows,))
+
+    def get_column(self, column: str) -> np.ndarray:
+        return self.column_dict[column]
+
+    def get_entity_identification_str_list(self) -> list[str]:
+        return list(self.string_table_dict["entity"])
+
+    def get_strings(self, column: str, string_ids: np.ndarray) -> list[str | None]:
+        """Strings of the ids of a string column (None -> no value)."""
+        string_table = self.string_table_dict[STRING_TABLE_COLUMN_DICT[column]]
+        return [string_table[string_id] if string_id >= 0 else None for string_id in string_ids.tolist()]
+
+    def get_rows_by_entity(self) -> tuple[np.ndarray, np.ndarray]:
+        """(indexes of every row sorted by entity and timestamp, offsets): the rows of the entity with the id i are
+        rows[offsets[i]:offsets[i + 1]]. Rows without entity (id -1) are left out."""
+        rows = np.lexsort((self.column_dict["timestamp"], self.column_dict["entity"]))
+        offsets = np.searchsorted(self.column_dict["entity"][rows],
+                                  np.arange(len(self.string_table_dict["entity"]) + 1), side="left")
+        return rows[offsets[0]:], offsets - offsets[0]
+
+    def get_entity_rows(self, identification_str: str) -> np.ndarray:
+        """Indexes of the rows of the entity sorted by timestamp (empty -> entity is not in the trace)."""
+        entity_string_table = self.string_table_dict["entity"]
+        if identification_str not in entity_string_table:
+            return np.zeros(0, dtype=np.int64)
+        rows = np.flatnonzero(self.column_dict["entity"] == entity_string_table.index(identification_str))
+        return rows[np.argsort(self.column_dict["timestamp"][rows], kind="stable")]
+
+    def get_entity_columns(self, identification_str: str) -> dict[str, np.ndarray]:
+        """{column, values of the rows of the entity sorted by timestamp}"""
+        rows = self.get_entity_rows(identification_str)
+        return {column: np.asarray(values[rows]) for column, values in self.column_dict.items()}
+
+
+def get_column_file(folder: pathlib.Path, kind: str, column: str) -> pathlib.Path:
+    return folder / f"simulation_{kind}_column_{column}.bin"
+
+
+def get_meta_file(folder: pathlib.Path, kind: str) -> pathlib.Path:
+    return folder / f"simulation_{kind}_columns.json"
+
+
+def find_columnar_trace(folder: pathlib.Path, kind: str) -> ColumnarTrace | None:
+    """None -> no columnar trace was saved."""
+    if not get_meta_file(folder, kind).exists():
+        return None
+    return ColumnarTrace(folder, kind)
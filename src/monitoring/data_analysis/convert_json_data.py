@@ -1,16 +1,21 @@
 import pathlib
 import re
+from functools import cached_property
 from pathlib import Path
 
 import json
+import numpy as np
 import pandas as pd
 from json.decoder import JSONDecodeError
 
+from src.monitoring.columnar_trace import ColumnarTrace, find_columnar_trace
+from src.monitoring.delta_trace import DeltaTraceDecoder
+from src.monitoring.trace_writer import read_trace_file, find_trace_file
+
 
 class ConvertJsonData:
-    goods_receipt_production_df: pd.DataFrame
-    finished_products_leaving_production_df: pd.DataFrame
-    combined_simulation_entity_data_df: pd.DataFrame
+    """Loads the saved data of a simulation (base_path: simulation output folder). Every df is only loaded when it is
+    used for the first time."""
 
     def __init__(self, base_path: pathlib.Path):
         self.base_path = base_path
@@ -22,53 +27,108 @@ class ConvertJsonData:
         self.SINK_DURING_SIMULATION_DATA = self.ENTITIES_DURING_SIMULATION_DATA / 'sink'
         self.INTERMEDIATE_STORE_DURING_SIMULATION_DATA = self.ENTITIES_DURING_SIMULATION_DATA / 'intermediate_store'
 
-        self.finished_products_leaving_production_df = self.get_df_finished_products_leaving_production()
-        self.simulation_machine_data_df = self.get_machine_simulation_df()
-        self.simulation_tr_data_df = self.get_tr_simulation_df()
-        self.simulation_wr_data_df = self.get_wr_simulation_df()
-        self.simulation_sink_data_df = self.get_sink_simulation_df()
+    @cached_property
+    def finished_products_leaving_production_df(self) -> pd.DataFrame:
+        return self.get_df_finished_products_leaving_production()
+
+    @cached_property
+    def simulation_machine_data_df(self) -> pd.DataFrame:
+        return self.get_machine_simulation_df()
+
+    @cached_property
+    def simulation_tr_data_df(self) -> pd.DataFrame:
+        return self.get_tr_simulation_df()
+
+    @cached_property
+    def simulation_wr_data_df(self) -> pd.DataFrame:
+        return self.get_wr_simulation_df()
+
+    @cached_property
+    def simulation_sink_data_df(self) -> pd.DataFrame:
+        return self.get_sink_simulation_df()
+
+    @cached_property
+    def simulation_intermediate_store_data_df(self) -> pd.DataFrame:
+        return self.get_intermediate_simulation_df()
 
     @property
     def goods_receipt_production_df(self) -> pd.DataFrame:
         """Create a df with all the products entering the production and the time"""
-        file_path = self.base_path / "data_goods_entering_production.json"
-        if not file_path.exists():
-            print(f"⚠️ Datei {file_path} nicht gefunden. Leeres DataFrame wird zurückgegeben.")
-            return pd.DataFrame()
-
-        try:
-            with open(file_path, 'r', encoding='utf-8') as receipt_products:
-                data = json.load(receipt_products)
-                return pd.DataFrame(data)
-        except JSONDecodeError as e:
-            print(f"❌ JSON-Fehler beim Laden von {file_path}: {e.msg} (Position: {e.pos})")
-            return pd.DataFrame()
+        return self.get_products_df("data_goods_entering_production")
 
     def get_df_finished_products_leaving_production(self) -> pd.DataFrame:
         """Create a df with all the products leaving the production and the time"""
-        file_path = self.base_path / "data_finished_products_leaving_production.json"
+        return self.get_products_df("data_finished_products_leaving_production")
+
+    def get_products_df(self, file_name: str) -> pd.DataFrame:
+        """Reads the columnar trace (simulation_{file_name}_columns.json), the trace file (file_name.jsonl or
+        file_name.jsonl.gz) or the json file of older simulation data (file_name.json)."""
+        columnar_trace = find_columnar_trace(self.base_path, file_name)
+        if columnar_trace is not None:
+            return pd.DataFrame({
+                "Time": np.asarray(columnar_trace.get_column("timestamp")),
+                "Product Group": columnar_trace.get_strings("product_group", columnar_trace.get_column("product_group")),
+                "Quantity": np.asarray(columnar_trace.get_column("quantity"))})
+
+        trace_file = find_trace_file(self.base_path / f"{file_name}.jsonl")
+        if trace_file is not None:
+            return pd.DataFrame(read_trace_file(trace_file))
+
+        file_path = self.base_path / f"{file_name}.json"
         if not file_path.exists():
             print(f"⚠️ Datei {file_path} nicht gefunden. Leeres DataFrame wird zurückgegeben.")
             return pd.DataFrame()
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as finished_products:
-                data = json.load(finished_products)
+            with open(file_path, 'r', encoding='utf-8') as products:
+                data = json.load(products)
                 return pd.DataFrame(data)
         except JSONDecodeError as e:
             print(f"❌ JSON-Fehler beim Laden von {file_path}: {e.msg} (Position: {e.pos})")
             return pd.DataFrame()
 
     def get_machine_simulation_df(self) -> pd.DataFrame:
+        return self.get_entity_simulation_df(self.MACHINES_DURING_SIMULATION_DATA, "machine")
+
+    def get_tr_simulation_df(self) -> pd.DataFrame:
+        return self.get_entity_simulation_df(self.TR_DURING_SIMULATION_DATA, "tr")
+
+    def get_wr_simulation_df(self) -> pd.DataFrame:
+        return self.get_entity_simulation_df(self.WR_DURING_SIMULATION_DATA, "wr")
 
-        folder = Path(self.MACHINES_DURING_SIMULATION_DATA)
-        pattern = re.compile(r"simulation_machine_run_data_from_(\d+)_sec_to_(\d+)_sec\.json")
+    def get_sink_simulation_df(self) -> pd.DataFrame:
+        return self.get_entity_simulation_df(self.SINK_DURING_SIMULATION_DATA, "sink")
+
+    def get_intermediate_simulation_df(self) -> pd.DataFrame:
+        return self.get_entity_simulation_df(self.INTERMEDIATE_STORE_DURING_SIMULATION_DATA, "intermediate_store")
+
+    def get_columnar_trace(self, entity_type: str) -> ColumnarTrace | None:
+        """Memory-mapped columns of the entity type (machine, tr, wr, sink, intermediate_store). None -> the
+        simulation was run without columnar_trace(y/n)."""
+        return find_columnar_trace(self.get_entity_folder(entity_type), entity_type)
+
+    def get_entity_folder(self, entity_type: str) -> pathlib.Path:
+        """Folder of the saved actions of the entity type (machine, tr, wr, sink, intermediate_store)."""
+        folder_dict = {"machine": self.MACHINES_DURING_SIMULATION_DATA,
+                       "tr": self.TR_DURING_SIMULATION_DATA,
+                       "wr": self.WR_DURING_SIMULATION_DATA,
+                       "sink": self.SINK_DURING_SIMULATION_DATA,
+                       "intermediate_store": self.INTERMEDIATE_STORE_DURING_SIMULATION_DATA}
+        return folder_dict[entity_type]
+
+    def get_entity_simulation_df(self, folder: pathlib.Path, entity_type: str) -> pd.DataFrame:
+        """Every row holds saved entity actions ({"timestamp", "entities"}) in its cells: one chunk of an older
+        json file (simulation_{entity_type}_run_data_from_*_sec_to_*_sec.json) per row or one record of the trace
+        file (simulation_{entity_type}_trace.jsonl or the decoded simulation_{entity_type}_delta_trace.jsonl) per
+        row."""
+        folder = Path(folder)
+        pattern = re.compile(rf"simulation_{entity_type}_run_data_from_(\d+)_sec_to_(\d+)_sec\.json")
 
         all_data = []
         file_info = []
 
         # Collect files and extract start time
-        for file in folder.glob("simulation_machine_run_data_from_*_sec_to_*_sec.json"):
+        for file in folder.glob(f"simulation_{entity_type}_run_data_from_*_sec_to_*_sec.json"):
             match = pattern.match(file.name)
             if match:
                 start_time = int(match.group(1))
@@ -88,107 +148,13 @@ class ConvertJsonData:
                 print(f"Fehlermeldung: {e}")
                 raise
 
-        return pd.DataFrame(all_data)
-
-    def get_tr_simulation_df(self) -> pd.DataFrame:
-
-        folder = Path(self.TR_DURING_SIMULATION_DATA)
-        pattern = re.compile(r"simulation_tr_run_data_from_(\d+)_sec_to_(\d+)_sec\.json")
-
-        all_data = []
-        file_info = []
-
-        # Collect files and extract start time
-        for file in folder.glob("simulation_tr_run_data_from_*_sec_to_*_sec.json"):
-            match = pattern.match(file.name)
-            if match:
-                start_time = int(match.group(1))
-                file_info.append((start_time, file))
-
-        # Sort by start time
-        file_info.sort(key=lambda x: x[0])
+        trace_file = find_trace_file(folder / f"simulation_{entity_type}_trace.jsonl")
+        if trace_file is not None:
+            all_data.extend([record] for record in read_trace_file(trace_file))
 
-        # Read in all JSONs and collect them in a list
-        for _, file in file_info:
-            with open(file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                all_data.extend(data)
-
-        return pd.DataFrame(all_data)
-
-    def get_wr_simulation_df(self) -> pd.DataFrame:
-
-        folder = Path(self.WR_DURING_SIMULATION_DATA)
-        pattern = re.compile(r"simulation_wr_run_data_from_(\d+)_sec_to_(\d+)_sec\.json")
-
-        all_data = []
-        file_info = []
-
-        # Collect files and extract start time
-        for file in folder.glob("simulation_wr_run_data_from_*_sec_to_*_sec.json"):
-            match = pattern.match(file.name)
-            if match:
-                start_time = int(match.group(1))
-                file_info.append((start_time, file))
-
-        # Sort by start time
-        file_info.sort(key=lambda x: x[0])
-
-        # Read in all JSONs and collect them in a list
-        for _, file in file_info:
-            with open(file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                all_data.extend(data)
-
-        return pd.DataFrame(all_data)
-
-    def get_sink_simulation_df(self) -> pd.DataFrame:
-
-        folder = Path(self.SINK_DURING_SIMULATION_DATA)
-        pattern = re.compile(r"simulation_sink_run_data_from_(\d+)_sec_to_(\d+)_sec\.json")
-
-        all_data = []
-        file_info = []
-
-        # Collect files and extract start time
-        for file in folder.glob("simulation_sink_run_data_from_*_sec_to_*_sec.json"):
-            match = pattern.match(file.name)
-            if match:
-                start_time = int(match.group(1))
-                file_info.append((start_time, file))
-
-        # Sort by start time
-        file_info.sort(key=lambda x: x[0])
-
-        # Read in all JSONs and collect them in a list
-        for _, file in file_info:
-            with open(file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                all_data.extend(data)
-
-        return pd.DataFrame(all_data)
-
-    def get_intermediate_simulation_df(self) -> pd.DataFrame:
-        folder = Path(self.INTERMEDIATE_STORE_DURING_SIMULATION_DATA)
-        pattern = re.compile(r"simulation_intermediate_store_run_data_from_(\d+)_sec_to_(\d+)_sec\.json")
-
-        all_data = []
-        file_info = []
-
-        # Collect files and extract start time
-        for file in folder.glob("simulation_intermediate_store_run_data_from_*_sec_to_*_sec.json"):
-            match = pattern.match(file.name)
-            if match:
-                start_time = int(match.group(1))
-                file_info.append((start_time, file))
-
-        # Sort by start time
-        file_info.sort(key=lambda x: x[0])
-
-        # Read in all JSONs and collect them in a list
-        for _, file in file_info:
-            with open(file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                all_data.extend(data)
+        delta_trace_file = find_trace_file(folder / f"simulation_{entity_type}_delta_trace.jsonl")
+        if delta_trace_file is not None:
+            data_entries = DeltaTraceDecoder().decode_records(read_trace_file(delta_trace_file))
+            all_data.extend([data_entry] for data_entry in data_entries)
 
         return pd.DataFrame(all_data)
@@ -3,19 +3,31 @@ from collections import defaultdict
 
 import matplotlib.pyplot as plt
 
+from src.monitoring.columnar_trace import ColumnarTrace
 from src.monitoring.data_analysis.creating_machine_during_simulation_dict import CreatingMachineDuringSimulationDict
+from src.monitoring.data_analysis.workload_engine import WorkloadEngine
+from src.monitoring.data_analysis.workload_per_window_chart import PRODUCTION_DAY_LENGTH, \
+    create_workload_per_window_chart, save_workload_per_window_json
 from src.constant.constant import MachineWorkingRobotStatus, MachineStorageStatus
 from src import MACHINE_WORKLOAD
 
 
 class MachineWorkload:
     workload_dict: dict[str, dict[str, int]]  # dict[machine_id, dict[status, time]]
+    workload_engine: WorkloadEngine  # grouped status of every machine action (e.g. for utilisation per day)
 
-    def __init__(self, creating_machine_during_simulation_dict: CreatingMachineDuringSimulationDict,
-                 start_time: int | None = None, end_time: int | None = None):
+    def __init__(self, creating_machine_during_simulation_dict: CreatingMachineDuringSimulationDict | None,
+                 start_time: int | None = None, end_time: int | None = None,
+                 columnar_trace: ColumnarTrace | None = None):
+        """columnar_trace: columns of the machine actions, used instead of the snapshots (the creating dict can be
+        None then)."""
         self.creating_machine_during_simulation_dict = creating_machine_during_simulation_dict
-        self.every_machine_during_simulation_data = self.creating_machine_during_simulation_dict.every_machine_during_simulation_data
-        self.machine_identification_str_list = self.creating_machine_during_simulation_dict.every_machine_identification_str_list
+        self.columnar_trace = columnar_trace
+        if columnar_trace is not None:
+            self.machine_identification_str_list = columnar_trace.get_entity_identification_str_list()
+        else:
+            self.every_machine_during_simulation_data = self.creating_machine_during_simulation_dict.every_machine_during_simulation_data
+            self.machine_identification_str_list = self.creating_machine_during_simulation_dict.every_machine_identification_str_list
 
         self.start_time = start_time
         self.end_time = end_time
@@ -28,60 +40,47 @@ class MachineWorkload:
     def save_workload_statistics(self):
         self.save_workload_to_json()
         self.create_pie_charts()
+        self.save_workload_per_day()
+
+    def save_workload_per_day(self):
+        """Status times of every production day as JSON and as stacked bar chart per machine."""
+        window_edges = self.workload_engine.get_window_edges(PRODUCTION_DAY_LENGTH, self.start_time or 0, self.end_time)
+        workload_per_day_dict = self.workload_engine.calculate_status_time_dicts_per_window(window_edges)
+        workload_per_day_dict = {machine_id: [self._group_statuses(status_times) for status_times in status_times_list]
+                                 for machine_id, status_times_list in workload_per_day_dict.items()}
+        save_workload_per_window_json(MACHINE_WORKLOAD / 'machine_workload_per_day.json', window_edges,
+                                      workload_per_day_dict)
+        for machine_id, status_times_list in workload_per_day_dict.items():
+            safe_machine_id = machine_id.replace(":", "-").replace(" ", "_")
+            create_workload_per_window_chart(MACHINE_WORKLOAD / f'{safe_machine_id}_status_per_day_chart.png',
+                                             machine_id, window_edges, status_times_list)
 
     def calculate_workload(self):
+        if self.columnar_trace is not None:
+            self.workload_engine = WorkloadEngine.from_columnar_trace(self.columnar_trace, self._get_grouped_row_status,
+                                                                      ("status", "processing_orders"))
+        else:
+            self.workload_engine = WorkloadEngine.from_snapshots(self.every_machine_during_simulation_data,
+                                                                 self._get_grouped_status)
+        status_times_dict = self.workload_engine.calculate_status_times(self.start_time, self.end_time)
         for machine_id in self.machine_identification_str_list:
-            status_times = self._calculate_status_times_for_machine(machine_id)
-            self.workload_dict[machine_id] = self._group_statuses(status_times)
+            self.workload_dict[machine_id] = self._group_statuses(status_times_dict.get(machine_id, {}))
 
-    def _calculate_status_times_for_machine(self, machine_id: str) -> dict[str, float]:
-        status_times = defaultdict(float)
-        previous_timestamp = None
-        previous_status = None
+    def _get_grouped_status(self, entity_data: dict) -> str:
+        wr_status = entity_data["working_status"]["working_robot_status"]
+        storage_status = entity_data["working_status"]["storage_status"]
+        processing_list = entity_data["Processing Order List"]
 
-        for entry in self.every_machine_during_simulation_data[machine_id]:
-            timestamp = entry["timestamp"]
-            if not self._is_timestamp_in_range(timestamp):
-                continue
+        return self._group_status(wr_status, storage_status, len(processing_list))
 
-            status = self._extract_grouped_status(entry, machine_id)
-            if status is None:
-                continue
+    def _get_grouped_row_status(self, row: dict) -> str | None:
+        """row: {"status": "working_robot_status|storage_status", "processing_orders"} of the columnar trace"""
+        if row["status"] is None:
+            return None
+        wr_status, storage_status = row["status"].split("|")
+        return self._group_status(wr_status, storage_status, row["processing_orders"])
 
-            if previous_status is None:
-                previous_status = status
-                previous_timestamp = timestamp
-                continue
-
-            duration = timestamp - previous_timestamp
-            status_times[previous_status] += duration
-
-            previous_timestamp = timestamp
-            previous_status = status
-
-        return status_times
-
-    def _is_timestamp_in_range(self, timestamp: int) -> bool:
-        if self.start_time is not None and timestamp < self.start_time:
-            return False
-        if self.end_time is not None and timestamp > self.end_time:
-            return False
-        return True
-
-    def _extract_grouped_status(self, entry: dict, machine_id: str) -> str | None:
-        for entity in entry["entities"]:
-            entity_data = entity["entity_data"]
-            if entity_data["identification_str"] != machine_id:
-                continue
-
-            wr_status = entity_data["working_status"]["working_robot_status"]
-            storage_status = entity_data["working_status"]["storage_status"]
-            processing_list = entity_data["Processing Order List"]
-
-            return self._group_status(wr_status, storage_status, processing_list)
-        return None
-
-    def _group_status(self, wr_status: str, storage_status: str, processing_list: list) -> str:
+    def _group_status(self, wr_status: str, storage_status: str, number_of_processing_orders: int) -> str:
         if wr_status == MachineWorkingRobotStatus.WR_PRESENT.value:
             if storage_status == MachineStorageStatus.STORAGES_READY_FOR_PRODUCTION.value:
                 return "Produziert Material"
@@ -94,7 +93,7 @@ class MachineWorkload:
         elif wr_status in [MachineWorkingRobotStatus.NO_WR.value,
                            MachineWorkingRobotStatus.WAITING_WR.value,
                            MachineWorkingRobotStatus.WR_LEAVING.value]:
-            if len(processing_list) == 0:
+            if number_of_processing_orders == 0:
                 return "Hat keinen Auftrag"
             else:
                 return "Wartet auf WR"
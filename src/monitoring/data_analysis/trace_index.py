@@ -0,0 +1,42 @@
+import pandas as pd
+
+
+class TraceIndex:
+    """Groups the saved entity actions ({"timestamp", "entities"}) of a simulation df (see ConvertJsonData) by the
+    identification_str of their entities with one pass over every cell. Every group is sorted by timestamp once."""
+    entity_data_dict: dict[str, list[dict]]  # {identification_str, actions sorted by timestamp}
+    entity_type_data_dict: dict[str, list[dict]]  # {entity_type, actions sorted by timestamp}
+
+    def __init__(self, simulation_df: pd.DataFrame):
+        self.entity_data_dict = {}
+        self.entity_type_data_dict = {}
+
+        self.create_index(simulation_df)
+
+    def create_index(self, simulation_df: pd.DataFrame):
+        for row in simulation_df.to_numpy(dtype=object):
+            for cell_data in row:
+                if not cell_data or not isinstance(cell_data, dict):
+                    continue
+                entity_type_set = set()
+                for entity in cell_data.get('entities', []):
+                    entity_type_set.add(entity.get('entity_type'))
+                    entity_data = entity.get('entity_data') or {}
+                    identification_str = entity_data.get('identification_str')
+                    if identification_str:
+                        self.entity_data_dict.setdefault(identification_str, []).append(cell_data)
+                for entity_type in entity_type_set:
+                    self.entity_type_data_dict.setdefault(entity_type, []).append(cell_data)
+
+        for data_list in list(self.entity_data_dict.values()) + list(self.entity_type_data_dict.values()):
+            data_list.sort(key=lambda x: x.get('timestamp'))
+
+    def get_identification_str_list(self) -> list[str]:
+        """Every identification_str in the order of its first action in the df."""
+        return list(self.entity_data_dict.keys())
+
+    def get_entity_data(self, identification_str: str) -> list[dict]:
+        return self.entity_data_dict.get(identification_str, [])
+
+    def get_entity_type_data(self, entity_type: str) -> list[dict]:
+        return self.entity_type_data_dict.get(entity_type, [])
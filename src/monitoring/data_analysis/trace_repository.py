@@ -0,0 +1,135 @@
+import os
+import pathlib
+import pickle
+import tempfile
+
+from src.monitoring.data_analysis.convert_json_data import ConvertJsonData
+from src.monitoring.data_analysis.creating_intermediate_store_during_simulation_dict import \
+    CreatingIntermediateStoreDuringSimulationDict
+from src.monitoring.data_analysis.creating_machine_during_simulation_dict import CreatingMachineDuringSimulationDict
+from src.monitoring.data_analysis.creating_sink_during_simulation_dict import CreatingSinkDuringSimulationDict
+from src.monitoring.data_analysis.creating_tr_during_simulation_dict import CreatingTrDuringSimulationDict
+from src.monitoring.data_analysis.creating_wr_during_simulation_dict import CreatingWrDuringSimulationDict
+from src.monitoring.data_analysis.trace_index import TraceIndex
+
+TRACE_CACHE = "trace_cache"
+
+
+class TraceRepository:
+    """Shared loaded data of one simulation output folder. Every accessor loads its data only once; the TraceIndex
+    of every entity type is also cached on the disk (base_path/trace_cache/{entity_type}_trace_index.pickle) and
+    keyed by the names, mtimes and sizes of the saved files, so an unchanged folder is never parsed again. If the
+    saved files change (e.g. a new simulation), everything is loaded again."""
+    signature: tuple  # (file name, mtime, size) of every saved file in base_path
+    trace_index_dict: dict[str, TraceIndex]  # {entity_type, TraceIndex}
+    creating_dict_dict: dict[str, object]  # {entity_type, Creating*DuringSimulationDict}
+
+    def __init__(self, base_path: pathlib.Path):
+        self.base_path = pathlib.Path(base_path)
+        self.cache_folder = self.base_path / TRACE_CACHE
+        self.signature = ()
+        self.convert_json_data = None
+        self.trace_index_dict = {}
+        self.creating_dict_dict = {}
+
+    def refresh(self):
+        """Forgets the loaded data if the saved files have changed since it was loaded."""
+        signature = get_files_signature(self.base_path)
+        if signature != self.signature:
+            self.signature = signature
+            self.convert_json_data = None
+            self.trace_index_dict = {}
+            self.creating_dict_dict = {}
+
+    def get_convert_json_data(self) -> ConvertJsonData:
+        self.refresh()
+        if self.convert_json_data is None:
+            self.convert_json_data = ConvertJsonData(self.base_path)
+        return self.convert_json_data
+
+    def get_trace_index(self, entity_type: str) -> TraceIndex:
+        """entity_type: machine, tr, wr, sink or intermediate_store"""
+        convert_json_data = self.get_convert_json_data()
+        trace_index = self.trace_index_dict.get(entity_type)
+        if trace_index is None:
+            folder = convert_json_data.get_entity_folder(entity_type)
+            trace_index = self.load_cached_trace_index(entity_type, get_files_signature(folder))
+            if trace_index is None:
+                trace_index = TraceIndex(convert_json_data.get_entity_simulation_df(folder, entity_type))
+                self.save_cached_trace_index(entity_type, get_files_signature(folder), trace_index)
+            self.trace_index_dict[entity_type] = trace_index
+        return trace_index
+
+    def load_cached_trace_index(self, entity_type: str, signature: tuple) -> TraceIndex | None:
+        """None -> no cache or the cache belongs to other files."""
+        cache_file = self.cache_folder / f"{entity_type}_trace_index.pickle"
+        if not cache_file.exists():
+            return None
+        try:
+            with open(cache_file, "rb") as f:
+                cached_data = pickle.load(f)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, OSError, ValueError) as e:
+            print(f"Cache {cache_file.name} kann nicht gelesen werden und wird neu erstellt: {e}")
+            return None
+        if cached_data["signature"] != signature:
+            return None
+        return cached_data["trace_index"]
+
+    def save_cached_trace_index(self, entity_type: str, signature: tuple, trace_index: TraceIndex):
+        """Writes a temporary file in the cache folder and moves it into place, so an other analysis never reads a
+        half written cache."""
+        self.cache_folder.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=self.cache_folder, prefix=f"{entity_type}_trace_index", suffix=".tmp",
+                                         delete=False) as f:
+            pickle.dump({"signature": signature, "trace_index": trace_index}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f.name, self.cache_folder / f"{entity_type}_trace_index.pickle")
+
+    def get_creating_machine_during_simulation_dict(self) -> CreatingMachineDuringSimulationDict:
+        return self.get_creating_dict("machine", CreatingMachineDuringSimulationDict)
+
+    def get_creating_tr_during_simulation_dict(self) -> CreatingTrDuringSimulationDict:
+        return self.get_creating_dict("tr", CreatingTrDuringSimulationDict)
+
+    def get_creating_wr_during_simulation_dict(self) -> CreatingWrDuringSimulationDict:
+        return self.get_creating_dict("wr", CreatingWrDuringSimulationDict)
+
+    def get_creating_sink_during_simulation_dict(self) -> CreatingSinkDuringSimulationDict:
+        return self.get_creating_dict("sink", CreatingSinkDuringSimulationDict)
+
+    def get_creating_intermediate_store_during_simulation_dict(self) -> CreatingIntermediateStoreDuringSimulationDict:
+        return self.get_creating_dict("intermediate_store", CreatingIntermediateStoreDuringSimulationDict)
+
+    def get_creating_dict(self, entity_type: str, creating_dict_class):
+        trace_index = self.get_trace_index(entity_type)
+        creating_dict = self.creating_dict_dict.get(entity_type)
+        if creating_dict is None:
+            creating_dict = creating_dict_class(self.convert_json_data, trace_index)
+            self.creating_dict_dict[entity_type] = creating_dict
+        return creating_dict
+
+
+trace_repository_dict: dict[pathlib.Path, TraceRepository] = {}  # {resolved base_path, TraceRepository}
+
+
+def get_trace_repository(base_path: pathlib.Path) -> TraceRepository:
+    """The shared TraceRepository of the folder (analysis, topology manager and rebuilding use the same one)."""
+    key = pathlib.Path(base_path).resolve()
+    trace_repository = trace_repository_dict.get(key)
+    if trace_repository is None:
+        trace_repository = TraceRepository(key)
+        trace_repository_dict[key] = trace_repository
+    return trace_repository
+
+
+def get_files_signature(folder: pathlib.Path) -> tuple:
+    """(relative file name, mtime, size) of every saved file below the folder (without the trace cache)."""
+    signature = []
+    if not folder.exists():
+        return ()
+    for file in folder.rglob("*"):
+        relative_path = file.relative_to(folder)
+        if TRACE_CACHE in relative_path.parts or not file.is_file():
+            continue
+        stat = file.stat()
+        signature.append((relative_path.as_posix(), stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(signature))
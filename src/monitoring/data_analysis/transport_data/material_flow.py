@@ -1,3 +1,6 @@
+import numpy as np
+
+from src.monitoring.columnar_trace import ColumnarTrace
 from src.monitoring.data_analysis.creating_intermediate_store_during_simulation_dict import \
     CreatingIntermediateStoreDuringSimulationDict
 from src.monitoring.data_analysis.creating_machine_during_simulation_dict import CreatingMachineDuringSimulationDict
@@ -5,7 +8,16 @@ from src.monitoring.data_analysis.creating_tr_during_simulation_dict import Crea
 
 
 class MaterialFlow:
-    object_material_flow_matrix: dict[str, dict[str, int]] = {}
+    """Material flows between the stations. The completed transports of every TR are extracted once into arrays
+    sorted by time, so every time window is answered with a binary search (searchsorted) and one np.add.at."""
+    object_material_flow_matrix: dict[str, dict[str, int]]  # material flow matrix of the last time window
+    station_list: list[str]  # station index -> identification_str
+    station_mention_times: list[np.ndarray]  # [station index] timestamps of the TR snapshots with the station
+    transport_times: np.ndarray  # time of every counted transport (sorted)
+    transport_from_stations: np.ndarray  # station index
+    transport_to_stations: np.ndarray  # station index
+    transport_quantities: np.ndarray
+    tr_order_arrays: list[tuple[np.ndarray, ...]]  # per TR: (timestamps, from, to, quantity, counted) of every order
 
     def __init__(self, creating_tr_during_simulation_dict: CreatingTrDuringSimulationDict,
                  creating_machine_during_simulation_dict: CreatingMachineDuringSimulationDict,
@@ -26,80 +38,173 @@ class MaterialFlow:
         self.intermediate_store_identification_str_list = self.creating_intermediate_store_during_simulation_dict.every_intermediate_store_identification_str_list
 
         self.object_material_flow_matrix = {}
+        self.station_list = []
+        self.is_transport_index_created = False
+
+    @classmethod
+    def from_columnar_trace(cls, tr_columnar_trace: ColumnarTrace, machine_identification_str_list: list[str],
+                            intermediate_store_identification_str_list: list[str]) -> "MaterialFlow":
+        """Material flows of the columns of the TR actions (no TR snapshot is loaded)."""
+        material_flow = cls.__new__(cls)
+        material_flow.tr_identification_str_list = tr_columnar_trace.get_entity_identification_str_list()
+        material_flow.machine_identification_str_list = machine_identification_str_list
+        material_flow.intermediate_store_identification_str_list = intermediate_store_identification_str_list
+        material_flow.object_material_flow_matrix = {}
+        material_flow.create_transport_index_from_columnar_trace(tr_columnar_trace)
+        return material_flow
 
     def create_material_flow_matrix(self, start_time: int = 0, end_time: int = float('inf')) -> dict[
         str, dict[str, int]]:
-        """Creates a matrix of material flows with optional time filtering, including all known entities."""
-        all_stations = set()
-
-        # Alle TR-Daten durchgehen und beteiligte Stationen erfassen
-        for tr_id in self.tr_identification_str_list:
-            tr_snapshots = self.every_tr_during_simulation_data[tr_id]
-            filtered_snapshots = self.filter_snapshots_by_time(tr_snapshots, start_time, end_time)
-
-            for snapshot in filtered_snapshots:
-                for entity in snapshot["entities"]:
-                    entity_data = entity["entity_data"]
-                    transport_order = entity_data["transport_order"]
-                    from_station = transport_order["pick up station"]
-                    to_station = transport_order["unload destination"]
-                    if from_station:
-                        all_stations.add(from_station)
-                    if to_station:
-                        all_stations.add(to_station)
-
-        # Ergänze alle bekannten Maschinen und Intermediate Stores
+        """Creates a new matrix of the material flows in the time window (start_time and end_time included),
+        including all known entities."""
+        if not self.is_transport_index_created:
+            self.create_transport_index()
+
+        # Stationen, die in einem TR-Snapshot des Zeitraums vorkommen, sowie alle Maschinen und Intermediate Stores
+        all_stations = set(station for station, mention_times in zip(self.station_list, self.station_mention_times)
+                           if self.count_in_time_window(mention_times, start_time, end_time) > 0)
         all_stations.update(self.machine_identification_str_list)
         all_stations.update(self.intermediate_store_identification_str_list)
 
-        # Matrix vorbereiten: Alle Stationen als Zeilen und Spalten eintragen
+        # Materialflüsse des Zeitraums in einer dichten Station x Station Matrix summieren
+        flow_matrix = np.zeros((len(self.station_list), len(self.station_list)), dtype=np.int64)
+        first = np.searchsorted(self.transport_times, start_time, side="left")
+        end = np.searchsorted(self.transport_times, end_time, side="right")
+        np.add.at(flow_matrix, (self.transport_from_stations[first:end], self.transport_to_stations[first:end]),
+                  self.transport_quantities[first:end])
+        self.add_orders_started_before_time_window(flow_matrix, start_time, end_time)
+
+        station_index_dict = {station: index for index, station in enumerate(self.station_list)}
+        material_flow_matrix = {}
         for station in all_stations:
-            if station not in self.object_material_flow_matrix:
-                self.object_material_flow_matrix[station] = {}
+            material_flow_matrix[station] = {}
             for target in all_stations:
-                if target not in self.object_material_flow_matrix[station] and target != station:
-                    self.object_material_flow_matrix[station][target] = 0
+                if target != station:
+                    material_flow_matrix[station][target] = self.get_flow(flow_matrix, station_index_dict, station,
+                                                                          target)
+
+        self.object_material_flow_matrix = material_flow_matrix
+        return material_flow_matrix
+
+    def create_transport_index(self):
+        """Extracts the counted transports (time, from, to, quantity) of every TR once. A transport order is counted
+        at its first snapshot with a quantity > 0."""
+        station_index_dict = {}
+        station_mention_time_list = []
+        transport_list = []
+        self.tr_order_arrays = []
+
+        def get_station_index(station: str) -> int:
+            if station not in station_index_dict:
+                station_index_dict[station] = len(station_index_dict)
+                station_mention_time_list.append([])
+            return station_index_dict[station]
 
-        # Materialflüsse eintragen
         for tr_id in self.tr_identification_str_list:
-            tr_snapshots = self.every_tr_during_simulation_data[tr_id]
-            filtered_snapshots = self.filter_snapshots_by_time(tr_snapshots, start_time, end_time)
-            last_counted_order = None
+            last_order = None
+            order_list = []  # (timestamp, from, to, quantity, counted)
 
-            for snapshot in filtered_snapshots:
+            for snapshot in self.every_tr_during_simulation_data[tr_id]:
                 for entity in snapshot["entities"]:
-                    entity_data = entity["entity_data"]
-                    transport_order = entity_data["transport_order"]
-                    working_status = entity_data["working_status"]
-                    from_station = transport_order["pick up station"]
-                    to_station = transport_order["unload destination"]
-                    quantity = transport_order["quantity"]
-                    status = working_status["status"]
-                    current_order = (from_station, to_station, quantity)
-
-                    if not self.is_valid_transport_order(from_station, to_station, quantity):
+                    transport_order = entity["entity_data"]["transport_order"] or {}
+                    from_station = transport_order.get("pick up station")
+                    to_station = transport_order.get("unload destination")
+                    quantity = transport_order.get("quantity")
+                    for station in [from_station, to_station]:
+                        if station:
+                            station_mention_time_list[get_station_index(station)].append(snapshot["timestamp"])
+
+                    if quantity is None or not self.is_valid_transport_order(from_station, to_station, quantity):
                         continue
 
-                    if self.is_new_and_completed_order(current_order, last_counted_order, quantity):
-                        self.object_material_flow_matrix[from_station][to_station] += quantity
-                        last_counted_order = current_order
-                    elif current_order != last_counted_order and quantity == 0:
-                        last_counted_order = current_order
-
-        return self.object_material_flow_matrix
-
-    def filter_snapshots_by_time(self, snapshots: list[dict], start: int, end: int) -> list[dict]:
-        """Filters snapshots within a time range."""
-        return [s for s in snapshots if start <= s["timestamp"] <= end]
+                    current_order = (from_station, to_station, quantity)
+                    counted = current_order != last_order and quantity > 0
+                    order_list.append((snapshot["timestamp"], get_station_index(from_station),
+                                       get_station_index(to_station), quantity, counted))
+                    if counted:
+                        transport_list.append(order_list[-1][:4])
+                    last_order = current_order
+
+            self.tr_order_arrays.append(tuple(np.asarray(column) for column in zip(*order_list)) if order_list
+                                        else (np.zeros(0), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64),
+                                              np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)))
+
+        self.station_list = list(station_index_dict.keys())
+        self.station_mention_times = [np.sort(np.asarray(mention_times, dtype=np.float64)) for mention_times in
+                                      station_mention_time_list]
+        transport_list.sort(key=lambda transport: transport[0])
+        self.transport_times = np.asarray([transport[0] for transport in transport_list], dtype=np.float64)
+        self.transport_from_stations = np.asarray([transport[1] for transport in transport_list], dtype=np.int64)
+        self.transport_to_stations = np.asarray([transport[2] for transport in transport_list], dtype=np.int64)
+        self.transport_quantities = np.asarray([transport[3] for transport in transport_list], dtype=np.int64)
+        self.is_transport_index_created = True
+
+    def create_transport_index_from_columnar_trace(self, tr_columnar_trace: ColumnarTrace):
+        """Same transport index as create_transport_index, computed on the columns of every TR (the station ids of
+        the columnar trace are the station indexes). A missing station or quantity is saved as -1."""
+        rows, row_offsets = tr_columnar_trace.get_rows_by_entity()
+        timestamps = np.asarray(tr_columnar_trace.get_column("timestamp")[rows], dtype=np.float64)
+        from_stations = np.asarray(tr_columnar_trace.get_column("pick_up_station")[rows], dtype=np.int64)
+        to_stations = np.asarray(tr_columnar_trace.get_column("unload_station")[rows], dtype=np.int64)
+        quantities = np.asarray(tr_columnar_trace.get_column("quantity")[rows], dtype=np.int64)
+        self.station_list = list(tr_columnar_trace.string_table_dict["station"])
+
+        # every snapshot mentions its pick up station and its unload destination
+        mention_stations = np.concatenate([from_stations, to_stations])
+        mention_times = np.concatenate([timestamps, timestamps])
+        is_mentioned = mention_stations >= 0
+        mention_order = np.lexsort((mention_times[is_mentioned], mention_stations[is_mentioned]))
+        mention_stations = mention_stations[is_mentioned][mention_order]
+        mention_times = mention_times[is_mentioned][mention_order]
+        mention_offsets = np.searchsorted(mention_stations, np.arange(len(self.station_list) + 1), side="left")
+        self.station_mention_times = [mention_times[mention_offsets[index]:mention_offsets[index + 1]] for index
+                                      in range(len(self.station_list))]
+
+        # valid orders of every TR; an order is counted if it differs from the previous valid order of the TR
+        self.tr_order_arrays = []
+        counted_row_list = []
+        for entity_index in range(len(self.tr_identification_str_list)):
+            tr_rows = np.arange(row_offsets[entity_index], row_offsets[entity_index + 1])
+            tr_rows = tr_rows[(from_stations[tr_rows] >= 0) & (to_stations[tr_rows] >= 0) & (quantities[tr_rows] >= 0)]
+            is_new_order = np.ones(len(tr_rows), dtype=bool)
+            is_new_order[1:] = (from_stations[tr_rows[1:]] != from_stations[tr_rows[:-1]]) | \
+                               (to_stations[tr_rows[1:]] != to_stations[tr_rows[:-1]]) | \
+                               (quantities[tr_rows[1:]] != quantities[tr_rows[:-1]])
+            counted = is_new_order & (quantities[tr_rows] > 0)
+            self.tr_order_arrays.append((timestamps[tr_rows], from_stations[tr_rows], to_stations[tr_rows],
+                                         quantities[tr_rows], counted))
+            counted_row_list.append(tr_rows[counted])
+
+        counted_rows = np.concatenate(counted_row_list + [np.zeros(0, dtype=np.int64)])
+        counted_rows = counted_rows[np.argsort(timestamps[counted_rows], kind="stable")]
+        self.transport_times = timestamps[counted_rows]
+        self.transport_from_stations = from_stations[counted_rows]
+        self.transport_to_stations = to_stations[counted_rows]
+        self.transport_quantities = quantities[counted_rows]
+        self.is_transport_index_created = True
+
+    def add_orders_started_before_time_window(self, flow_matrix: np.ndarray, start_time: int, end_time: int):
+        """An order which was counted before the time window and is still running at its start is counted again
+        in the time window (like a TR seen for the first time)."""
+        for timestamps, from_stations, to_stations, quantities, counted in self.tr_order_arrays:
+            first = np.searchsorted(timestamps, start_time, side="left")
+            if first < len(timestamps) and timestamps[first] <= end_time and not counted[first] and \
+                    quantities[first] > 0:
+                flow_matrix[from_stations[first], to_stations[first]] += quantities[first]
+
+    def count_in_time_window(self, sorted_times: np.ndarray, start: int, end: int) -> int:
+        return int(np.searchsorted(sorted_times, end, side="right") - np.searchsorted(sorted_times, start, side="left"))
+
+    def get_flow(self, flow_matrix: np.ndarray, station_index_dict: dict[str, int], from_station: str,
+                 to_station: str) -> int:
+        if from_station not in station_index_dict or to_station not in station_index_dict:
+            return 0
+        return int(flow_matrix[station_index_dict[from_station], station_index_dict[to_station]])
 
     def is_valid_transport_order(self, from_station: str, to_station: str, quantity: int) -> bool:
         """Checks whether a transport order makes sense."""
         return bool(from_station and to_station and quantity >= 0)
 
-    def is_new_and_completed_order(self, current_order, last_order, quantity) -> bool:
-        """Checks whether there is a new and completed transport"""
-        return current_order != last_order and quantity > 0
-
     def add_to_flow_matrix(self, from_station: str, to_station: str, quantity: int) -> None:
         """Adds material flow to the matrix."""
         if from_station not in self.object_material_flow_matrix:
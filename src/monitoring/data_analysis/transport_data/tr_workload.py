@@ -1,21 +1,31 @@
 import json
-from collections import defaultdict
 from pathlib import Path
 import matplotlib.pyplot as plt
 
+from src.monitoring.columnar_trace import ColumnarTrace
 from src.monitoring.data_analysis.creating_tr_during_simulation_dict import CreatingTrDuringSimulationDict
+from src.monitoring.data_analysis.workload_engine import WorkloadEngine
+from src.monitoring.data_analysis.workload_per_window_chart import PRODUCTION_DAY_LENGTH, \
+    create_workload_per_window_chart, save_workload_per_window_json
 from src import TR_STATISTICS
 
 
 class TrWorkload:
     workload_dict: dict[str, dict[str, int]]  # dict[tr.identification_str, dict[status, time]]
+    workload_engine: WorkloadEngine  # grouped status of every action (e.g. for utilisation per shift or day)
 
-    def __init__(self, creating_tr_during_simulation_dict: CreatingTrDuringSimulationDict,
-                 start_time: int | None = None, end_time: int | None = None):
-
+    def __init__(self, creating_tr_during_simulation_dict: CreatingTrDuringSimulationDict | None,
+                 start_time: int | None = None, end_time: int | None = None,
+                 columnar_trace: ColumnarTrace | None = None):
+        """columnar_trace: columns of the TR actions, used instead of the snapshots (the creating dict can be None
+        then)."""
         self.creating_tr_during_simulation_dict = creating_tr_during_simulation_dict
-        self.every_tr_during_simulation_data = creating_tr_during_simulation_dict.every_tr_during_simulation_data
-        self.tr_identification_str_list = creating_tr_during_simulation_dict.every_tr_identification_str_list
+        self.columnar_trace = columnar_trace
+        if columnar_trace is not None:
+            self.tr_identification_str_list = columnar_trace.get_entity_identification_str_list()
+        else:
+            self.every_tr_during_simulation_data = creating_tr_during_simulation_dict.every_tr_during_simulation_data
+            self.tr_identification_str_list = creating_tr_during_simulation_dict.every_tr_identification_str_list
 
         self.start_time = start_time
         self.end_time = end_time
@@ -27,6 +37,17 @@ class TrWorkload:
     def save_workload_statistics(self):
         self.save_workload_to_json()
         self.create_pie_charts()
+        self.save_workload_per_day()
+
+    def save_workload_per_day(self):
+        """Status times of every production day as JSON and as stacked bar chart per TR."""
+        window_edges = self.workload_engine.get_window_edges(PRODUCTION_DAY_LENGTH, self.start_time or 0, self.end_time)
+        workload_per_day_dict = self.workload_engine.calculate_status_time_dicts_per_window(window_edges)
+        save_workload_per_window_json(TR_STATISTICS / 'tr_workload_per_day.json', window_edges, workload_per_day_dict)
+        for tr_id, status_times_list in workload_per_day_dict.items():
+            safe_tr_id = tr_id.replace(":", "-").replace(" ", "_")
+            create_workload_per_window_chart(TR_STATISTICS / f'{safe_tr_id}_status_per_day_chart.png', tr_id,
+                                             window_edges, status_times_list)
 
     def calculate_workload(self):
         # Status-Gruppierung
@@ -40,49 +61,17 @@ class TrWorkload:
             "PAUSED": "Wartend"
         }
 
+        if self.columnar_trace is not None:
+            self.workload_engine = WorkloadEngine.from_columnar_trace(
+                self.columnar_trace, lambda row: status_group_map.get(row['status'], row['status']))
+        else:
+            self.workload_engine = WorkloadEngine.from_snapshots(
+                self.every_tr_during_simulation_data,
+                lambda entity_data: status_group_map.get(entity_data['working_status']['status'],
+                                                         entity_data['working_status']['status']))
+        status_times_dict = self.workload_engine.calculate_status_times(self.start_time, self.end_time)
         for tr_id in self.tr_identification_str_list:
-            status_times = defaultdict(float)
-            tr_data = self.every_tr_during_simulation_data[tr_id]
-
-            previous_timestamp = None
-            previous_status = None
-
-            for entry in tr_data:
-                timestamp = entry['timestamp']
-
-                # Filter nach Zeitraum (wenn gesetzt)
-                if self.start_time is not None and timestamp < self.start_time:
-                    continue
-                if self.end_time is not None and timestamp > self.end_time:
-                    continue
-
-                entities = entry['entities']
-                for entity in entities:
-                    entity_data = entity['entity_data']
-                    identification_str = entity_data['identification_str']
-                    if identification_str == tr_id:
-                        working_status = entity_data['working_status']
-                        raw_status = working_status['status']
-                        grouped_status = status_group_map.get(raw_status, raw_status)
-
-                        if previous_status is None:
-                            previous_status = grouped_status
-                        elif previous_status != grouped_status:
-                            if previous_timestamp is not None:
-                                duration = timestamp - previous_timestamp
-                                status_times[previous_status] += duration
-                            previous_timestamp = timestamp
-                            previous_status = grouped_status
-
-                        if previous_timestamp is not None and previous_status is not None:
-                            duration = timestamp - previous_timestamp
-                            status_times[previous_status] += duration
-
-                        previous_timestamp = timestamp
-                        previous_status = grouped_status
-                        break
-
-            self.workload_dict[tr_id] = dict(status_times)
+            self.workload_dict[tr_id] = status_times_dict.get(tr_id, {})
 
     def save_workload_to_json(self):
         json_file = TR_STATISTICS / 'tr_workload.json'
@@ -0,0 +1,175 @@
+from typing import Callable
+
+import numpy as np
+
+from src.monitoring.columnar_trace import ColumnarTrace, STRING_TABLE_COLUMN_DICT
+
+
+class WorkloadEngine:
+    """Time in state of every entity computed with NumPy. The statuses of all entities are saved in flat arrays,
+    sorted by entity and timestamp; the rows of a time window are found with searchsorted, the durations between the
+    rows (np.diff) are added up for all entities at once."""
+    entity_list: list[str]  # entity index -> identification_str
+    status_list: list[str]  # status code -> status
+    timestamps: np.ndarray  # timestamp of every row
+    status_codes: np.ndarray  # status code of every row
+    entity_offsets: np.ndarray  # rows of the entity with index i: entity_offsets[i]:entity_offsets[i + 1]
+
+    def __init__(self, entity_status_dict: dict[str, list[tuple[float, str]]]):
+        """entity_status_dict: {identification_str, [(timestamp, status)] sorted by timestamp}"""
+        self.entity_list = list(entity_status_dict.keys())
+        status_code_dict = {}
+        timestamp_list = []
+        status_code_list = []
+        self.entity_offsets = np.zeros(len(self.entity_list) + 1, dtype=np.int64)
+        for entity_index, status_list in enumerate(entity_status_dict.values()):
+            for timestamp, status in status_list:
+                timestamp_list.append(timestamp)
+                status_code_list.append(status_code_dict.setdefault(status, len(status_code_dict)))
+            self.entity_offsets[entity_index + 1] = len(timestamp_list)
+
+        self.status_list = list(status_code_dict.keys())
+        self.timestamps = np.asarray(timestamp_list, dtype=np.float64)
+        self.status_codes = np.asarray(status_code_list, dtype=np.int64)
+
+    @classmethod
+    def from_snapshots(cls, every_entity_during_simulation_data: dict[str, list[dict]],
+                       get_status: Callable[[dict], str | None]) -> "WorkloadEngine":
+        """every_entity_during_simulation_data: {identification_str, actions sorted by timestamp} (see
+        Creating*DuringSimulationDict), get_status: status of the entity_data (None -> the action is skipped)."""
+        entity_status_dict = {}
+        for identification_str, entity_data_list in every_entity_during_simulation_data.items():
+            status_list = []
+            for entry in entity_data_list:
+                for entity in entry["entities"]:
+                    entity_data = entity["entity_data"]
+                    if entity_data["identification_str"] != identification_str:
+                        continue
+                    status = get_status(entity_data)
+                    if status is not None:
+                        status_list.append((entry["timestamp"], status))
+                    break
+            entity_status_dict[identification_str] = status_list
+        return cls(entity_status_dict)
+
+    @classmethod
+    def from_columnar_trace(cls, columnar_trace: ColumnarTrace, get_status: Callable[[dict], str | None],
+                            status_columns: tuple[str, ...] = ("status",)) -> "WorkloadEngine":
+        """get_status: status of the values of the status_columns of a row ({column, value}, string columns as
+        strings, None -> the row is skipped). get_status is called once per combination of values, not per row."""
+        rows, row_offsets = columnar_trace.get_rows_by_entity()
+        row_values = np.stack([np.asarray(columnar_trace.get_column(column)[rows]) for column in status_columns],
+                              axis=1).astype(np.int64)
+        value_combinations, first_rows, combination_indexes = np.unique(
+            row_values.reshape(len(rows), len(status_columns)), axis=0, return_index=True, return_inverse=True)
+
+        # status codes in the order of the first row (like from_snapshots)
+        status_code_dict = {}
+        combination_status_codes = np.full(len(value_combinations), -1, dtype=np.int64)
+        for combination_index in np.argsort(first_rows).tolist():
+            values = value_combinations[combination_index]
+            value_dict = {column: columnar_trace.get_strings(column, values[[column_index]])[0]
+                          if column in STRING_TABLE_COLUMN_DICT else int(values[column_index])
+                          for column_index, column in enumerate(status_columns)}
+            status = get_status(value_dict)
+            if status is not None:
+                combination_status_codes[combination_index] = status_code_dict.setdefault(status,
+                                                                                          len(status_code_dict))
+
+        status_codes = combination_status_codes[combination_indexes.reshape(-1)]
+        is_kept = status_codes >= 0
+        kept_rows_before = np.concatenate([[0], np.cumsum(is_kept)])
+
+        workload_engine = cls.__new__(cls)
+        workload_engine.entity_list = columnar_trace.get_entity_identification_str_list()
+        workload_engine.status_list = list(status_code_dict.keys())
+        workload_engine.timestamps = np.asarray(columnar_trace.get_column("timestamp")[rows], dtype=np.float64)[is_kept]
+        workload_engine.status_codes = status_codes[is_kept]
+        workload_engine.entity_offsets = kept_rows_before[row_offsets].astype(np.int64)
+        return workload_engine
+
+    def calculate_status_times(self, start_time: float | None = None, end_time: float | None = None) -> \
+            dict[str, dict[str, float]]:
+        """{identification_str, {status, time}} of the actions between start_time and end_time (both included).
+        The time between two actions counts for the status of the first one. Every status of an entity with at least
+        two actions in the window is returned in the order of its first action (also with time 0)."""
+        first_rows, end_rows = self.get_window_rows(start_time, end_time)
+
+        pair_rows = np.concatenate([np.arange(first_row, end_row - 1) for first_row, end_row in
+                                    zip(first_rows.tolist(), end_rows.tolist())] + [np.zeros(0, dtype=np.int64)])
+        entity_indexes = np.repeat(np.arange(len(self.entity_list)), np.maximum(end_rows - first_rows - 1, 0))
+        durations = self.timestamps[pair_rows + 1] - self.timestamps[pair_rows]
+        number_of_status = max(len(self.status_list), 1)
+        status_times = np.bincount(entity_indexes * number_of_status + self.status_codes[pair_rows],
+                                   weights=durations, minlength=len(self.entity_list) * number_of_status)
+        status_times = status_times.reshape(len(self.entity_list), number_of_status)
+
+        status_time_dict = {}
+        for entity_index, identification_str in enumerate(self.entity_list):
+            first_row, end_row = int(first_rows[entity_index]), int(end_rows[entity_index])
+            status_time_dict[identification_str] = {}
+            if end_row - first_row < 2:
+                continue
+            status_codes = self.status_codes[first_row:end_row]
+            _, first_indexes = np.unique(status_codes, return_index=True)
+            for status_code in status_codes[np.sort(first_indexes)].tolist():
+                status_time_dict[identification_str][self.status_list[status_code]] = \
+                    float(status_times[entity_index, status_code])
+        return status_time_dict
+
+    def get_window_rows(self, start_time: float | None, end_time: float | None) -> tuple[np.ndarray, np.ndarray]:
+        """(first row, end row) of every entity inside the time window."""
+        first_rows = self.entity_offsets[:-1].copy()
+        end_rows = self.entity_offsets[1:].copy()
+        for entity_index in range(len(self.entity_list)):
+            timestamps = self.timestamps[first_rows[entity_index]:end_rows[entity_index]]
+            offset = first_rows[entity_index]
+            if start_time is not None:
+                first_rows[entity_index] = offset + np.searchsorted(timestamps, start_time, side="left")
+            if end_time is not None:
+                end_rows[entity_index] = offset + np.searchsorted(timestamps, end_time, side="right")
+        return first_rows, end_rows
+
+    def calculate_status_times_per_window(self, window_edges: np.ndarray | list[float]) -> dict[str, np.ndarray]:
+        """{identification_str, time in state [window, status code]} of the windows between the window_edges (e.g.
+        one window per shift or day for a utilisation curve). The status intervals are cut at the window edges; the
+        time before the first and after the last action of an entity isn't counted."""
+        window_edges = np.asarray(window_edges, dtype=np.float64)
+        number_of_status = len(self.status_list)
+        status_time_dict = {}
+        for entity_index, identification_str in enumerate(self.entity_list):
+            rows = slice(self.entity_offsets[entity_index], self.entity_offsets[entity_index + 1])
+            timestamps = self.timestamps[rows]
+            if len(timestamps) == 0:
+                status_time_dict[identification_str] = np.zeros((max(len(window_edges) - 1, 0), number_of_status))
+                continue
+
+            # cumulated time in state until every action, then until every window edge
+            status_matrix = np.eye(number_of_status)[self.status_codes[rows]]
+            cumulated_status_times = np.zeros((len(timestamps), number_of_status))
+            cumulated_status_times[1:] = np.cumsum(status_matrix[:-1] * np.diff(timestamps)[:, np.newaxis], axis=0)
+
+            edges = np.clip(window_edges, timestamps[0], timestamps[-1])
+            edge_rows = np.searchsorted(timestamps, edges, side="right") - 1
+            edge_status_times = cumulated_status_times[edge_rows] + \
+                (edges - timestamps[edge_rows])[:, np.newaxis] * status_matrix[edge_rows]
+            status_time_dict[identification_str] = np.diff(edge_status_times, axis=0)
+        return status_time_dict
+
+    def get_window_edges(self, window_length: float, start_time: float = 0, end_time: float | None = None) -> \
+            np.ndarray:
+        """Edges of windows with the same length (e.g. 28800 -> one window per production day) until end_time
+        (None -> last action)."""
+        if end_time is None:
+            end_time = float(self.timestamps.max()) if len(self.timestamps) != 0 else start_time
+        number_of_windows = max(int(np.ceil((end_time - start_time) / window_length)), 1)
+        return start_time + window_length * np.arange(number_of_windows + 1)
+
+    def calculate_status_time_dicts_per_window(self, window_edges: np.ndarray | list[float]) -> \
+            dict[str, list[dict[str, float]]]:
+        """calculate_status_times_per_window as {identification_str, [{status, time} of every window]} (only the
+        status with a time in the window) for the JSON files and charts of the workload classes."""
+        return {identification_str: [{self.status_list[status_code]: float(status_time)
+                                      for status_code, status_time in enumerate(window_status_times.tolist())
+                                      if status_time > 0} for window_status_times in status_times]
+                for identification_str, status_times in self.calculate_status_times_per_window(window_edges).items()}
@@ -0,0 +1,54 @@
+import json
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+PRODUCTION_DAY_LENGTH = 28800  # 8h working time
+
+COLOR_LIST = [
+    (116 / 255, 33 / 255, 40 / 255),
+    (161 / 255, 204 / 255, 201 / 255),
+    (219 / 255, 203 / 255, 150 / 255),
+    (191 / 255, 194 / 255, 186 / 255),
+    (207 / 255, 171 / 255, 140 / 255),
+    (146 / 255, 175 / 255, 204 / 255),
+    (177 / 255, 153 / 255, 174 / 255)
+]
+
+
+def save_workload_per_window_json(json_file: Path, window_edges: np.ndarray,
+                                  workload_per_window_dict: dict[str, list[dict[str, float]]]):
+    """{"window_edges": [...], "workload": {identification_str, [{status, time} of every window]}}"""
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump({"window_edges": window_edges.tolist(), "workload": workload_per_window_dict}, f, indent=4)
+    print(f"[OK] Workload pro Tag gespeichert unter: {json_file}")
+
+
+def create_workload_per_window_chart(chart_file: Path, title: str, window_edges: np.ndarray,
+                                     status_times_per_window: list[dict[str, float]]):
+    """Stacked bars with the share of every status in every window (utilisation curve of one entity)."""
+    status_list = list(dict.fromkeys(status for status_times in status_times_per_window for status in status_times))
+    if not status_list:
+        print(f"[Info] Kein Zeitanteil für {title}, kein Diagramm erzeugt.")
+        return
+
+    window_totals = np.array([sum(status_times.values()) for status_times in status_times_per_window])
+    window_totals[window_totals == 0] = 1
+    day_labels = [f"Tag {int(window_start // PRODUCTION_DAY_LENGTH) + 1}" for window_start in window_edges[:-1]]
+    bottom = np.zeros(len(status_times_per_window))
+
+    plt.figure(figsize=(max(6, len(day_labels) * 0.6), 4))
+    for status_index, status in enumerate(status_list):
+        shares = np.array([status_times.get(status, 0.0) for status_times in status_times_per_window]) / \
+            window_totals * 100
+        plt.bar(day_labels, shares, bottom=bottom, label=status, color=COLOR_LIST[status_index % len(COLOR_LIST)])
+        bottom += shares
+    plt.title(f'{title} - Statusverteilung pro Tag')
+    plt.ylabel('Anteil [%]')
+    plt.ylim(0, 100)
+    plt.legend(loc='center left', bbox_to_anchor=(1, 0.5))
+
+    plt.savefig(chart_file, dpi=300, bbox_inches='tight')
+    plt.close()
+    print(f"[OK] Diagramm gespeichert unter: {chart_file}")
@@ -1,21 +1,31 @@
 import json
-from collections import defaultdict
 import matplotlib.pyplot as plt
 
+from src.monitoring.columnar_trace import ColumnarTrace
 from src.monitoring.data_analysis.creating_wr_during_simulation_dict import CreatingWrDuringSimulationDict
+from src.monitoring.data_analysis.workload_engine import WorkloadEngine
+from src.monitoring.data_analysis.workload_per_window_chart import PRODUCTION_DAY_LENGTH, \
+    create_workload_per_window_chart, save_workload_per_window_json
 from src.constant.constant import WorkingRobotStatus
 from src import WR_STATISTICS
 
 
 class WrWorkload:
     workload_dict: dict[str, dict[str, int]]  # dict[tr.identification_str, dict[status, time]]
+    workload_engine: WorkloadEngine  # grouped status of every action (e.g. for utilisation per shift or day)
 
-    def __init__(self, creating_wr_during_simulation_dict: CreatingWrDuringSimulationDict,
-                        start_time: int | None = None, end_time: int | None = None):
-
+    def __init__(self, creating_wr_during_simulation_dict: CreatingWrDuringSimulationDict | None,
+                        start_time: int | None = None, end_time: int | None = None,
+                        columnar_trace: ColumnarTrace | None = None):
+        """columnar_trace: columns of the WR actions, used instead of the snapshots (the creating dict can be None
+        then)."""
         self.creating_wr_during_simulation_dict = creating_wr_during_simulation_dict
-        self.every_wr_during_simulation_data = self.creating_wr_during_simulation_dict.every_wr_during_simulation_data
-        self.wr_identification_str_list = self.creating_wr_during_simulation_dict.every_wr_identification_str_list
+        self.columnar_trace = columnar_trace
+        if columnar_trace is not None:
+            self.wr_identification_str_list = columnar_trace.get_entity_identification_str_list()
+        else:
+            self.every_wr_during_simulation_data = self.creating_wr_during_simulation_dict.every_wr_during_simulation_data
+            self.wr_identification_str_list = self.creating_wr_during_simulation_dict.every_wr_identification_str_list
 
         self.start_time = start_time
         self.end_time = end_time
@@ -27,6 +37,17 @@ class WrWorkload:
     def save_workload_statistics(self):
         self.save_workload_to_json()
         self.create_pie_charts()
+        self.save_workload_per_day()
+
+    def save_workload_per_day(self):
+        """Status times of every production day as JSON and as stacked bar chart per WR."""
+        window_edges = self.workload_engine.get_window_edges(PRODUCTION_DAY_LENGTH, self.start_time or 0, self.end_time)
+        workload_per_day_dict = self.workload_engine.calculate_status_time_dicts_per_window(window_edges)
+        save_workload_per_window_json(WR_STATISTICS / 'wr_workload_per_day.json', window_edges, workload_per_day_dict)
+        for wr_id, status_times_list in workload_per_day_dict.items():
+            safe_wr_id = wr_id.replace(":", "-").replace(" ", "_")
+            create_workload_per_window_chart(WR_STATISTICS / f'{safe_wr_id}_status_per_day_chart.png', wr_id,
+                                             window_edges, status_times_list)
 
     def calculate_workload(self):
         status_group_map = {
@@ -39,45 +60,16 @@ class WrWorkload:
             "RETURNING": "In Bewegung"
         }
 
+        if self.columnar_trace is not None:
+            self.workload_engine = WorkloadEngine.from_columnar_trace(
+                self.columnar_trace, lambda row: status_group_map.get(row['status'], "Sonstige"))
+        else:
+            self.workload_engine = WorkloadEngine.from_snapshots(
+                self.every_wr_during_simulation_data,
+                lambda entity_data: status_group_map.get(entity_data['working_status']['status'], "Sonstige"))
+        status_times_dict = self.workload_engine.calculate_status_times(self.start_time, self.end_time)
         for wr_id in self.wr_identification_str_list:
-            status_times = defaultdict(float)
-            wr_data = self.every_wr_during_simulation_data[wr_id]
-
-            previous_timestamp = None
-            previous_status = None
-
-            for entry in wr_data:
-                timestamp = entry['timestamp']
-                if self.start_time is not None and timestamp < self.start_time:
-                    continue
-                if self.end_time is not None and timestamp > self.end_time:
-                    continue
-
-                for entity in entry['entities']:
-                    entity_data = entity['entity_data']
-                    identification_str = entity_data['identification_str']
-                    if identification_str == wr_id:
-                        raw_status = entity_data['working_status']['status']
-                        grouped_status = status_group_map.get(raw_status, "Sonstige")
-
-                        if previous_status is None:
-                            previous_status = grouped_status
-                        elif previous_status != grouped_status:
-                            if previous_timestamp is not None:
-                                duration = timestamp - previous_timestamp
-                                status_times[previous_status] += duration
-                            previous_timestamp = timestamp
-                            previous_status = grouped_status
-
-                        if previous_timestamp is not None and previous_status is not None:
-                            duration = timestamp - previous_timestamp
-                            status_times[previous_status] += duration
-
-                        previous_timestamp = timestamp
-                        previous_status = grouped_status
-                        break
-
-            self.workload_dict[wr_id] = dict(status_times)
+            self.workload_dict[wr_id] = status_times_dict.get(wr_id, {})
 
     def save_workload_to_json(self):
         json_file = WR_STATISTICS / 'wr_workload.json'
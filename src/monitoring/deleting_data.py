@@ -55,8 +55,9 @@ class DeletingData:
         self.delete_xlsx_data_in_path(MACHINE_STATISTICS)
 
     def delete_json_data_in_path(self, path: pathlib.Path):
-
-        json_files = list(path.glob("*.json"))
+        """Deletes the json files and the trace files (json lines, columns) in path."""
+        json_files = list(path.glob("*.json")) + list(path.glob("*.jsonl")) + list(path.glob("*.jsonl.gz")) + \
+            list(path.glob("simulation_*_column_*.bin"))
         for file_path in json_files:
             try:
                 file_path.unlink()
@@ -0,0 +1,96 @@
+class DeltaTraceEncoder:
+    """Encodes saved entity actions ({"timestamp", "entities": [snapshot]}) as state changes. The first action of an
+    entity is saved as keyframe (complete snapshot), every following action only with the fields, which have
+    changed ("set": [[path, value]], "removed": [path]). Actions without a changed field are not saved; the last of
+    them is saved as empty change at the end of the simulation, so the traced time of every entity stays the same.
+    Lists are compared and saved as one value."""
+    last_state_dict: dict[str, dict[tuple, object]]  # {entity key, {field path, value}} of the last saved action
+    last_skipped_timestamp_dict: dict[str, float]  # {entity key, timestamp of the last unsaved action}
+
+    def __init__(self):
+        self.last_state_dict = {}
+        self.last_skipped_timestamp_dict = {}
+
+    def encode(self, data_entry: dict) -> dict | None:
+        """Record of the action (None -> nothing has changed since the last saved action of the entity)."""
+        snapshot = data_entry["entities"][0]
+        key = get_entity_key(snapshot)
+        state = flatten(snapshot)
+        last_state = self.last_state_dict.get(key)
+        self.last_state_dict[key] = state
+
+        if last_state is None:
+            return {"timestamp": data_entry["timestamp"], "key": key, "keyframe": snapshot}
+
+        set_list = [[list(path), value] for path, value in state.items()
+                    if path not in last_state or last_state[path] != value]
+        removed_list = [list(path) for path in last_state if path not in state]
+        if len(set_list) == 0 and len(removed_list) == 0:
+            self.last_skipped_timestamp_dict[key] = data_entry["timestamp"]
+            return None
+
+        self.last_skipped_timestamp_dict.pop(key, None)
+        record = {"timestamp": data_entry["timestamp"], "key": key, "set": set_list}
+        if len(removed_list) != 0:
+            record["removed"] = removed_list
+        return record
+
+    def get_closing_records(self) -> list[dict]:
+        """Empty changes at the time of the last unsaved action of every entity (end of simulation)."""
+        closing_records = [{"timestamp": timestamp, "key": key, "set": []} for key, timestamp in
+                           self.last_skipped_timestamp_dict.items()]
+        self.last_skipped_timestamp_dict = {}
+        return closing_records
+
+
+class DeltaTraceDecoder:
+    """Rebuilds the complete entity actions ({"timestamp", "entities": [snapshot]}) from the records of the
+    DeltaTraceEncoder."""
+    state_dict: dict[str, dict[tuple, object]]  # {entity key, {field path, value}}
+
+    def __init__(self):
+        self.state_dict = {}
+
+    def decode(self, record: dict) -> dict:
+        key = record["key"]
+        if "keyframe" in record:
+            state = flatten(record["keyframe"])
+        else:
+            state = self.state_dict[key]
+            for path in record.get("removed", []):
+                state.pop(tuple(path), None)
+            for path, value in record["set"]:
+                state[tuple(path)] = value
+        self.state_dict[key] = state
+
+        return {"timestamp": record["timestamp"], "entities": [unflatten(state)]}
+
+    def decode_records(self, records: list[dict]) -> list[dict]:
+        return [self.decode(record) for record in records]
+
+
+def get_entity_key(snapshot: dict) -> str:
+    entity_data = snapshot["entity_data"] or {}
+    return f"{snapshot['entity_type']}:{entity_data.get('identification_str', '')}"
+
+
+def flatten(value: dict, path: tuple = ()) -> dict[tuple, object]:
+    """{field path, value} of every field of the nested dict (empty dicts and lists are values)."""
+    flat_dict = {}
+    for key, child in value.items():
+        child_path = path + (key,)
+        if isinstance(child, dict) and len(child) != 0:
+            flat_dict.update(flatten(child, child_path))
+        else:
+            flat_dict[child_path] = child
+    return flat_dict
+
+
+def unflatten(flat_dict: dict[tuple, object]) -> dict:
+    value = {}
+    for path, child in flat_dict.items():
+        parent = value
+        for key in path[:-1]:
+            parent = parent.setdefault(key, {})
+        parent[path[-1]] = child
+    return value
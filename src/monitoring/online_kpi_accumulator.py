@@ -0,0 +1,145 @@
+import bisect
+import math
+from collections import defaultdict
+
+import simpy
+
+from src.entity.machine.machine import Machine
+from src.entity.transport_robot.transport_robot import TransportRobot
+from src.entity.working_robot.working_robot import WorkingRobot
+from src.production.production import Production
+
+
+class OnlineKpiAccumulator:
+    """Material flows, time in state of every entity and lead times of the products, accumulated while the
+    simulation runs (listener of SavingSimulationData). Every KPI can be read at any simulation time without reading
+    the trace files, e.g. the material flows of the previous day for the topology manager.
+
+    Statuses: TR and WR -> working_status.status, machine -> "working_robot_status|storage_status" (like the
+    ColumnarTraceWriter)."""
+    transport_list: list[tuple[float, str, str, int]]  # (time, from station, to station, quantity), sorted by time
+    transport_time_list: list[float]  # time of every transport of transport_list (for binary search)
+    last_transport_order_dict: dict[str, tuple]  # {tr.identification_str, (from, to, quantity) of the last order}
+    status_times_dict: dict[str, dict[str, float]]  # {identification_str, {status, time}}
+    current_status_dict: dict[str, tuple[str, float]]  # {identification_str, (status, since)}
+    product_entry_queue_dict: dict[str, list[list[float]]]  # {product group, [[quantity, entry time]]} (FIFO)
+    lead_time_dict: dict[str, list[float]]  # {product group, [quantity, sum of times, sum of squared times]}
+
+    def __init__(self, env: simpy.Environment, production: Production):
+        self.env = env
+        self.production = production
+        self.transport_list = []
+        self.transport_time_list = []
+        self.last_transport_order_dict = {}
+        self.status_times_dict = {}
+        self.current_status_dict = {}
+        self.product_entry_queue_dict = defaultdict(list)
+        self.lead_time_dict = {}
+
+    def entity_action_saved(self, entity):
+        """Listener of SavingSimulationData.save_entity_action."""
+        status = self.get_status(entity)
+        if status is not None:
+            self.update_status(entity.identification_str, status)
+        if isinstance(entity, TransportRobot):
+            self.update_material_flow(entity)
+
+    def get_status(self, entity) -> str | None:
+        if isinstance(entity, TransportRobot | WorkingRobot):
+            return entity.working_status.status.name
+        elif isinstance(entity, Machine):
+            return f"{entity.working_status.working_robot_status.value}|{entity.working_status.storage_status.value}"
+        return None
+
+    def update_status(self, identification_str: str, status: str):
+        status_times = self.status_times_dict.setdefault(identification_str, {})
+        current_status = self.current_status_dict.get(identification_str)
+        if current_status is not None:
+            previous_status, since = current_status
+            status_times[previous_status] = status_times.get(previous_status, 0.0) + self.env.now - since
+        status_times.setdefault(status, 0.0)
+        self.current_status_dict[identification_str] = (status, self.env.now)
+
+    def update_material_flow(self, tr: TransportRobot):
+        """A transport order is counted at the first action of the TR with the order and a quantity > 0 (like
+        MaterialFlow)."""
+        transport_order = tr.transport_order
+        if transport_order is None or transport_order.pick_up_station is None or \
+                transport_order.unload_destination is None or transport_order.quantity < 0:
+            return
+        current_order = (transport_order.pick_up_station.identification_str,
+                         transport_order.unload_destination.identification_str, transport_order.quantity)
+        if current_order == self.last_transport_order_dict.get(tr.identification_str):
+            return
+        self.last_transport_order_dict[tr.identification_str] = current_order
+        if transport_order.quantity > 0:
+            self.transport_list.append((self.env.now,) + current_order)
+            self.transport_time_list.append(self.env.now)
+
+    def product_entered(self, product_group: str, quantity: int, time: float):
+        """Listener of SavingSimulationData.data_goods_receipt."""
+        self.product_entry_queue_dict[product_group].append([quantity, time])
+
+    def product_left(self, product_group: str, quantity: int, time: float):
+        """Listener of SavingSimulationData.data_order_completed. The lead time is calculated FIFO (like
+        ProductThroughput)."""
+        entry_queue = self.product_entry_queue_dict[product_group]
+        lead_time = self.lead_time_dict.setdefault(product_group, [0, 0.0, 0.0])
+        remaining_quantity = quantity
+        while remaining_quantity > 0 and entry_queue:
+            entry_quantity, entry_time = entry_queue[0]
+            quantity_to_process = min(entry_quantity, remaining_quantity)
+            time_difference = time - entry_time
+            lead_time[0] += quantity_to_process
+            lead_time[1] += quantity_to_process * time_difference
+            lead_time[2] += quantity_to_process * time_difference ** 2
+
+            entry_queue[0][0] -= quantity_to_process
+            if entry_queue[0][0] == 0:
+                entry_queue.pop(0)
+            remaining_quantity -= quantity_to_process
+
+    def create_material_flow_matrix(self, start_time: int = 0, end_time: int = float('inf')) -> \
+            dict[str, dict[str, int]]:
+        """Material flows between start_time and end_time (both included) in the format of MaterialFlow, with every
+        machine and intermediate store of the production."""
+        first = bisect.bisect_left(self.transport_time_list, start_time)
+        end = bisect.bisect_right(self.transport_time_list, end_time)
+
+        # stations in the order of the production, then the other stations in the order of their first transport
+        # (the same order in every process -> the same layout of the topology manager for the same seed)
+        all_stations = dict.fromkeys(machine.identification_str for machine in self.production.machine_list)
+        all_stations.update(dict.fromkeys(store.identification_str for store in
+                                          self.production.intermediate_store_list))
+        for _, from_station, to_station, _ in self.transport_list[first:end]:
+            all_stations.update(dict.fromkeys([from_station, to_station]))
+
+        material_flow_matrix = {station: {target: 0 for target in all_stations if target != station}
+                                for station in all_stations}
+        for _, from_station, to_station, quantity in self.transport_list[first:end]:
+            if from_station != to_station:
+                material_flow_matrix[from_station][to_station] += quantity
+        return material_flow_matrix
+
+    def get_status_times(self) -> dict[str, dict[str, float]]:
+        """{identification_str, {status, time}} until now (the current status counts until now)."""
+        status_times_dict = {}
+        for identification_str, status_times in self.status_times_dict.items():
+            status_times_dict[identification_str] = dict(status_times)
+            status, since = self.current_status_dict[identification_str]
+            status_times_dict[identification_str][status] += self.env.now - since
+        return status_times_dict
+
+    def get_lead_time_statistics(self) -> dict[str, dict[str, float]]:
+        """{product group, {"quantity", "mean", "std"}} of the lead times in seconds (FIFO)."""
+        lead_time_statistics = {}
+        for product_group, (quantity, time_sum, squared_time_sum) in self.lead_time_dict.items():
+            if quantity == 0:
+                continue
+            mean = time_sum / quantity
+            lead_time_statistics[product_group] = {
+                "quantity": quantity,
+                "mean": mean,
+                "std": math.sqrt(max(squared_time_sum / quantity - mean ** 2, 0.0))
+            }
+        return lead_time_statistics
@@ -0,0 +1,128 @@
+import gzip
+import json
+import pathlib
+import queue
+import threading
+from typing import TextIO
+
+
+class TraceWriter:
+    """Append-only writer for JSON Lines trace files (one record per line). Every file stays open during the
+    simulation, so saving new records never reads or rewrites the records saved before."""
+    open_file_dict: dict[pathlib.Path, TextIO]  # {path of the trace file, opened file}
+
+    def __init__(self, compress: bool = False):
+        """compress: True -> the trace files are written gzip compressed (file_name.jsonl.gz)."""
+        self.compress = compress
+        self.open_file_dict = {}
+
+    def append_records(self, output_file: pathlib.Path, records: list[dict]):
+        if len(records) == 0:
+            return
+
+        file = self.open_file_dict.get(output_file)
+        if file is None:
+            file = self.open_trace_file(output_file)
+            self.open_file_dict[output_file] = file
+
+        file.writelines(json.dumps(record) + "\n" for record in records)
+
+    def open_trace_file(self, output_file: pathlib.Path) -> TextIO:
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        if self.compress:
+            return gzip.open(output_file.with_name(output_file.name + ".gz"), "at", encoding="utf-8")
+        return open(output_file, "a", encoding="utf-8")
+
+    def flush(self):
+        for file in self.open_file_dict.values():
+            file.flush()
+
+    def close(self):
+        for file in self.open_file_dict.values():
+            file.close()
+        self.open_file_dict = {}
+
+
+class BackgroundTraceWriter:
+    """Runs a TraceWriter in a writer thread. The simulation only puts the records into a bounded queue, the writer
+    thread serialises, compresses and saves them. If the writer can't keep up and the queue is full, the simulation
+    waits until there is space again (backpressure); the number of these waits is counted."""
+    record_queue: queue.Queue  # (command, output_file, records)
+
+    def __init__(self, trace_writer: TraceWriter, max_queue_size: int = 10000):
+        self.trace_writer = trace_writer
+        self.record_queue = queue.Queue(maxsize=max_queue_size)
+        self.number_of_backpressure_waits = 0
+        self.writer_error = None
+
+        self.writer_thread = threading.Thread(target=self.run_writer, name="BackgroundTraceWriter", daemon=True)
+        self.writer_thread.start()
+
+    def append_records(self, output_file: pathlib.Path, records: list[dict]):
+        if len(records) == 0:
+            return
+        self.put(("append", output_file, records))
+
+    def flush(self):
+        self.put(("flush", None, None))
+
+    def close(self):
+        """Waits until every record in the queue is saved and closes the trace files."""
+        if self.writer_thread.is_alive():
+            self.put(("close", None, None))
+            self.writer_thread.join()
+        self.raise_writer_error()
+
+    def put(self, item: tuple):
+        self.raise_writer_error()
+        try:
+            self.record_queue.put_nowait(item)
+        except queue.Full:
+            self.number_of_backpressure_waits += 1
+            while True:
+                try:
+                    self.record_queue.put(item, timeout=1)
+                    return
+                except queue.Full:
+                    self.raise_writer_error()
+
+    def run_writer(self):
+        while True:
+            command, output_file, records = self.record_queue.get()
+            try:
+                if command == "append":
+                    self.trace_writer.append_records(output_file, records)
+                elif command == "flush":
+                    self.trace_writer.flush()
+                elif command == "close":
+                    self.trace_writer.close()
+                    return
+            except Exception as e:
+                self.writer_error = e
+                self.trace_writer.close()
+                return
+
+    def raise_writer_error(self):
+        if self.writer_error is not None:
+            raise RuntimeError("BackgroundTraceWriter couldn't save the trace") from self.writer_error
+
+
+def find_trace_file(trace_file: pathlib.Path) -> pathlib.Path | None:
+    """The trace file or its gzip compressed version (None -> no trace was saved)."""
+    for path in [trace_file, trace_file.with_name(trace_file.name + ".gz")]:
+        if path.exists():
+            return path
+    return None
+
+
+def read_trace_file(trace_file: pathlib.Path) -> list[dict]:
+    """Every record of a JSON Lines trace file (an incomplete last line of an aborted simulation is skipped)."""
+    records = []
+    open_function = gzip.open if trace_file.name.endswith(".gz") else open
+    with open_function(trace_file, "rt", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                print(f"Unvollständiger Eintrag in {trace_file.name} wird übersprungen")
+    return records
@@ -0,0 +1,252 @@
+import copy
+import hashlib
+import itertools
+import json
+import os
+import pathlib
+import random
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+
+import pandas as pd
+
+from src import RESOURCES, SIMULATION_RUNS, DISTANCE_MATRIX_CACHE
+from src.monitoring.data_analysis.trace_repository import TRACE_CACHE
+from src.replication_runner import ReplicationRunner
+
+# caches inside the resources, which are created again from the other files (not part of the config hash)
+RESOURCE_CACHE_FOLDER_NAMES = [DISTANCE_MATRIX_CACHE.name, TRACE_CACHE]
+
+
+@dataclass(frozen=True)
+class SweepPoint:
+    number_of_tr: int
+    tr_capacity: int
+    number_of_wr: int
+    topology_method: int  # No algorithm (1), QAP (2), GA (3), FDP(4), QAP tabu search (5)
+
+    def get_config_hash(self, number_of_replications: int, base_seed: int, resources_hash: str) -> str:
+        """Identifies the completed results of the design point in the sweep folder. resources_hash: hash of the
+        resource files of the design point (see ParameterSweep.get_resources_hash), so the design point is run
+        again after a change of the default resources."""
+        config = {**asdict(self), "number_of_replications": number_of_replications, "base_seed": base_seed,
+                  "resources_hash": resources_hash}
+        return hashlib.sha1(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+class ParameterSweep:
+    """Runs the simulation for every design point of a grid or latin hypercube over the number and capacity of the tr,
+    the number of wr and the topology method. The resource files of a design point are built in memory from the
+    default resources and written into the folder of the point, so RESOURCES is never changed. Completed points are
+    found by their config hash (parameters and resource files), an interrupted sweep continues with the missing
+    points and the points with a failed replication."""
+    parameter_names = ["number_of_tr", "tr_capacity", "number_of_wr", "topology_method"]
+    sweep_folder: pathlib.Path
+    config_hash_dict: dict[SweepPoint, str]  # {sweep point, config hash}
+    resource_file_hash_dict: dict[str, str] | None  # {relative path, sha1 of the content} of every default resource
+
+    def __init__(self, sweep_folder: pathlib.Path | None = None, number_of_replications: int = 1, base_seed: int = 0,
+                 max_workers: int | None = None):
+        self.sweep_folder = sweep_folder if sweep_folder is not None else SIMULATION_RUNS / "parameter_sweep"
+        self.number_of_replications = number_of_replications
+        self.base_seed = base_seed
+        self.max_workers = max_workers if max_workers is not None else os.cpu_count()
+        self.config_hash_dict = {}
+        self.resource_file_hash_dict = None
+
+    def create_grid(self, parameter_values: dict[str, list[int]]) -> list[SweepPoint]:
+        """Every combination of the parameter values."""
+        value_lists = [parameter_values[name] for name in self.parameter_names]
+        return [SweepPoint(*values) for values in itertools.product(*value_lists)]
+
+    def create_latin_hypercube(self, parameter_values: dict[str, list[int]], number_of_points: int,
+                               seed: int = 0) -> list[SweepPoint]:
+        """number_of_points design points, every parameter range is divided into number_of_points strata and every
+        stratum is used once per parameter. Points, which are equal after mapping onto the discrete values, are only
+        returned once."""
+        generator = random.Random(seed)
+        value_columns = []
+        for name in self.parameter_names:
+            values = parameter_values[name]
+            strata = [(stratum + generator.random()) / number_of_points for stratum in range(number_of_points)]
+            generator.shuffle(strata)
+            value_columns.append([values[min(int(u * len(values)), len(values) - 1)] for u in strata])
+
+        sweep_points = []
+        for values in zip(*value_columns):
+            sweep_point = SweepPoint(*values)
+            if sweep_point not in sweep_points:
+                sweep_points.append(sweep_point)
+        return sweep_points
+
+    def run_sweep(self, sweep_points: list[SweepPoint]) -> pd.DataFrame:
+        """Runs every replication of every design point without results (at most max_workers at the same time) and
+        returns the results table of every design point."""
+        open_sweep_points = [sweep_point for sweep_point in sweep_points if
+                             self.check_sweep_point_completed(sweep_point) is False]
+        print(f"Parameter sweep: {len(sweep_points) - len(open_sweep_points)} of {len(sweep_points)} design points "
+              f"already completed")
+
+        replication_runner_dict = {sweep_point: self.prepare_sweep_point(sweep_point)
+                                   for sweep_point in open_sweep_points}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            future_dict = {sweep_point: [executor.submit(replication_runner.run_one_replication, run_number)
+                                         for run_number in range(1, self.number_of_replications + 1)]
+                           for sweep_point, replication_runner in replication_runner_dict.items()}
+            for sweep_point, futures in future_dict.items():
+                replication_results = [future.result() for future in futures]
+                self.save_sweep_point_results(sweep_point, replication_results)
+                failed_runs = [replication_result["run"] for replication_result in replication_results if
+                               replication_result["return_code"] != 0]
+                if failed_runs:
+                    print(f"Parameter sweep: replications {failed_runs} of {sweep_point} failed, the design point "
+                          f"is run again by the next sweep")
+
+        results_table = self.create_results_table(sweep_points)
+        results_table.to_csv(self.sweep_folder / "sweep_results.csv", index=False)
+        return results_table
+
+    def get_sweep_point_folder(self, sweep_point: SweepPoint) -> pathlib.Path:
+        config_hash = self.config_hash_dict.get(sweep_point)
+        if config_hash is None:
+            config_hash = sweep_point.get_config_hash(self.number_of_replications, self.base_seed,
+                                                      self.get_resources_hash(sweep_point))
+            self.config_hash_dict[sweep_point] = config_hash
+        return self.sweep_folder / config_hash
+
+    def get_resources_hash(self, sweep_point: SweepPoint) -> str:
+        """Hash of the resource files of the design point: the config files built by create_config_files and every
+        other file copied from RESOURCES (without the caches)."""
+        if self.resource_file_hash_dict is None:
+            self.resource_file_hash_dict = {}
+            for file in RESOURCES.rglob("*"):
+                relative_path = file.relative_to(RESOURCES)
+                if not file.is_file() or any(name in relative_path.parts for name in RESOURCE_CACHE_FOLDER_NAMES):
+                    continue
+                self.resource_file_hash_dict[relative_path.as_posix()] = hashlib.sha1(file.read_bytes()).hexdigest()
+
+        file_hash_dict = dict(self.resource_file_hash_dict)
+        for file_name, data in self.create_config_files(sweep_point).items():
+            file_hash_dict[file_name] = hashlib.sha1(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+        return hashlib.sha1(json.dumps(file_hash_dict, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def check_sweep_point_completed(self, sweep_point: SweepPoint) -> bool:
+        """Completed -> the results of every replication are saved and every replication succeeded."""
+        if self.check_sweep_point_results_saved(sweep_point) is False:
+            return False
+        replication_results = self.load_sweep_point_results(sweep_point)
+        return len(replication_results) == self.number_of_replications and all(
+            replication_result["return_code"] == 0 for replication_result in replication_results)
+
+    def check_sweep_point_results_saved(self, sweep_point: SweepPoint) -> bool:
+        return (self.get_sweep_point_folder(sweep_point) / "sweep_point_results.json").exists()
+
+    def prepare_sweep_point(self, sweep_point: SweepPoint) -> ReplicationRunner:
+        """Copies the default resources into the folder of the design point and writes the changed config files."""
+        sweep_point_folder = self.get_sweep_point_folder(sweep_point)
+        resources_folder = sweep_point_folder / "resources"
+        shutil.copytree(RESOURCES, resources_folder, dirs_exist_ok=True)
+
+        for file_name, data in self.create_config_files(sweep_point).items():
+            with open(resources_folder / file_name, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
+
+        return ReplicationRunner(number_of_runs=self.number_of_replications, base_seed=self.base_seed,
+                                 experiment_folder=sweep_point_folder, resources_folder=resources_folder)
+
+    def create_config_files(self, sweep_point: SweepPoint) -> dict[str, dict]:
+        """{file name, content} of the resource files changed by the design point."""
+        config_files = {}
+        for file_name in ["simulation_starting_conditions.json", "simulation_production_transport_robot_data.json",
+                          "simulation_production_working_robot_data.json"]:
+            with open(RESOURCES / file_name, 'r', encoding='utf-8') as f:
+                config_files[file_name] = copy.deepcopy(json.load(f))
+
+        data_process_starting_conditions = config_files["simulation_starting_conditions.json"]
+        data_process_starting_conditions["Topology_manager(No algorithm (1), QAP (2), GA (3), FDP(4)"] = \
+            sweep_point.topology_method
+
+        data_tr_conditions = config_files["simulation_production_transport_robot_data.json"]
+        data_tr_conditions["transport_robot"][0]["number_of_robots_in_production"] = str(sweep_point.number_of_tr)
+        data_tr_conditions["transport_robot"][0]["max_loading_capacity"] = str(sweep_point.tr_capacity)
+
+        data_wr_conditions = config_files["simulation_production_working_robot_data.json"]
+        data_wr_conditions["working_robot"][0]["number_of_robots_in_production"] = str(sweep_point.number_of_wr)
+        return config_files
+
+    def save_sweep_point_results(self, sweep_point: SweepPoint, replication_results: list[dict]):
+        with open(self.get_sweep_point_folder(sweep_point) / "sweep_point_results.json", "w", encoding="utf-8") as f:
+            json.dump({"sweep_point": asdict(sweep_point), "replications": replication_results}, f, indent=4,
+                      ensure_ascii=False)
+
+    def load_sweep_point_results(self, sweep_point: SweepPoint) -> list[dict]:
+        with open(self.get_sweep_point_folder(sweep_point) / "sweep_point_results.json", 'r', encoding='utf-8') as f:
+            return json.load(f)["replications"]
+
+    def create_results_table(self, sweep_points: list[SweepPoint]) -> pd.DataFrame:
+        """One row per replication of a design point: parameters, seed, return code and KPIs (also of the design
+        points with a failed replication)."""
+        rows = []
+        for sweep_point in sweep_points:
+            if self.check_sweep_point_results_saved(sweep_point) is False:
+                continue
+            for replication_result in self.load_sweep_point_results(sweep_point):
+                row = {**asdict(sweep_point), "run": replication_result["run"], "seed": replication_result["seed"],
+                       "return_code": replication_result["return_code"]}
+                row.update(self.get_kpis(replication_result["results"]))
+                rows.append(row)
+        return pd.DataFrame(rows)
+
+    def get_kpis(self, results: dict) -> dict[str, float]:
+        """Global throughput time of ProductThroughput and the mean time share of every status group of
+        TrWorkload and MachineWorkload."""
+        kpis = {}
+        throughput = results.get("throughput_all_products")
+        if throughput is not None and "GLOBAL_WEIGHTED_AVERAGE" in throughput:
+            kpis["throughput_time_average_s"] = self.convert_time_str_to_seconds(
+                throughput["GLOBAL_WEIGHTED_AVERAGE"]["average"])
+            kpis["throughput_time_std_dev_s"] = self.convert_time_str_to_seconds(
+                throughput["GLOBAL_WEIGHTED_AVERAGE"]["std_dev"])
+
+        for result_name, kpi_prefix in [("tr_workload", "tr_share"), ("machine_workload", "machine_share")]:
+            workload = results.get(result_name)
+            if workload is None:
+                continue
+            for status, share in self.get_mean_workload_shares(workload).items():
+                kpis[f"{kpi_prefix}_{status}"] = share
+        return kpis
+
+    def get_mean_workload_shares(self, workload_dict: dict[str, dict[str, float]]) -> dict[str, float]:
+        """Mean share of every status over the entities of workload_dict {entity, {status, time}}."""
+        share_sum_dict = {}
+        number_of_entities = 0
+        for status_times in workload_dict.values():
+            total_time = sum(status_times.values())
+            if total_time == 0:
+                continue
+            number_of_entities += 1
+            for status, time in status_times.items():
+                share_sum_dict[status] = share_sum_dict.get(status, 0.0) + time / total_time
+
+        if number_of_entities == 0:
+            return {}
+        return {status: share_sum / number_of_entities for status, share_sum in share_sum_dict.items()}
+
+    def convert_time_str_to_seconds(self, time_str: str) -> int:
+        """Converts 'H:MM:SS' (or 'N day(s), H:MM:SS') of ProductThroughput into seconds."""
+        days = 0
+        if "day" in time_str:
+            day_str, time_str = time_str.split(", ")
+            days = int(day_str.split(" ")[0])
+        hours, minutes, seconds = (int(value) for value in time_str.split(":"))
+        return days * 86400 + hours * 3600 + minutes * 60 + seconds
+
+
+if __name__ == '__main__':
+    parameter_sweep = ParameterSweep(number_of_replications=3)
+    design_points = parameter_sweep.create_grid({"number_of_tr": [1, 2, 3, 4, 5],
+                                                 "tr_capacity": [50, 75, 100],
+                                                 "number_of_wr": [4],
+                                                 "topology_method": [1, 2, 3, 4]})
+    print(parameter_sweep.run_sweep(design_points))
@@ -0,0 +1,53 @@
+from collections import OrderedDict
+
+
+class PathCache:
+    """LRU cache for routes of the PathFinding. A route is stored under (start index, end index, entity.size.x,
+    entity.size.y) and is only valid for the static_version of the occupancy_grid (machines, intermediate stores,
+    source and sink) it was calculated for. Robots are not part of the static_version, the PathFinding checks them
+    lazily along a cached route before it is used."""
+    cached_paths: OrderedDict[tuple[int, int, int, int], tuple[tuple[str, ...], tuple[int, ...]]]
+    daily_statistics: dict[int, dict[str, int]]  # {production day, {"hits": int, "misses": int}}
+
+    def __init__(self, max_size: int = 512):
+        self.max_size = max_size
+        self.cached_paths = OrderedDict()
+        self.static_version = 0
+        self.hits = 0
+        self.misses = 0
+        self.daily_statistics = {}
+
+    def get_path(self, key: tuple[int, int, int, int], static_version: int) \
+            -> tuple[tuple[str, ...], tuple[int, ...]] | None:
+        """Returns (path_line_list, path_index_list) or None. The cache is emptied if the static obstacles have
+        changed since the routes were calculated."""
+        if static_version != self.static_version:
+            self.cached_paths.clear()
+            self.static_version = static_version
+            return None
+
+        cached_path = self.cached_paths.get(key)
+        if cached_path is not None:
+            self.cached_paths.move_to_end(key)
+        return cached_path
+
+    def add_path(self, key: tuple[int, int, int, int], path_line_list: list[str], path_index_list: list[int]):
+        self.cached_paths[key] = (tuple(path_line_list), tuple(path_index_list))
+        self.cached_paths.move_to_end(key)
+        if len(self.cached_paths) > self.max_size:
+            self.cached_paths.popitem(last=False)
+
+    def remove_path(self, key: tuple[int, int, int, int]):
+        self.cached_paths.pop(key, None)
+
+    def count_hit(self, production_day: int):
+        self.hits += 1
+        self.daily_statistics.setdefault(production_day, {"hits": 0, "misses": 0})["hits"] += 1
+
+    def count_miss(self, production_day: int):
+        self.misses += 1
+        self.daily_statistics.setdefault(production_day, {"hits": 0, "misses": 0})["misses"] += 1
+
+    def get_daily_statistics(self, production_day: int) -> dict[str, int]:
+        """Hits are A* searches, which were saved on this production day."""
+        return self.daily_statistics.get(production_day, {"hits": 0, "misses": 0})
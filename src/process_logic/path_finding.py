@@ -1,5 +1,9 @@
-from queue import PriorityQueue
+from heapq import heappush, heappop
 
+import numpy as np
+
+from src.process_logic.path_cache import PathCache
+from src.process_logic.reservation_table import ReservationTable
 from src.production.entity_move_serivce import EntityMoveService
 from src.production.production import Production
 from src.production.base.coordinates import Coordinates
@@ -12,131 +16,393 @@ from src.entity.working_robot.working_robot import WorkingRobot
 class PathFinding:
     production: Production
     path_line_list = []
+    max_cooperative_search_expansions = 50000
 
     def __init__(self, production: Production):
         self.production = production
         self.entity_move_service = EntityMoveService(self.production)
         self.path_line_list = []
+        self.path_index_list: list[int] = []
+        self.path_cache = PathCache()
+
+        # cooperative path planning: routes of robots are reserved in space and time
+        self.cooperative_path_planning = \
+            self.production.service_starting_conditions.get_cooperative_path_planning() is True
+        self.reservation_table = ReservationTable()
+        # macro step movement: robots drive a straight segment of the route with one event
+        self.macro_step_movement = self.production.service_starting_conditions.get_macro_step_movement() is True
+
+        # search buffers, reused by every call of run_a_star_algorithm
+        self.search_stamp = 0
+        self.g_score: list[int] = []
+        self.score_stamp: list[int] = []
+        self.came_from: list[int] = []
+        self.open_set_stamp: list[int] = []
+        self.open_set: list[tuple[int, int, int]] = []
+        self.moving_entity_bounding_box: tuple[int, int, int, int] | None = None
 
     def get_path_for_entity(self, entity: Machine | WorkingRobot | TransportRobot, end_coordinate: Coordinates)\
             -> list | Exception:
         start_coordinate = self.get_start_coordinates_from_entity(entity)
         start_cell = self.get_start_cell_from_entity(entity)
         end_cell = self.production.get_cell(end_coordinate)
+
+        if self.cooperative_path_planning and isinstance(entity, TransportRobot | WorkingRobot):
+            cooperative_path_line_list = self.get_cooperative_path(start_cell, end_cell, entity)
+            if cooperative_path_line_list is not None:
+                return cooperative_path_line_list
+
+        cached_path_line_list = self.get_cached_path(start_cell, end_cell, entity)
+        if cached_path_line_list is not None:
+            return cached_path_line_list
+
         if self.run_a_star_algorithm(start_cell, end_cell, entity) is False:
             return Exception(
                 f"Path finding doesn't work. Entity: {entity}, Start: {start_coordinate}, End: {end_coordinate}")
 
+        self.path_cache.add_path(self.get_path_cache_key(start_cell, end_cell, entity), self.path_line_list,
+                                 self.path_index_list)
         return self.path_line_list
 
-    def run_a_star_algorithm(self, start_cell: Cell, end_cell: Cell,
-                             moving_entity: Machine | WorkingRobot | TransportRobot) -> bool:
+    def get_cooperative_path(self, start_cell: Cell, end_cell: Cell,
+                             robot: WorkingRobot | TransportRobot) -> list[str] | None:
+        """Calculates a route, which doesn't collide with the reserved routes of the other robots, and reserves it.
+        A repeated cell in the route means the robot waits one driving step on its cell. The first step of a tr
+        follows after one driving step, a wr moves immediately (see tr_simulation and wr_simulation).
+        None -> no collision free route was found, the robot has no reservations anymore."""
+        self.reservation_table.release(robot.identification_str)
+        step_duration = 1 / int(robot.driving_speed)
+        start_time = self.production.env.now
+        first_step_time = start_time + step_duration if isinstance(robot, TransportRobot) else start_time
+
+        if self.run_cooperative_a_star_algorithm(start_cell, end_cell, robot, first_step_time, step_duration) is False:
+            return None
+
+        self.reserve_path(start_cell, robot, start_time, first_step_time, step_duration)
+        return self.path_line_list
+
+    def run_cooperative_a_star_algorithm(self, start_cell: Cell, end_cell: Cell,
+                                         robot: WorkingRobot | TransportRobot, first_step_time: float,
+                                         step_duration: float) -> bool:
+        """A* in space and time: a state is (cell index, number of driving steps), every step moves to a neighbor or
+        waits on the cell. Only machines, intermediate stores, source and sink are obstacles of the clearance map,
+        other robots are avoided by the reservation_table. Robots without reservations are obstacles on their
+        current cells. After step s the robot occupies its cell in [first_step_time + (s - 1) * step_duration,
+        first_step_time + s * step_duration], the destination is occupied until the next route of the robot."""
+        width = self.production.max_coordinate.x
+        height = self.production.max_coordinate.y
+        number_of_cells = width * height
+        occupancy_grid = self.production.occupancy_grid
+        reservation_table = self.reservation_table
+        identification_str = robot.identification_str
+        static_movement_area_map = occupancy_grid.clearance_map.get_static_movement_area_map(
+            robot.size.x + 1, robot.size.y + 1).reshape(-1)
+        blocked_cell_set = self.get_cells_of_robots_without_reservations(robot)
+
+        def check_footprint_is_free(cell_index: int, start: float, end: float) -> bool:
+            for footprint_cell_index in self.get_footprint_indices(cell_index, robot):
+                if footprint_cell_index in blocked_cell_set or \
+                        not reservation_table.check_cell_is_free(footprint_cell_index, start, end, identification_str):
+                    return False
+            return True
+
+        start_index = start_cell.cell_coordinates.y * width + start_cell.cell_coordinates.x
+        end_x = end_cell.cell_coordinates.x
+        end_y = end_cell.cell_coordinates.y
+        end_index = end_y * width + end_x
+        # the destination has to stay free without end: a robot without reservations or a robot parked on it after
+        # its route makes the destination unreachable, without searching every state until the expansion limit
+        if any(cell_index in blocked_cell_set or
+               reservation_table.check_cell_is_reserved_without_end(cell_index, identification_str)
+               for cell_index in self.get_footprint_indices(end_index, robot)):
+            return False
 
         count = 0
-        open_set = PriorityQueue()
-        open_set.put((0, count, start_cell))  # item (0) = f_score, count = keep track, when it put into Queue
-        came_from = {}
-        g_score = {cell.cell_id: float("inf") for row in self.production.production_layout for cell in row}
-        g_score[start_cell.cell_id] = 0
-        f_score = {cell.cell_id: float("inf") for row in self.production.production_layout for cell in row}
-        f_score[start_cell.cell_id] = self.calculate_h_score(start_cell.cell_coordinates, end_cell.cell_coordinates)
+        came_from = {start_index: -1}  # {steps * number_of_cells + cell index, previous state}
+        closed_set = set()
+        open_set = [(abs(start_cell.cell_coordinates.x - end_x) + abs(start_cell.cell_coordinates.y - end_y), count,
+                     start_index, 0)]
+
+        while open_set and len(closed_set) < self.max_cooperative_search_expansions:
+            current_index, steps = heappop(open_set)[2:]
+            state = steps * number_of_cells + current_index
+            if state in closed_set:
+                continue
+            closed_set.add(state)
+
+            if current_index == end_index:
+                arrival_time = first_step_time + (steps - 1) * step_duration if steps > 0 else first_step_time
+                if check_footprint_is_free(current_index, arrival_time, float("inf")):
+                    self.reconstruct_cooperative_path(state, came_from, number_of_cells)
+                    return True
+
+            step_start = first_step_time + steps * step_duration
+            step_end = step_start + step_duration
+            y, x = divmod(current_index, width)
+            candidate_list = [current_index]
+            if y > 0:
+                candidate_list.append(current_index - width)
+            if y < height - 1:
+                candidate_list.append(current_index + width)
+            if x < width - 1:
+                candidate_list.append(current_index + 1)
+            if x > 0:
+                candidate_list.append(current_index - 1)
+
+            for neighbor_index in candidate_list:
+                neighbor_state = (steps + 1) * number_of_cells + neighbor_index
+                if neighbor_state in came_from:
+                    continue
+                if neighbor_index != current_index and not static_movement_area_map[neighbor_index]:
+                    continue
+                if not check_footprint_is_free(neighbor_index, step_start, step_end):
+                    continue
+
+                came_from[neighbor_state] = state
+                count += 1
+                neighbor_y, neighbor_x = divmod(neighbor_index, width)
+                heappush(open_set, (steps + 1 + abs(neighbor_x - end_x) + abs(neighbor_y - end_y), count,
+                                    neighbor_index, steps + 1))
 
-        open_set_hash = {start_cell.cell_id}  # creating a hash to check if cell is in PriorityQueue
+        return False
 
-        while not open_set.empty():
+    def reconstruct_cooperative_path(self, state: int, came_from: dict[int, int], number_of_cells: int):
+        width = self.production.max_coordinate.x
+        path_index_list = []
+
+        while came_from[state] != -1:
+            path_index_list.append(state % number_of_cells)
+            state = came_from[state]
+
+        path_index_list.reverse()
+        self.path_index_list = path_index_list
+        self.path_line_list = [f"{cell_index % width}:{cell_index // width}" for cell_index in path_index_list]
+
+    def reserve_path(self, start_cell: Cell, robot: WorkingRobot | TransportRobot, start_time: float,
+                     first_step_time: float, step_duration: float):
+        """Reserves the cells of the robot for every step of path_index_list; the last cell is reserved without end."""
+        width = self.production.max_coordinate.x
+        cell_index = start_cell.cell_coordinates.y * width + start_cell.cell_coordinates.x
+        interval_start = start_time
+
+        for steps, next_cell_index in enumerate(self.path_index_list, start=1):
+            interval_end = first_step_time + (steps - 1) * step_duration
+            for footprint_cell_index in self.get_footprint_indices(cell_index, robot):
+                self.reservation_table.reserve_cell(robot.identification_str, footprint_cell_index, interval_start,
+                                                    interval_end)
+            cell_index = next_cell_index
+            interval_start = interval_end
+
+        for footprint_cell_index in self.get_footprint_indices(cell_index, robot):
+            self.reservation_table.reserve_cell(robot.identification_str, footprint_cell_index, interval_start,
+                                                float("inf"))
+
+    def get_footprint_indices(self, cell_index: int, robot: WorkingRobot | TransportRobot) -> list[int]:
+        """Cells of the robot, if its upper left corner is on the cell (only cells inside the production_layout)."""
+        width = self.production.max_coordinate.x
+        y, x = divmod(cell_index, width)
+        return [footprint_y * width + footprint_x
+                for footprint_y in range(max(0, y - robot.size.y + 1), y + 1)
+                for footprint_x in range(x, min(width, x + robot.size.x))]
+
+    def get_cells_of_robots_without_reservations(self, robot: WorkingRobot | TransportRobot) -> set[int]:
+        occupancy_grid = self.production.occupancy_grid
+        robot_index_list = [entity_index for entity_index, entity in enumerate(occupancy_grid.entity_list)
+                            if entity is not None and not occupancy_grid.entity_is_static[entity_index] and
+                            entity.identification_str != robot.identification_str and
+                            not self.reservation_table.check_entity_has_reservations(entity.identification_str)]
+        if len(robot_index_list) == 0:
+            return set()
+        return set(occupancy_grid.get_robot_cell_indices(robot_index_list).tolist())
+
+    def get_path_cache_key(self, start_cell: Cell, end_cell: Cell,
+                           entity: Machine | WorkingRobot | TransportRobot) -> tuple[int, int, int, int]:
+        width = self.production.max_coordinate.x
+        return (start_cell.cell_coordinates.y * width + start_cell.cell_coordinates.x,
+                end_cell.cell_coordinates.y * width + end_cell.cell_coordinates.x,
+                entity.size.x, entity.size.y)
+
+    def get_cached_path(self, start_cell: Cell, end_cell: Cell,
+                        entity: Machine | WorkingRobot | TransportRobot) -> list[str] | None:
+        """Returns a copy of the cached route, if the static obstacles are unchanged and no robot blocks the route at
+        the moment. Otherwise None -> the route has to be calculated with run_a_star_algorithm."""
+        production_day = int(self.production.env.now // 28800)
+        key = self.get_path_cache_key(start_cell, end_cell, entity)
+        cached_path = self.path_cache.get_path(key, self.production.occupancy_grid.static_version)
+
+        if cached_path is not None:
+            path_line_list, path_index_list = cached_path
+            if self.check_path_is_free(path_index_list, entity):
+                self.path_cache.count_hit(production_day)
+                self.path_line_list = list(path_line_list)
+                return self.path_line_list
+            self.path_cache.remove_path(key)
+
+        self.path_cache.count_miss(production_day)
+        return None
+
+    def check_path_is_free(self, path_index_list: tuple[int, ...],
+                           entity: Machine | WorkingRobot | TransportRobot) -> bool:
+        """Checks the movement area of every cell of the route like run_a_star_algorithm checks a neighbor: every
+        cell of the areas is empty or part of the entity. The cells of all areas are looked up in the entity_id_grid
+        at once, so a cached route is checked in O(route length) without the clearance map."""
+        occupancy_grid = self.production.occupancy_grid
+        width = self.production.max_coordinate.x
+        height = self.production.max_coordinate.y
+        entity_index = occupancy_grid.entity_index.get(entity.identification_str, -1)
+
+        # movement area of the anchor cell (x, y): [x, x + size.x + 1) x [y - size.y - 1, y + 2)
+        area_y_offsets, area_x_offsets = np.mgrid[-entity.size.y - 1:2, 0:entity.size.x + 1]
+        path_y, path_x = np.divmod(np.asarray(path_index_list, dtype=np.int64), width)
+        area_x = path_x[:, np.newaxis] + area_x_offsets.reshape(-1)[np.newaxis, :]
+        area_y = path_y[:, np.newaxis] + area_y_offsets.reshape(-1)[np.newaxis, :]
+        inside_layout = (area_x < width) & (area_y >= 0) & (area_y < height)
+        area_entity_indexes = occupancy_grid.entity_id_grid.reshape(-1)[area_y[inside_layout] * width +
+                                                                       area_x[inside_layout]]
+        return bool(np.all((area_entity_indexes == 0) | (area_entity_indexes == entity_index)))
 
-            current_cell = open_set.get()[2]
-            open_set_hash.remove(current_cell.cell_id)
+    def run_a_star_algorithm(self, start_cell: Cell, end_cell: Cell,
+                             moving_entity: Machine | WorkingRobot | TransportRobot) -> bool:
+        """A* on the flat cell index (index = y * max_coordinate.x + x). The scores are only valid for cells whose
+        score_stamp equals the current search_stamp, so the buffers are reused between searches without resetting.
+        Ties in the open set are broken by insertion order (count)."""
+        self.prepare_search_buffers()
+        width = self.production.max_coordinate.x
+        stamp = self.search_stamp
+        g_score = self.g_score
+        score_stamp = self.score_stamp
+        came_from = self.came_from
+        open_set_stamp = self.open_set_stamp
+        open_set = self.open_set
+        open_set.clear()
+
+        start_index = start_cell.cell_coordinates.y * width + start_cell.cell_coordinates.x
+        end_x = end_cell.cell_coordinates.x
+        end_y = end_cell.cell_coordinates.y
+        end_index = end_y * width + end_x
+        entity_index = self.production.occupancy_grid.entity_index.get(moving_entity.identification_str, -1)
+        self.moving_entity_bounding_box = self.production.occupancy_grid.get_entity_bounding_box(entity_index)
 
-            if current_cell.cell_coordinates == end_cell.cell_coordinates:
-                self.reconstruct_path(came_from, end_cell.cell_id)
+        count = 0
+        g_score[start_index] = 0
+        score_stamp[start_index] = stamp
+        came_from[start_index] = -1
+        open_set_stamp[start_index] = stamp
+        heappush(open_set, (abs(start_cell.cell_coordinates.x - end_x) + abs(start_cell.cell_coordinates.y - end_y),
+                            count, start_index))
+
+        while open_set:
+            current_index = heappop(open_set)[2]
+            open_set_stamp[current_index] = 0
+
+            if current_index == end_index:
+                self.reconstruct_path(current_index)
                 return True
 
-            current_cell.neighbors_list = self.check_neighbor_cells_complete_wide(current_cell.cell_coordinates,
-                                                                                  moving_entity)
-            for neighbor in current_cell.neighbors_list:
-                temp_g_score = g_score[current_cell.cell_id] + 1
-
-                if temp_g_score < g_score[neighbor.cell_id]:
-                    came_from[neighbor.cell_id] = current_cell.cell_id
-                    g_score[neighbor.cell_id] = temp_g_score
-                    f_score[neighbor.cell_id] = temp_g_score + self.calculate_h_score(neighbor.cell_coordinates,
-                                                                                      end_cell.cell_coordinates)
+            temp_g_score = g_score[current_index] + 1
+            for neighbor_index in self.get_neighbor_indices_complete_wide(current_index, moving_entity, entity_index):
+                if score_stamp[neighbor_index] != stamp or temp_g_score < g_score[neighbor_index]:
+                    came_from[neighbor_index] = current_index
+                    g_score[neighbor_index] = temp_g_score
+                    score_stamp[neighbor_index] = stamp
 
-                    if neighbor.cell_id not in open_set_hash:
+                    if open_set_stamp[neighbor_index] != stamp:
                         count += 1
-                        open_set.put((f_score[neighbor.cell_id], count, neighbor))
-                        open_set_hash.add(neighbor.cell_id)
+                        neighbor_y, neighbor_x = divmod(neighbor_index, width)
+                        heappush(open_set, (temp_g_score + abs(neighbor_x - end_x) + abs(neighbor_y - end_y), count,
+                                            neighbor_index))
+                        open_set_stamp[neighbor_index] = stamp
 
         return False
 
-    def reconstruct_path(self, came_from, current_cell_id):
-        path = []
-
-        while current_cell_id in came_from:  # Gehe rückwärts durch den Pfad
-            path.append(current_cell_id)
-            current_cell_id = came_from[current_cell_id]  # Nächste Zelle auf dem Pfad
-
-        path.reverse()  # Umkehren, damit der Pfad von Start → Ziel geht
-        self.path_line_list = path
-
-    def calculate_h_score(self, start_coordinates: Coordinates, end_coordinates: Coordinates):
-        return abs(start_coordinates.x - end_coordinates.x) + abs(start_coordinates.y - end_coordinates.y)
-
-    def get_current_cell_neighbors(self, cell_position: Coordinates, current_cell: Cell, moving_entity) -> list[Cell]:
-        """Checks if the neighbors of current cell are empty or part of the moving_entity. In will the cell be added to
-        the cell_neighbors_list. Cell_position are the coordinates of current_cell"""
-        cell_neighbors_down = self.get_current_cell_neighbor_down(cell_position, current_cell, moving_entity)
-        cell_neighbors_up = self.get_current_cell_neighbor_up(cell_position, current_cell, moving_entity)
-        cell_neighbors_right = self.get_current_cell_neighbor_right(cell_position, current_cell, moving_entity)
-        cell_neighbors_left = self.get_current_cell_neighbor_left(cell_position, current_cell, moving_entity)
-
-        cell_neighbors_list = [cell for cell in
-                               [cell_neighbors_down, cell_neighbors_up, cell_neighbors_right, cell_neighbors_left] if
-                               cell is not None]
-        return cell_neighbors_list
-
-    def get_current_cell_neighbor_up(self, cell_position: Coordinates, current_cell: Cell, moving_entity) -> Cell:
-        if current_cell.cell_coordinates.y < len(self.production.production_layout) - 1 and \
-                (self.production.get_cell(Coordinates(cell_position.x,
-                                                      cell_position.y + 1)).placed_entity is None or self.production.get_cell(
-                    Coordinates(cell_position.x, cell_position.y + 1)).placed_entity is moving_entity):
-            return self.production.get_cell(Coordinates(cell_position.x, cell_position.y + 1))
-
-    def get_current_cell_neighbor_down(self, cell_position: Coordinates, current_cell: Cell, moving_entity) -> Cell:
-        if current_cell.cell_coordinates.y > 0 and \
-                (self.production.get_cell(Coordinates(cell_position.x,
-                                                      cell_position.y - 1)).placed_entity is None or self.production.get_cell(
-                    Coordinates(cell_position.x, cell_position.y - 1)).placed_entity is moving_entity):
-            return self.production.get_cell(Coordinates(cell_position.x, cell_position.y - 1))
-
-    def get_current_cell_neighbor_right(self, cell_position: Coordinates, current_cell: Cell, moving_entity) -> Cell:
-        if current_cell.cell_coordinates.x < len(self.production.production_layout[cell_position.y]) - 1 and \
-                (self.production.get_cell(Coordinates(cell_position.x + 1,
-                                                      cell_position.y)).placed_entity is None or self.production.get_cell(
-                    Coordinates(cell_position.x + 1, cell_position.y)).placed_entity is moving_entity):
-            return self.production.get_cell(Coordinates(cell_position.x + 1, cell_position.y))
-
-    def get_current_cell_neighbor_left(self, cell_position: Coordinates, current_cell: Cell, moving_entity) -> Cell:
-        if current_cell.cell_coordinates.x > 0 and \
-                (self.production.get_cell(Coordinates(cell_position.x - 1,
-                                                      cell_position.y)).placed_entity is None or self.production.get_cell(
-                    Coordinates(cell_position.x - 1, cell_position.y)).placed_entity is moving_entity):
-            return self.production.get_cell(Coordinates(cell_position.x - 1, cell_position.y))
-
-    def check_neighbor_cells_complete_wide(self, cell_position: Coordinates,
-                                           entity: Machine | WorkingRobot | TransportRobot) -> list[Cell]:
-        current_cell = self.production.get_cell(cell_position)
-        cell_neighbors_list = self.get_current_cell_neighbors(cell_position, current_cell, entity)
-        cell_neighbors_list_copy = cell_neighbors_list
-
-        for cell in cell_neighbors_list_copy:
-            entity_cell_list = self.production.check_area_of_cells_is_free_for_entity_movement(cell, Coordinates(
-                entity.size.x + 1, entity.size.y + 1), entity)
-            if len(entity_cell_list) == 0:
-                cell_neighbors_list.remove(cell)
-
-        return cell_neighbors_list
+    def prepare_search_buffers(self):
+        """The buffers are only allocated if the size of the production_layout has changed."""
+        number_of_cells = self.production.max_coordinate.x * self.production.max_coordinate.y
+        if len(self.g_score) != number_of_cells:
+            self.g_score = [0] * number_of_cells
+            self.score_stamp = [0] * number_of_cells
+            self.came_from = [-1] * number_of_cells
+            self.open_set_stamp = [0] * number_of_cells
+            self.search_stamp = 0
+        self.search_stamp += 1
+
+    def reconstruct_path(self, current_index: int):
+        width = self.production.max_coordinate.x
+        path_index_list = []
+
+        while self.came_from[current_index] != -1:  # Gehe rückwärts durch den Pfad
+            path_index_list.append(current_index)
+            current_index = self.came_from[current_index]  # Nächste Zelle auf dem Pfad
+
+        path_index_list.reverse()  # Umkehren, damit der Pfad von Start → Ziel geht
+        self.path_index_list = path_index_list
+        self.path_line_list = [f"{cell_index % width}:{cell_index // width}" for cell_index in path_index_list]
+
+    def get_neighbor_indices(self, cell_index: int, entity_index: int) -> list[int]:
+        """Returns the neighbors (down, up, right, left) of the cell, which are empty or part of the moving entity."""
+        width = self.production.max_coordinate.x
+        height = self.production.max_coordinate.y
+        entity_id_grid = self.production.occupancy_grid.entity_id_grid.reshape(-1)
+        y, x = divmod(cell_index, width)
+
+        candidate_list = []
+        if y > 0:
+            candidate_list.append(cell_index - width)
+        if y < height - 1:
+            candidate_list.append(cell_index + width)
+        if x < width - 1:
+            candidate_list.append(cell_index + 1)
+        if x > 0:
+            candidate_list.append(cell_index - 1)
+
+        return [neighbor_index for neighbor_index in candidate_list if
+                entity_id_grid[neighbor_index] == 0 or entity_id_grid[neighbor_index] == entity_index]
+
+    def get_neighbor_indices_complete_wide(self, cell_index: int, entity: Machine | WorkingRobot | TransportRobot,
+                                           entity_index: int) -> list[int]:
+        """Neighbors are only kept if the area of (entity.size + 1) is free for the moving entity. The clearance map
+        answers this with one lookup; only areas that overlap the moving entity itself are checked cell by cell. The
+        neighbor after a removed neighbor is kept without checking its area, like the former
+        check_neighbor_cells_complete_wide, which removed items from the list while iterating over it. This keeps the
+        calculated paths unchanged."""
+        width = self.production.max_coordinate.x
+        area_size_x = entity.size.x + 1
+        area_size_y = entity.size.y + 1
+        movement_area_map = self.production.occupancy_grid.clearance_map.get_movement_area_map(
+            area_size_x, area_size_y).reshape(-1)
+
+        neighbor_list = []
+        skip_next_check = False
+        for neighbor_index in self.get_neighbor_indices(cell_index, entity_index):
+            if skip_next_check:
+                neighbor_list.append(neighbor_index)
+                skip_next_check = False
+                continue
+
+            if movement_area_map[neighbor_index] or \
+                    self.check_movement_area_overlapping_entity_is_free(neighbor_index, area_size_x, area_size_y,
+                                                                        entity_index):
+                neighbor_list.append(neighbor_index)
+            else:
+                skip_next_check = True
+
+        return neighbor_list
+
+    def check_movement_area_overlapping_entity_is_free(self, cell_index: int, area_size_x: int, area_size_y: int,
+                                                       entity_index: int) -> bool:
+        """The clearance map counts the cells of the moving entity as obstacles. If the movement area overlaps the
+        moving entity, the area is checked again with the entity as free condition."""
+        entity_bounding_box = self.moving_entity_bounding_box
+        if entity_bounding_box is None:
+            return False
+
+        y, x = divmod(cell_index, self.production.max_coordinate.x)
+        x_min, y_min, x_max, y_max = x, y - area_size_y, x + area_size_x, y + 2
+        if x_min >= entity_bounding_box[2] or x_max <= entity_bounding_box[0] or \
+                y_min >= entity_bounding_box[3] or y_max <= entity_bounding_box[1]:
+            return False
+        return self.production.occupancy_grid.check_area_is_free_for_entity_index(x_min, y_min, x_max, y_max,
+                                                                                   entity_index)
 
     def get_start_cell_from_entity(self, entity: Machine | WorkingRobot | TransportRobot) -> Cell:
         """Starting point is the upper right corner of the entity"""
@@ -0,0 +1,45 @@
+class ReservationTable:
+    """Space-time reservations of the cooperative path planning. reservations[cell index] holds the time intervals
+    [start, end] in which a robot occupies the cell (end = inf -> the robot stays on the cell after its route). Every
+    robot has at most one reserved route, a new route of the robot replaces the old one."""
+    reservations: dict[int, list[list]]  # {cell index, [[start, end, identification_str], ...]}
+    reserved_cells: dict[str, set[int]]  # {identification_str, cell indices with a reservation of the robot}
+
+    def __init__(self):
+        self.reservations = {}
+        self.reserved_cells = {}
+
+    def reserve_cell(self, identification_str: str, cell_index: int, start: float, end: float):
+        """Following intervals of the same robot on the same cell are merged."""
+        interval_list = self.reservations.setdefault(cell_index, [])
+        if len(interval_list) > 0 and interval_list[-1][2] == identification_str and interval_list[-1][1] >= start:
+            interval_list[-1][1] = max(interval_list[-1][1], end)
+        else:
+            interval_list.append([start, end, identification_str])
+        self.reserved_cells.setdefault(identification_str, set()).add(cell_index)
+
+    def release(self, identification_str: str):
+        """Removes every reservation of the robot."""
+        for cell_index in self.reserved_cells.pop(identification_str, ()):
+            interval_list = [interval for interval in self.reservations[cell_index] if
+                             interval[2] != identification_str]
+            if len(interval_list) > 0:
+                self.reservations[cell_index] = interval_list
+            else:
+                del self.reservations[cell_index]
+
+    def check_cell_is_free(self, cell_index: int, start: float, end: float, identification_str: str) -> bool:
+        """True if no other robot has reserved the cell in [start, end]. Intervals, which only touch each other, are
+        conflicts as well, so a cell is entered one driving step after the other robot has left it."""
+        for interval_start, interval_end, reserving_identification_str in self.reservations.get(cell_index, ()):
+            if reserving_identification_str != identification_str and interval_start <= end and start <= interval_end:
+                return False
+        return True
+
+    def check_cell_is_reserved_without_end(self, cell_index: int, identification_str: str) -> bool:
+        """True if another robot stays on the cell after its route (reservation with end = inf)."""
+        return any(reserving_identification_str != identification_str and interval_end == float("inf")
+                   for _, interval_end, reserving_identification_str in self.reservations.get(cell_index, ()))
+
+    def check_entity_has_reservations(self, identification_str: str) -> bool:
+        return identification_str in self.reserved_cells
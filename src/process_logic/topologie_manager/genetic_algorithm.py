@@ -1,7 +1,9 @@
-from collections import defaultdict
-
 import simpy
 import random
+import math
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 import matplotlib.pyplot as plt
 import os
 import json
@@ -15,6 +17,42 @@ from src.provide_input_data.genetic_algorithm_service import GeneticAlgorithmSer
 from src import GENETIC_ALGORITHM
 
 
+class FitnessCache:
+    """Bounded cache of the performance of the individuals, keyed by the bytes of their position arrays (every layout
+    has exactly one encoding). The least recently used entries are removed first."""
+    performance_dict: OrderedDict[bytes, float]
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.performance_dict = OrderedDict()
+        self.hits = 0
+        self.evaluations = 0
+
+    def get_performance_scores(self, population: np.ndarray, calculate_performance) -> np.ndarray:
+        """Performance of every individual; only the individuals, which aren't cached, are calculated (every one
+        once)."""
+        unique_keys, first_rows, inverse_rows = np.unique(get_individual_keys(population), return_index=True,
+                                                          return_inverse=True)
+        key_list = unique_keys.tolist()
+        performance_list = [self.performance_dict.get(key) for key in key_list]
+        missing_indexes = [index for index, performance in enumerate(performance_list) if performance is None]
+        for index, key in enumerate(key_list):
+            if performance_list[index] is not None:
+                self.performance_dict.move_to_end(key)
+
+        if missing_indexes:
+            new_performance_scores = calculate_performance(population[first_rows[missing_indexes]])
+            for index, performance in zip(missing_indexes, new_performance_scores.tolist()):
+                performance_list[index] = performance
+                self.performance_dict[key_list[index]] = performance
+            while len(self.performance_dict) > self.max_size:
+                self.performance_dict.popitem(last=False)
+
+        self.hits += len(population) - len(missing_indexes)
+        self.evaluations += len(missing_indexes)
+        return np.asarray(performance_list, dtype=np.float64)[inverse_rows.reshape(-1)]
+
+
 class GeneticAlgorithm:
     positions_distance_matrix: dict[str, dict[str, float]]
     material_flow_matrix: dict[str, dict[str, int]]
@@ -30,6 +68,13 @@ class GeneticAlgorithm:
     points_of_separation: int
     corrected_assignment: list[tuple[str, str]]
 
+    station_list: list[str]  # station index -> station_id
+    position_list: list[str]  # position index -> cell_id
+    flow_matrix: np.ndarray  # [station index, station index]
+    distance_matrix: np.ndarray  # [position index, position index]
+    free_station_indexes: np.ndarray  # stations of the genes of an individual
+    available_position_indexes: np.ndarray  # positions, which aren't fixed
+
     def __init__(self, env: simpy.Environment, material_flow: MaterialFlow,
                  position_distance_matrix: PositionsDistanceMatrix):
         self.env = env
@@ -50,6 +95,10 @@ class GeneticAlgorithm:
         self.number_of_surviving_parents = self.genetic_algorithm_service.get_number_of_surviving_parents()
         self.odds_of_mutation_per_genom_in_percent = self.genetic_algorithm_service.get_odds_of_mutation_per_genom_in_percent()
         self.points_of_separation = self.genetic_algorithm_service.get_points_of_separation()
+        self.number_of_islands = self.genetic_algorithm_service.get_number_of_islands()
+        self.migration_interval = self.genetic_algorithm_service.get_migration_interval()
+        self.number_of_migrants = self.genetic_algorithm_service.get_number_of_migrants()
+        self.fitness_cache_size = self.genetic_algorithm_service.get_fitness_cache_size()
 
     def start_genetic_algorithm(self, start_time: int = 0, end_time: int = float('inf')) -> list[tuple[str, str]]:
         self.get_material_flow_matrix(start_time, end_time)
@@ -69,212 +118,310 @@ class GeneticAlgorithm:
                     if cell.cell_id in self.positions_distance_matrix:
                         self.entity_fixed_assignment.append((cell.cell_id, cell.placed_entity.identification_str))
 
-    def create_individual(self, available_positions: list[str], unassigned_stations: list[str]) -> list[
-        tuple[str, str]]:
-        if len(available_positions) < len(unassigned_stations):
+    def create_individual(self, available_positions: list[int], number_of_free_stations: int) -> np.ndarray:
+        """Individual: position index of every free station (see run_genetic_loop)."""
+        if len(available_positions) < number_of_free_stations:
             raise ValueError(
-                f"Nicht genügend freie Positionen ({len(available_positions)}) für die nicht zugewiesenen Stationen ({len(unassigned_stations)}).")
-        return list(zip(
-            random.sample(available_positions, len(unassigned_stations)),
-            random.sample(unassigned_stations, len(unassigned_stations))
-        ))
-
-    def run_genetic_loop(self):
-        all_stations = [station for subdict in self.material_flow_matrix.values() for station in subdict.keys()]
-        assigned_stations = [station for _, station in self.entity_fixed_assignment]
-        unassigned_stations = list(set(all_stations) - set(assigned_stations))
-        available_positions = list(
-            set(self.positions_distance_matrix.keys()) - {pos for pos, _ in self.entity_fixed_assignment})
-
+                f"Nicht genügend freie Positionen ({len(available_positions)}) für die nicht zugewiesenen Stationen ({number_of_free_stations}).")
+        return np.array(random.sample(available_positions, number_of_free_stations), dtype=np.int64)
+
+    def create_encoding(self):
+        """Stations and positions as indexes of the flow and distance arrays. Every individual is an integer array
+        with the position index of every free station (free_station_indexes); the fixed stations keep their
+        positions."""
+        self.station_list = list(dict.fromkeys(
+            list(self.material_flow_matrix.keys()) +
+            [station for subdict in self.material_flow_matrix.values() for station in subdict.keys()]))
+        self.position_list = list(self.positions_distance_matrix.keys())
+        station_index_dict = {station: index for index, station in enumerate(self.station_list)}
+        position_index_dict = {pos: index for index, pos in enumerate(self.position_list)}
+
+        self.flow_matrix = np.array([[self.material_flow_matrix.get(src, {}).get(dst, 0) if src != dst else 0
+                                      for dst in self.station_list] for src in self.station_list], dtype=np.float64)
+        self.flow_matrix = self.flow_matrix.reshape(len(self.station_list), len(self.station_list))
+        self.distance_matrix = np.array([[self.positions_distance_matrix[pos_i].get(pos_j, 0) if pos_i != pos_j else 0
+                                          for pos_j in self.position_list] for pos_i in self.position_list],
+                                        dtype=np.float64).reshape(len(self.position_list), len(self.position_list))
+        self.station_flow_sums = self.flow_matrix.sum(axis=0) + self.flow_matrix.sum(axis=1)
+
+        fixed_position_dict = {station_index_dict[station]: position_index_dict[pos]
+                               for pos, station in self.entity_fixed_assignment if station in station_index_dict}
+        self.fixed_station_indexes = np.array(list(fixed_position_dict.keys()), dtype=np.int64)
+        self.fixed_position_indexes = np.array(list(fixed_position_dict.values()), dtype=np.int64)
+        self.free_station_indexes = np.array([index for index in range(len(self.station_list))
+                                              if index not in fixed_position_dict], dtype=np.int64)
+        fixed_positions = {pos for pos, _ in self.entity_fixed_assignment}
+        self.available_position_indexes = np.array([index for index, pos in enumerate(self.position_list)
+                                                    if pos not in fixed_positions], dtype=np.int64)
+
+    def create_population(self) -> np.ndarray:
+        number_of_free_stations = len(self.free_station_indexes)
         try:
-            population = [self.create_individual(available_positions, unassigned_stations) for _ in
-                          range(self.population_size)]
+            return np.array([self.create_individual(self.available_position_indexes.tolist(),
+                                                    number_of_free_stations) for _ in
+                             range(self.population_size)], dtype=np.int64).reshape(self.population_size,
+                                                                                   number_of_free_stations)
         except ValueError as e:
             raise ValueError(f"[ERROR] Fehler beim Erzeugen der Startpopulation: {e}")
 
-        avg_performances = []
-        best_performances = []
-        std_devs = []
-
-        for generation in range(self.number_of_iterations):
-            performance_scores = []
-
-            for ind in population:
-                ind = self.validate_and_correct_assignment(ind)
-                performance_scores.append(self.calculate_performance(ind))
-
-            scored_population = list(zip(population, performance_scores))
-            scored_population.sort(key=lambda x: x[1])
-
-            avg = np.mean(performance_scores)
-            std = np.std(performance_scores)
-
-            avg_performances.append(avg)
-            best_performances.append(scored_population[0][1])
-            std_devs.append(std)
-
-            survivors = [ind for ind, _ in scored_population[:self.number_of_surviving_parents]]
-            next_generation = survivors[:]
-
-            already_selected_for_tournament = set(tuple(map(tuple, survivors)))
-
-            while len(next_generation) < self.population_size:
-                parent1 = self.tournament_selection(scored_population, already_selected_for_tournament)
-                already_selected_for_tournament.add(tuple(map(tuple, parent1)))
-
-                parent2 = self.tournament_selection(scored_population, already_selected_for_tournament)
-                already_selected_for_tournament.add(tuple(map(tuple, parent2)))
-
-                child1, child2 = self.crossover(parent1, parent2)
-                child1 = self.mutate(child1)
-                child2 = self.mutate(child2)
-                next_generation.extend([child1, child2])
-
-            population = next_generation[:self.population_size]
-
-        best_individual = min(population, key=self.calculate_performance)
-        self.entity_assignment = self.entity_fixed_assignment + best_individual
+    def run_genetic_loop(self):
+        self.create_encoding()
+        if len(self.free_station_indexes) == 0:
+            # every station is fixed -> nothing to optimise
+            self.entity_assignment = list(self.entity_fixed_assignment)
+            return
+        # seeded by the random module (like random.sample of the start population)
+        self.random_generator = np.random.default_rng(random.getrandbits(64))
+        self.fitness_cache = FitnessCache(self.fitness_cache_size)
+
+        if self.number_of_islands > 1:
+            population, generation_statistics = self.run_island_model()
+        else:
+            population, generation_statistics = self.evolve_population(self.create_population(),
+                                                                       self.number_of_iterations)
+        avg_performances, best_performances, std_devs = merge_generation_statistics([generation_statistics])
+        cache_hit_rates = (generation_statistics[:, 4] / np.maximum(generation_statistics[:, 0], 1)).tolist()
+        unique_evaluations = generation_statistics[:, 5].astype(int).tolist()
+
+        best_individual = population[np.argmin(self.get_performance_scores(population))]
+        self.entity_assignment = self.entity_fixed_assignment + self.get_assignment(best_individual)
 
         self.plot_performance(avg_performances, best_performances, std_devs)
-        self.save_performance_data(avg_performances, best_performances, std_devs)
-
-    def validate_and_correct_assignment(self, individuum: list[tuple[str, str]]) -> list[tuple[str, str]]:
-        """Validates and corrects the final allocation if a position is occupied more than once."""
-
-        position_to_stations = defaultdict(list)
-        for pos, station in individuum:
-            position_to_stations[pos].append(station)
-
-        # Search for vacant positions
-        all_positions = set(self.positions_distance_matrix.keys())
-        used_positions = set(position_to_stations.keys())
-        free_positions = list(all_positions - used_positions)
-
-        corrected_assignment = []
-        for pos, stations in position_to_stations.items():
-            if len(stations) == 1:
-                corrected_assignment.append((pos, stations[0]))
-            else:
-                # Double occupancy -> select station with largest material flow, leave weaker ones behind
-                station_flows = []
-                for station in stations:
-                    flow_sum = sum(self.material_flow_matrix.get(station, {}).values()) + \
-                               sum(self.material_flow_matrix.get(other_station, {}).get(station, 0)
-                                   for other_station in self.material_flow_matrix)
-                    station_flows.append((station, flow_sum))
-
-                # Sort by descending flow
-                station_flows.sort(key=lambda x: x[1], reverse=True)
-                # Best remains in position
-                corrected_assignment.append((pos, station_flows[0][0]))
-                # All others are reassigned
-                for station, _ in station_flows[1:]:
-                    if free_positions:
-                        new_pos = free_positions.pop(0)
-                        corrected_assignment.append((new_pos, station))
-                    else:
-                        print(f"Warnung: Keine freie Position für Station {station} verfügbar.")
-
-        return corrected_assignment
-
-    def calculate_performance(self, individual: list[tuple[str, str]]) -> float:
-        position_dict = dict(self.entity_fixed_assignment + individual)
-        inverse_position_dict = {v: k for k, v in position_dict.items()}
-        total_cost = 0.0
-        skipped_pairs = 0
-        missing_keys = set()
-
-        for src, dest_dict in self.material_flow_matrix.items():
-            for dst, quantity in dest_dict.items():
-                try:
-                    pos_src = inverse_position_dict[src]
-                    pos_dst = inverse_position_dict[dst]
-                    distance = self.positions_distance_matrix[pos_src][pos_dst]
-                    total_cost += distance * quantity
-                except KeyError:
-                    skipped_pairs += 1
-                    missing_keys.update([src, dst])
-
-        if skipped_pairs > 0:
-            print(f"[WARN] {skipped_pairs} Verbindungen konnten nicht berechnet werden. Ungültiges Individuum.")
-            print(f"[DETAIL] Fehlende Stationen im position_dict: {sorted(missing_keys)}")
-            return float('inf')
-
-        return total_cost
-
-    def tournament_selection(self, population_scores, already_selected):
-        attempts = 0
-        while attempts < 100:
-            contenders = random.sample(population_scores, k=2)
-            contenders.sort(key=lambda x: x[1])
-            best = contenders[0][0]
-            if tuple(map(tuple, best)) not in already_selected:
-                return best
-            attempts += 1
-        return contenders[0][0]  # fallback
-
-    def crossover(self, parent1, parent2):
-        size = len(parent1)
+        self.save_performance_data(avg_performances, best_performances, std_devs, cache_hit_rates=cache_hit_rates,
+                                   unique_evaluations=unique_evaluations)
+
+    def evolve_population(self, population: np.ndarray, number_of_generations: int) -> \
+            tuple[np.ndarray, np.ndarray]:
+        """(population after the generations, [generation, (count, sum, sum of squares, best) of the scores, cache
+        hits, unique evaluations])"""
+        number_of_free_stations = population.shape[1]
+        generation_statistics = np.zeros((number_of_generations, 6))
+
+        for generation in range(number_of_generations):
+            population = self.validate_and_correct_assignment(population)
+            hits, evaluations = self.fitness_cache.hits, self.fitness_cache.evaluations
+            performance_scores = self.get_performance_scores(population)
+
+            order = np.argsort(performance_scores, kind="stable")
+            population = population[order]
+            performance_scores = performance_scores[order]
+
+            generation_statistics[generation] = [len(performance_scores), performance_scores.sum(),
+                                                 np.square(performance_scores).sum(), performance_scores[0],
+                                                 self.fitness_cache.hits - hits,
+                                                 self.fitness_cache.evaluations - evaluations]
+
+            survivors = population[:self.number_of_surviving_parents]
+            number_of_pairs = math.ceil(max(self.population_size - len(survivors), 0) / 2)
+            parents1 = population[self.tournament_selection(performance_scores, number_of_pairs)]
+            parents2 = population[self.tournament_selection(performance_scores, number_of_pairs)]
+            children1, children2 = self.crossover(parents1, parents2)
+            children = self.mutate(np.stack([children1, children2], axis=1).reshape(-1, number_of_free_stations))
+            children = self.replace_duplicate_individuals(survivors, children)
+
+            population = np.concatenate([survivors, children])[:self.population_size]
+
+        return population, generation_statistics
+
+    def run_island_model(self) -> tuple[np.ndarray, np.ndarray]:
+        """number_of_islands populations evolve in parallel processes; after every migration_interval generations the
+        best number_of_migrants individuals of every island replace the worst ones of the next island (ring). The
+        flow and distance matrices are shared with the processes via shared memory. Returns (every individual of
+        every island, statistics of every generation of every island merged)."""
+        populations = [self.create_population() for _ in range(self.number_of_islands)]
+        island_statistics = [[] for _ in populations]
+        shared_memory_list = []
+        try:
+            flow_descriptor = create_shared_array(self.flow_matrix, shared_memory_list)
+            distance_descriptor = create_shared_array(self.distance_matrix, shared_memory_list)
+            with ProcessPoolExecutor(max_workers=min(self.number_of_islands, os.cpu_count()),
+                                     initializer=initialize_island,
+                                     initargs=(self.get_island_settings(), flow_descriptor,
+                                               distance_descriptor)) as executor:
+                remaining_generations = self.number_of_iterations
+                while remaining_generations > 0:
+                    number_of_generations = min(self.migration_interval, remaining_generations)
+                    seeds = self.random_generator.integers(0, 2 ** 63, size=len(populations)).tolist()
+                    results = list(executor.map(evolve_island, populations,
+                                                [number_of_generations] * len(populations), seeds))
+                    populations = [population for population, _ in results]
+                    for statistics_list, (_, generation_statistics) in zip(island_statistics, results):
+                        statistics_list.append(generation_statistics)
+
+                    remaining_generations -= number_of_generations
+                    if remaining_generations > 0:
+                        populations = self.migrate_elites(populations)
+        finally:
+            for shared_memory in shared_memory_list:
+                shared_memory.close()
+                shared_memory.unlink()
+
+        return np.concatenate(populations), combine_generation_statistics(
+            [np.concatenate(statistics_list) for statistics_list in island_statistics])
+
+    def migrate_elites(self, populations: list[np.ndarray]) -> list[np.ndarray]:
+        """The best number_of_migrants individuals of every island replace the worst ones of the next island."""
+        sorted_populations = [population[np.argsort(self.get_performance_scores(population), kind="stable")]
+                              for population in populations]
+        number_of_migrants = min(self.number_of_migrants, self.population_size)
+        if number_of_migrants == 0:
+            return sorted_populations
+        for island_index, population in enumerate(sorted_populations):
+            previous_population = sorted_populations[island_index - 1]
+            population[-number_of_migrants:] = previous_population[:number_of_migrants]
+        return sorted_populations
+
+    def get_island_settings(self) -> dict:
+        """Everything (except of the shared matrices) an island process needs to evolve a population."""
+        return {"number_of_stations": len(self.station_list),
+                "fixed_station_indexes": self.fixed_station_indexes,
+                "fixed_position_indexes": self.fixed_position_indexes,
+                "free_station_indexes": self.free_station_indexes,
+                "available_position_indexes": self.available_position_indexes,
+                "station_flow_sums": self.station_flow_sums,
+                "population_size": self.population_size,
+                "number_of_surviving_parents": self.number_of_surviving_parents,
+                "odds_of_mutation_per_genom_in_percent": self.odds_of_mutation_per_genom_in_percent,
+                "points_of_separation": self.points_of_separation,
+                "fitness_cache_size": self.fitness_cache_size}
+
+    @classmethod
+    def create_island(cls, island_settings: dict, flow_matrix: np.ndarray, distance_matrix: np.ndarray) -> \
+            "GeneticAlgorithm":
+        """GeneticAlgorithm of an island process: only the encoding and the parameters of evolve_population (no
+        simulation, material flow or files)."""
+        island = cls.__new__(cls)
+        for name, value in island_settings.items():
+            if name != "number_of_stations":
+                setattr(island, name, value)
+        island.station_list = [None] * island_settings["number_of_stations"]
+        island.flow_matrix = flow_matrix
+        island.distance_matrix = distance_matrix
+        island.fitness_cache = FitnessCache(island.fitness_cache_size)
+        return island
+
+    def get_assignment(self, individual: np.ndarray) -> list[tuple[str, str]]:
+        """(cell_id, station_id) of every free station of the individual."""
+        return [(self.position_list[position], self.station_list[station])
+                for position, station in zip(individual.tolist(), self.free_station_indexes.tolist())]
+
+    def validate_and_correct_assignment(self, population: np.ndarray) -> np.ndarray:
+        """Validates and corrects the individuals of the population, if a position is occupied more than once."""
+        sorted_population = np.sort(population, axis=1)
+        has_double_occupancy = (sorted_population[:, 1:] == sorted_population[:, :-1]).any(axis=1)
+        for individual_index in np.flatnonzero(has_double_occupancy):
+            population[individual_index] = self.correct_individual(population[individual_index])
+        return population
+
+    def correct_individual(self, individual: np.ndarray) -> np.ndarray:
+        """Double occupancy -> the station with the largest material flow keeps the position, the others get the
+        free positions."""
+        corrected_individual = individual.copy()
+        free_positions = self.available_position_indexes[~np.isin(self.available_position_indexes, individual)]
+        station_flows = self.station_flow_sums[self.free_station_indexes]
+        # Sort by descending flow, best remains in position
+        order = np.argsort(-station_flows, kind="stable")
+        _, first_indexes = np.unique(individual[order], return_index=True)
+        is_weaker_station = np.ones(len(individual), dtype=bool)
+        is_weaker_station[order[first_indexes]] = False
+        # All others are reassigned
+        corrected_individual[is_weaker_station] = free_positions[:int(is_weaker_station.sum())]
+        return corrected_individual
+
+    def get_performance_scores(self, population: np.ndarray) -> np.ndarray:
+        """Performance of every individual (see calculate_performance), cached in the fitness_cache."""
+        return self.fitness_cache.get_performance_scores(population, self.calculate_performance)
+
+    def replace_duplicate_individuals(self, survivors: np.ndarray, children: np.ndarray,
+                                      max_attempts: int = 3) -> np.ndarray:
+        """Children, which are equal to a survivor or an other child, are mutated again (at most max_attempts
+        times), so the next generation contains as many different layouts as possible."""
+        for _ in range(max_attempts):
+            next_generation = np.concatenate([survivors, children])
+            _, first_indexes = np.unique(get_individual_keys(next_generation), return_index=True)
+            is_duplicate = np.ones(len(next_generation), dtype=bool)
+            is_duplicate[first_indexes] = False
+            duplicate_children = np.flatnonzero(is_duplicate[len(survivors):])
+            if len(duplicate_children) == 0:
+                break
+            children[duplicate_children] = self.mutate(children[duplicate_children], odds_of_mutation_in_percent=100)
+        return children
+
+    def calculate_performance(self, population: np.ndarray) -> np.ndarray:
+        """Material flow * distance of every individual of the population: sum_ij flow[i, j] *
+        distance[position[i], position[j]] in one array expression."""
+        assignments = np.empty((len(population), len(self.station_list)), dtype=np.int64)
+        assignments[:, self.fixed_station_indexes] = self.fixed_position_indexes
+        assignments[:, self.free_station_indexes] = population
+        station_distances = self.distance_matrix[assignments[:, :, np.newaxis], assignments[:, np.newaxis, :]]
+        return np.einsum("ij,kij->k", self.flow_matrix, station_distances)
+
+    def tournament_selection(self, performance_scores: np.ndarray, number_of_parents: int) -> np.ndarray:
+        """Index of the better one of two random individuals for every parent."""
+        contenders = self.random_generator.integers(0, len(performance_scores), size=(number_of_parents, 2))
+        better_contender = np.argmin(performance_scores[contenders], axis=1)
+        return contenders[np.arange(number_of_parents), better_contender]
+
+    def crossover(self, parents1: np.ndarray, parents2: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Multi point crossover of every pair of parents: every second segment of the stations is taken from the
+        other parent."""
+        number_of_pairs, size = parents1.shape
         max_points = size - 1
 
         if self.points_of_separation > max_points:
             raise ValueError(f"Zu viele Trennpunkte: {self.points_of_separation} > {max_points}")
-        points = sorted(random.sample(range(1, size), self.points_of_separation))
-
-        toggle = False
-        last = 0
-        child1_raw = []
-        child2_raw = []
-
-        for point in points + [size]:
-            segment1 = parent1[last:point]
-            segment2 = parent2[last:point]
-
-            if toggle:
-                child1_raw.extend(segment2)
-                child2_raw.extend(segment1)
-            else:
-                child1_raw.extend(segment1)
-                child2_raw.extend(segment2)
-
-            toggle = not toggle
-            last = point
-
-        child1_filtered, used_pos1, used_ent1 = self.filter_unique(child1_raw)
-        child2_filtered, used_pos2, used_ent2 = self.filter_unique(child2_raw)
-
-        all_positions = [pos for pos, _ in parent1]
-        all_entities = [ent for _, ent in parent1]
-
-        missing_pos1 = [pos for pos in all_positions if pos not in used_pos1]
-        missing_ent1 = [ent for ent in all_entities if ent not in used_ent1]
-
-        missing_pos2 = [pos for pos in all_positions if pos not in used_pos2]
-        missing_ent2 = [ent for ent in all_entities if ent not in used_ent2]
-
-        child1 = child1_filtered + list(zip(missing_pos1, missing_ent1))
-        child2 = child2_filtered + list(zip(missing_pos2, missing_ent2))
-
-        return child1, child2
-
-    def filter_unique(self, pairs):
-        seen_positions = set()
-        seen_entities = set()
-        filtered = []
-
-        for pos, ent in pairs:
-            if pos not in seen_positions and ent not in seen_entities:
-                filtered.append((pos, ent))
-                seen_positions.add(pos)
-                seen_entities.add(ent)
-
-        return filtered, seen_positions, seen_entities
-
-    def mutate(self, individual):
-        if random.randint(0, 100) < self.odds_of_mutation_per_genom_in_percent:
-            idx1, idx2 = random.sample(range(len(individual)), 2)
-            individual[idx1], individual[idx2] = individual[idx2], individual[idx1]
-        return individual
+        points = np.sort(self.random_generator.random((number_of_pairs, max_points)).argsort(axis=1)[
+                         :, :self.points_of_separation] + 1, axis=1)
+
+        segment_numbers = (np.arange(size)[np.newaxis, :, np.newaxis] >= points[:, np.newaxis, :]).sum(axis=2)
+        is_swapped = segment_numbers % 2 == 1
+        children1 = np.where(is_swapped, parents2, parents1)
+        children2 = np.where(is_swapped, parents1, parents2)
+
+        return self.replace_duplicate_positions(children1, parents1), \
+            self.replace_duplicate_positions(children2, parents1)
+
+    def replace_duplicate_positions(self, children: np.ndarray, parents: np.ndarray) -> np.ndarray:
+        """Every position is kept at its first station; the other stations get the positions of the parent, which
+        aren't used by the child (in the order of the parent)."""
+        number_of_children, size = children.shape
+        rows = np.arange(number_of_children)[:, np.newaxis]
+
+        order = np.argsort(children, axis=1, kind="stable")
+        sorted_children = children[rows, order]
+        is_duplicate = np.zeros(children.shape, dtype=bool)
+        is_duplicate[rows, order[:, 1:]] = sorted_children[:, 1:] == sorted_children[:, :-1]
+        if not is_duplicate.any():
+            return children
+
+        is_used = np.zeros((number_of_children, len(self.distance_matrix)), dtype=bool)
+        is_used[rows, children] = True
+        is_missing = ~is_used[rows, parents]
+
+        # the n-th duplicate of a child gets the n-th missing position of its parent
+        missing_positions = np.zeros(children.shape, dtype=np.int64)
+        missing_rows, missing_columns = np.nonzero(is_missing)
+        missing_positions[missing_rows, (np.cumsum(is_missing, axis=1) - 1)[is_missing]] = \
+            parents[missing_rows, missing_columns]
+        duplicate_rows, duplicate_columns = np.nonzero(is_duplicate)
+        children[duplicate_rows, duplicate_columns] = \
+            missing_positions[duplicate_rows, (np.cumsum(is_duplicate, axis=1) - 1)[is_duplicate]]
+        return children
+
+    def mutate(self, population: np.ndarray, odds_of_mutation_in_percent: int | None = None) -> np.ndarray:
+        """Swaps the positions of two stations of the individuals with odds_of_mutation_in_percent (None ->
+        odds_of_mutation_per_genom_in_percent)."""
+        if odds_of_mutation_in_percent is None:
+            odds_of_mutation_in_percent = self.odds_of_mutation_per_genom_in_percent
+        number_of_individuals, size = population.shape
+        if size < 2:
+            return population
+        is_mutated = self.random_generator.integers(0, 101, size=number_of_individuals) < odds_of_mutation_in_percent
+        rows = np.flatnonzero(is_mutated)
+        idx1 = self.random_generator.integers(0, size, size=len(rows))
+        idx2 = (idx1 + self.random_generator.integers(1, size, size=len(rows))) % size
+        population[rows, idx1], population[rows, idx2] = population[rows, idx2], population[rows, idx1]
+        return population
 
     def plot_performance(self, avg_performances, best_performances, std_devs):
         generations = range(len(avg_performances))
@@ -295,7 +442,8 @@ class GeneticAlgorithm:
         plt.savefig(path)
         plt.close()
 
-    def save_performance_data(self, avg_performances, best_performances, std_devs):
+    def save_performance_data(self, avg_performances, best_performances, std_devs, cache_hit_rates=None,
+                              unique_evaluations=None):
         data = [
             {
                 "generation": i,
@@ -305,8 +453,71 @@ class GeneticAlgorithm:
             }
             for i, (avg, best, std) in enumerate(zip(avg_performances, best_performances, std_devs))
         ]
+        if cache_hit_rates is not None and unique_evaluations is not None:
+            for generation_data, cache_hit_rate, evaluations in zip(data, cache_hit_rates, unique_evaluations):
+                generation_data["cache_hit_rate"] = cache_hit_rate
+                generation_data["unique_evaluations"] = evaluations
 
         filename = f"GA Leistung der Generationen_Produktionszeit-{self.env.now}s.json"
         path = os.path.join(GENETIC_ALGORITHM, filename)
         with open(path, 'w') as f:
             json.dump(data, f, indent=4)
+
+
+def get_individual_keys(population: np.ndarray) -> np.ndarray:
+    """Key of every individual: the bytes of its position array as one value (equal layouts -> equal keys)."""
+    population = np.ascontiguousarray(population)
+    return population.view(np.dtype((np.void, population.dtype.itemsize * population.shape[1]))).reshape(-1)
+
+
+island_genetic_algorithm: GeneticAlgorithm | None = None  # GeneticAlgorithm of an island process
+island_shared_memory_list: list[shared_memory.SharedMemory] = []  # kept open while the island process runs
+
+
+def create_shared_array(array: np.ndarray, shared_memory_list: list[shared_memory.SharedMemory]) -> \
+        tuple[str, tuple[int, ...], str]:
+    """Copies the array into a new shared memory block (appended to shared_memory_list) and returns its (name, shape,
+    dtype)."""
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    shared_memory_list.append(block)
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    return block.name, array.shape, array.dtype.str
+
+
+def attach_shared_array(descriptor: tuple[str, tuple[int, ...], str]) -> np.ndarray:
+    name, shape, dtype = descriptor
+    block = shared_memory.SharedMemory(name=name)
+    island_shared_memory_list.append(block)
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def initialize_island(island_settings: dict, flow_descriptor: tuple, distance_descriptor: tuple):
+    """Initializer of the island processes: the matrices are attached once per process."""
+    global island_genetic_algorithm
+    island_genetic_algorithm = GeneticAlgorithm.create_island(island_settings, attach_shared_array(flow_descriptor),
+                                                              attach_shared_array(distance_descriptor))
+
+
+def evolve_island(population: np.ndarray, number_of_generations: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+    island_genetic_algorithm.random_generator = np.random.default_rng(seed)
+    return island_genetic_algorithm.evolve_population(population, number_of_generations)
+
+
+def combine_generation_statistics(generation_statistics_list: list[np.ndarray]) -> np.ndarray:
+    """Statistics of every generation of several populations (see evolve_population) as the ones of one population:
+    the best score is the minimum, every other column is added up."""
+    generation_statistics = np.sum(generation_statistics_list, axis=0)
+    generation_statistics[:, 3] = np.min([statistics[:, 3] for statistics in generation_statistics_list], axis=0)
+    return generation_statistics
+
+
+def merge_generation_statistics(generation_statistics_list: list[np.ndarray]) -> \
+        tuple[list[float], list[float], list[float]]:
+    """(average, best, standard deviation) of every generation from the (count, sum, sum of squares, best) of the
+    scores of one or more populations."""
+    generation_statistics = combine_generation_statistics(generation_statistics_list)
+    best_performances = generation_statistics[:, 3]
+    counts = np.maximum(generation_statistics[:, 0], 1)
+    avg_performances = generation_statistics[:, 1] / counts
+    std_devs = np.sqrt(np.maximum(generation_statistics[:, 2] / counts - np.square(avg_performances), 0))
+    return avg_performances.tolist(), best_performances.tolist(), std_devs.tolist()
@@ -1,8 +1,15 @@
+import hashlib
 import json
 import math
+import os
+import tempfile
 from json import JSONDecodeError
+from pathlib import Path
 
-from src import RESOURCES
+import numpy as np
+
+from src import RESOURCES, DISTANCE_MATRIX_CACHE
+from src.entity.machine.machine import Machine
 from src.entity.sink import Sink
 from src.entity.source import Source
 from src.production.base.cell import Cell
@@ -20,6 +27,10 @@ class PositionsDistanceMatrix:
     cell_input_output_production: list[Cell]
     list_identification_str_objects: list[str]  # Machine & Intermediate Store
 
+    position_list: list[str]  # position index -> cell.identification_str
+    position_index_dict: dict[str, int]  # {cell.identification_str, position index}
+    distance_array: np.ndarray  # [position index, position index] driving distance in cells
+
     def __init__(self, production: Production):
         self.production = production
 
@@ -28,10 +39,18 @@ class PositionsDistanceMatrix:
         self.data_position_cell_list = []
         self.cell_input_output_production = []
 
+        self.position_list = []
+        self.position_index_dict = {}
+        self.distance_array = np.zeros((0, 0))
+        self.cache_folder = DISTANCE_MATRIX_CACHE
+
     def start_creating_positions_distance_matrix(self):
+        """The matrix is created once (every topology algorithm calls this method)."""
+        if self.positions_distance_matrix:
+            return
         self.get_potential_position_list_from_json()
         self.save_cells()
-        self.calculate_manhattan_distance_between_positions()
+        self.calculate_driving_distance_between_positions()
 
     def get_potential_position_list_from_json(self):
         file_path = RESOURCES / "potential_machine_and_store_positioning.json"
@@ -75,13 +94,165 @@ class PositionsDistanceMatrix:
             self.positions_distance_matrix[cell_one.cell_id] = {}
             for cell_two in self.data_position_cell_list:
                 if cell_one != cell_two:
-                    dx = abs(cell_two.cell_coordinates.x - cell_one.cell_coordinates.x)
-                    dy = abs(cell_two.cell_coordinates.y - cell_one.cell_coordinates.y)
+                    self.positions_distance_matrix[cell_one.cell_id][cell_two.cell_id] = \
+                        self.get_manhattan_distance(cell_one, cell_two)
+
+    def calculate_driving_distance_between_positions(self):
+        """Driving distances of a TR between the placement areas of the positions in the empty layout (only Source,
+        Sink and static machines are left, every position is occupied by an object). One multi-source BFS per
+        position starts on every cell, where the TR touches the area of the position; the distance to an other
+        position is the shortest distance to a cell, where the TR touches its area. Pairs without a path keep the
+        manhattan distance. The matrix is cached on the disk, keyed by a hash of the layout and the positions."""
+        self.position_list = list(dict.fromkeys(cell.cell_id for cell in self.data_position_cell_list))
+        self.position_index_dict = {cell_id: index for index, cell_id in enumerate(self.position_list)}
+        position_cell_list = list({cell.cell_id: cell for cell in self.data_position_cell_list}.values())
+
+        obstacle_grid, area_list, tr_size = self.get_empty_layout(position_cell_list)
+        cache_key = self.get_cache_key(obstacle_grid, area_list, tr_size)
+        cache_file = self.cache_folder / f"positions_distance_matrix_{cache_key}.npy"
+        self.distance_array = self.load_cached_distance_array(cache_file, len(self.position_list))
+        if self.distance_array is None:
+            self.distance_array = self.run_breadth_first_searches(obstacle_grid, area_list, tr_size)
+            unreachable = np.isinf(self.distance_array)
+            for i, j in zip(*np.nonzero(unreachable)):
+                self.distance_array[i, j] = self.get_manhattan_distance(position_cell_list[i], position_cell_list[j])
+            self.save_cached_distance_array(cache_file, self.distance_array)
+
+        self.positions_distance_matrix = {
+            cell_id: {other_cell_id: distance for other_cell_id, distance in zip(self.position_list, distances)
+                      if other_cell_id != cell_id}
+            for cell_id, distances in zip(self.position_list, self.distance_array.tolist())}
+
+    @staticmethod
+    def load_cached_distance_array(cache_file: Path, position_count: int) -> np.ndarray | None:
+        """Cached matrix or None, if there is no cache file or it is damaged (e.g. a run was killed while writing)."""
+        if not cache_file.exists():
+            return None
+        try:
+            distance_array = np.load(cache_file)
+        except (OSError, ValueError, EOFError):
+            return None
+        if distance_array.shape != (position_count, position_count):
+            return None
+        return distance_array
+
+    def save_cached_distance_array(self, cache_file: Path, distance_array: np.ndarray):
+        """Writes a temporary file in the cache folder and moves it into place, so parallel runs sharing the cache
+        folder never read a half written file."""
+        self.cache_folder.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=self.cache_folder, prefix=cache_file.stem, suffix=".tmp",
+                                         delete=False) as temporary_file:
+            np.save(temporary_file, distance_array)
+        os.replace(temporary_file.name, cache_file)
+
+    def get_empty_layout(self, position_cell_list: list[Cell]) -> \
+            tuple[np.ndarray, list[tuple[int, int, int, int]], tuple[int, int]]:
+        """(obstacles [y, x], area (x_min, y_min, x_max, y_max) of every position, (size x, size y) of the largest
+        TR). The area of a position with Source, Sink or a static machine is the area of the entity, the other ones
+        get the size of the largest machine / intermediate store."""
+        max_coordinate = self.production.max_coordinate
+        obstacle_grid = np.zeros((max_coordinate.y, max_coordinate.x), dtype=bool)
+        for y in self.production.production_layout:
+            for cell in y:
+                if self.check_entity_is_fixed(cell.placed_entity):
+                    obstacle_grid[cell.cell_coordinates.y, cell.cell_coordinates.x] = True
+
+        object_list = list(self.production.machine_list) + list(self.production.intermediate_store_list)
+        object_size = (max((int(entity.size.x) for entity in object_list), default=1),
+                       max((int(entity.size.y) for entity in object_list), default=1))
+        area_list = []
+        for cell in position_cell_list:
+            if isinstance(cell.placed_entity, (Source, Sink)):
+                size_x, size_y = 1, 1
+            elif self.check_entity_is_fixed(cell.placed_entity):
+                size_x, size_y = int(cell.placed_entity.size.x), int(cell.placed_entity.size.y)
+            else:
+                size_x, size_y = object_size
+            # the position is the upper left corner of the area (see RepositioningObjects)
+            x_min, y_max = cell.cell_coordinates.x, cell.cell_coordinates.y + 1
+            area = (max(x_min, 0), max(y_max - size_y, 0), min(x_min + size_x, max_coordinate.x),
+                    min(y_max, max_coordinate.y))
+            area_list.append(area)
+            obstacle_grid[area[1]:area[3], area[0]:area[2]] = True
+
+        tr_size = (max((int(tr.size.x) for tr in self.production.tr_list), default=1),
+                   max((int(tr.size.y) for tr in self.production.tr_list), default=1))
+        return obstacle_grid, area_list, tr_size
+
+    def check_entity_is_fixed(self, entity) -> bool:
+        return isinstance(entity, (Source, Sink)) or (isinstance(entity, Machine) and entity.driving_speed == 0)
+
+    def get_cache_key(self, obstacle_grid: np.ndarray, area_list: list[tuple[int, int, int, int]],
+                      tr_size: tuple[int, int]) -> str:
+        key = hashlib.sha256()
+        key.update(json.dumps([self.position_list, area_list, tr_size, obstacle_grid.shape]).encode())
+        key.update(np.packbits(obstacle_grid).tobytes())
+        return key.hexdigest()[:32]
+
+    def run_breadth_first_searches(self, obstacle_grid: np.ndarray, area_list: list[tuple[int, int, int, int]],
+                                   tr_size: tuple[int, int]) -> np.ndarray:
+        """[position index, position index] driving distance (inf -> no path)."""
+        tr_is_free = count_cells_in_footprints(obstacle_grid, tr_size) == 0
+        touching_cell_list = []
+        for x_min, y_min, x_max, y_max in area_list:
+            ring = np.zeros(obstacle_grid.shape, dtype=bool)
+            ring[max(y_min - 1, 0):y_max + 1, max(x_min - 1, 0):x_max + 1] = True
+            ring[y_min:y_max, x_min:x_max] = False
+            touching_cell_list.append(tr_is_free & (count_cells_in_footprints(ring, tr_size) > 0))
+
+        distance_array = np.full((len(area_list), len(area_list)), np.inf)
+        np.fill_diagonal(distance_array, 0)
+        for start_index, start_cells in enumerate(touching_cell_list):
+            distances = run_multi_source_breadth_first_search(tr_is_free, start_cells)
+            for end_index, end_cells in enumerate(touching_cell_list):
+                if end_index != start_index and end_cells.any():
+                    distance_array[start_index, end_index] = distances[end_cells].min()
+        return distance_array
+
+    def get_manhattan_distance(self, cell_one: Cell, cell_two: Cell) -> float:
+        dx = abs(cell_two.cell_coordinates.x - cell_one.cell_coordinates.x)
+        dy = abs(cell_two.cell_coordinates.y - cell_one.cell_coordinates.y)
+
+        # because driving Robot has to drive around machine/store cannot drive through it
+        if dy == 0:
+            dy = 6
+        return dx + dy
+
+
+def count_cells_in_footprints(grid: np.ndarray, footprint_size: tuple[int, int]) -> np.ndarray:
+    """[y, x] number of True cells of the grid in the footprint of a robot on (x, y): x to x + size x - 1, y - size
+    y + 1 to y (see PathFinding.get_footprint_indices). Footprints outside of the grid count as full."""
+    size_x, size_y = footprint_size
+    height, width = grid.shape
+    summed_area_table = np.zeros((height + 1, width + 1), dtype=np.int64)
+    summed_area_table[1:, 1:] = np.cumsum(np.cumsum(grid, axis=0), axis=1)
 
-                    # because driving Robot has to drive around machine/store cannot drive through it
-                    if dy == 0:
-                        dy = 6
-                    distance = dx + dy
-                    self.positions_distance_matrix[cell_one.cell_id][cell_two.cell_id] = distance
+    counts = np.full(grid.shape, size_x * size_y, dtype=np.int64)
+    if size_x > width or size_y > height:
+        return counts
+    y_min = np.arange(0, height - size_y + 1)[:, np.newaxis]
+    x_min = np.arange(0, width - size_x + 1)[np.newaxis, :]
+    counts[size_y - 1:, :width - size_x + 1] = \
+        summed_area_table[y_min + size_y, x_min + size_x] - summed_area_table[y_min, x_min + size_x] - \
+        summed_area_table[y_min + size_y, x_min] + summed_area_table[y_min, x_min]
+    return counts
 
 
+def run_multi_source_breadth_first_search(free_grid: np.ndarray, start_grid: np.ndarray) -> np.ndarray:
+    """[y, x] number of steps (4 neighbors) from the nearest start cell over the free cells (inf -> not
+    reachable). Every step expands the whole frontier at once."""
+    distances = np.full(free_grid.shape, np.inf)
+    frontier = start_grid & free_grid
+    visited = frontier.copy()
+    step = 0
+    while frontier.any():
+        distances[frontier] = step
+        neighbors = np.zeros(frontier.shape, dtype=bool)
+        neighbors[1:, :] |= frontier[:-1, :]
+        neighbors[:-1, :] |= frontier[1:, :]
+        neighbors[:, 1:] |= frontier[:, :-1]
+        neighbors[:, :-1] |= frontier[:, 1:]
+        frontier = neighbors & free_grid & ~visited
+        visited |= frontier
+        step += 1
+    return distances
@@ -0,0 +1,189 @@
+import time
+
+import numpy as np
+
+from src.process_logic.topologie_manager.qap_tabu_search import QapTabuSearch
+
+
+class QapBranchAndBound:
+    """Exact solver of the quadratic assignment problem: min sum_ij flow[i, j] * distance[position[i], position[j]].
+    The stations are assigned depth-first; every node is bounded with the Gilmore-Lawler bound (linear assignment
+    problem of the cost of every station on every free position) and pruned, if the bound isn't better than the best
+    assignment found so far. Before branching, a short tabu search (QapTabuSearch) gives the starting incumbent, so
+    nodes are pruned from the start. The assignment of the linear assignment problem of every node is also evaluated.
+    If the time budget runs out, the best assignment found so far is returned."""
+    flow_matrix: np.ndarray  # [station, station]
+    distance_matrix: np.ndarray  # [position, position]
+    fixed_position_dict: dict[int, int]  # {station, position} of the stations, which can't be moved
+    best_assignment: np.ndarray | None  # position of every station
+    best_cost: float
+
+    def __init__(self, flow_matrix: np.ndarray, distance_matrix: np.ndarray, fixed_position_dict: dict[int, int],
+                 free_position_list: list[int], time_budget: float = 10.0, incumbent_time_share: float = 0.5,
+                 seed: int = 0):
+        """free_position_list: positions for the stations, which aren't fixed, time_budget: max seconds of solve,
+        incumbent_time_share: max share of the time budget for the tabu search of the starting incumbent, seed: seed
+        of the tabu search"""
+        self.flow_matrix = np.asarray(flow_matrix, dtype=np.float64)
+        self.distance_matrix = np.asarray(distance_matrix, dtype=np.float64)
+        self.fixed_position_dict = fixed_position_dict
+        self.free_position_list = free_position_list
+        self.time_budget = time_budget
+        self.incumbent_time_share = incumbent_time_share
+        self.seed = seed
+
+        self.best_assignment = None
+        self.best_cost = float('inf')
+        self.is_optimal = False
+        self.number_of_nodes = 0
+        self.deadline = 0.0
+
+    def solve(self) -> tuple[np.ndarray | None, float, bool]:
+        """(position of every station, cost, True -> the assignment is optimal). None -> there are less free
+        positions than free stations."""
+        number_of_stations = len(self.flow_matrix)
+        free_station_list = [station for station in range(number_of_stations) if
+                             station not in self.fixed_position_dict]
+        if len(free_station_list) > len(self.free_position_list):
+            return None, float('inf'), False
+
+        # stations with the largest flows are assigned first
+        total_flows = self.flow_matrix.sum(axis=0) + self.flow_matrix.sum(axis=1)
+        free_station_list.sort(key=lambda station: -total_flows[station])
+
+        assignment = np.full(number_of_stations, -1, dtype=np.int64)
+        linear_costs = np.zeros((number_of_stations, len(self.distance_matrix)))
+        cost = 0.0
+        for station, position in self.fixed_position_dict.items():
+            cost += linear_costs[station, position]
+            linear_costs += self.get_linear_costs_of_assignment(station, position)
+            assignment[station] = position
+
+        self.deadline = time.perf_counter() + self.time_budget
+        self.create_incumbent()
+        self.is_optimal = True
+        self.search(np.asarray(free_station_list, dtype=np.int64),
+                    np.asarray(self.free_position_list, dtype=np.int64), assignment, linear_costs, cost)
+        return self.best_assignment, self.best_cost, self.is_optimal
+
+    def search(self, free_stations: np.ndarray, free_positions: np.ndarray, assignment: np.ndarray,
+               linear_costs: np.ndarray, cost: float):
+        if time.perf_counter() > self.deadline:
+            self.is_optimal = False
+            return
+        self.number_of_nodes += 1
+        if len(free_stations) == 0:
+            self.save_if_best(assignment)
+            return
+
+        bound_matrix = self.get_gilmore_lawler_matrix(free_stations, free_positions, linear_costs)
+        columns = solve_linear_assignment(bound_matrix)
+        lower_bound = cost + bound_matrix[np.arange(len(free_stations)), columns].sum()
+        if lower_bound >= self.best_cost - 1e-9:
+            return
+
+        lap_assignment = assignment.copy()
+        lap_assignment[free_stations] = free_positions[columns]
+        self.save_if_best(lap_assignment)
+        if lower_bound >= self.best_cost - 1e-9:
+            return
+
+        station = free_stations[0]
+        for position_index in np.argsort(bound_matrix[0], kind="stable"):
+            if cost + bound_matrix[0, position_index] >= self.best_cost - 1e-9:
+                break
+            position = free_positions[position_index]
+            assignment[station] = position
+            self.search(free_stations[1:], np.delete(free_positions, position_index), assignment,
+                        linear_costs + self.get_linear_costs_of_assignment(station, position),
+                        cost + linear_costs[station, position])
+            assignment[station] = -1
+
+    def get_linear_costs_of_assignment(self, station: int, position: int) -> np.ndarray:
+        """[other station, position of the other station] cost between the other station and the assigned one."""
+        return np.outer(self.flow_matrix[:, station], self.distance_matrix[:, position]) + \
+            np.outer(self.flow_matrix[station, :], self.distance_matrix[position, :])
+
+    def get_gilmore_lawler_matrix(self, free_stations: np.ndarray, free_positions: np.ndarray,
+                                  linear_costs: np.ndarray) -> np.ndarray:
+        """[free station, free position] lower bound of the cost of the station on the position: cost with the
+        assigned stations + half of the minimal scalar product of its flows and distances to the free ones (every
+        flow between two free stations is in the bound of both)."""
+        bound_matrix = linear_costs[np.ix_(free_stations, free_positions)].copy()
+        number_of_other_stations = len(free_stations) - 1
+        if number_of_other_stations == 0:
+            return bound_matrix
+
+        free_flows = self.flow_matrix[np.ix_(free_stations, free_stations)]
+        free_distances = self.distance_matrix[np.ix_(free_positions, free_positions)].copy()
+        np.fill_diagonal(free_distances, np.inf)
+        for flows, distances in [(free_flows, free_distances), (free_flows.T, free_distances.T)]:
+            flows = flows.copy()
+            np.fill_diagonal(flows, 0)
+            sorted_flows = -np.sort(-flows, axis=1)[:, :number_of_other_stations]
+            sorted_distances = np.sort(distances, axis=1)[:, :number_of_other_stations]
+            bound_matrix += 0.5 * sorted_flows @ sorted_distances.T
+        return bound_matrix
+
+    def create_incumbent(self):
+        """Starting incumbent of a tabu search (at most incumbent_time_share of the time budget)."""
+        tabu_search = QapTabuSearch(self.flow_matrix, self.distance_matrix, self.fixed_position_dict,
+                                    self.free_position_list, seed=self.seed,
+                                    time_budget=self.incumbent_time_share * self.time_budget)
+        assignment, _ = tabu_search.solve()
+        if assignment is not None:
+            self.save_if_best(assignment)
+
+    def save_if_best(self, assignment: np.ndarray):
+        cost = self.calculate_cost(assignment)
+        if cost < self.best_cost:
+            self.best_cost = cost
+            self.best_assignment = assignment.copy()
+
+    def calculate_cost(self, assignment: np.ndarray) -> float:
+        return float((self.flow_matrix * self.distance_matrix[np.ix_(assignment, assignment)]).sum())
+
+
+def solve_linear_assignment(cost_matrix: np.ndarray) -> np.ndarray:
+    """Column of every row of the cheapest assignment (Hungarian method with shortest augmenting paths, rows <=
+    columns)."""
+    number_of_rows, number_of_columns = cost_matrix.shape
+    row_potentials = np.zeros(number_of_rows + 1)
+    column_potentials = np.zeros(number_of_columns + 1)
+    column_rows = np.zeros(number_of_columns + 1, dtype=np.int64)  # row (1-based) of every column, 0 -> free
+    previous_columns = np.zeros(number_of_columns + 1, dtype=np.int64)
+
+    for row in range(1, number_of_rows + 1):
+        column_rows[0] = row
+        current_column = 0
+        min_values = np.full(number_of_columns + 1, np.inf)
+        used = np.zeros(number_of_columns + 1, dtype=bool)
+        while True:
+            used[current_column] = True
+            current_row = column_rows[current_column]
+            reduced_costs = cost_matrix[current_row - 1] - row_potentials[current_row] - column_potentials[1:]
+            improved = ~used[1:] & (reduced_costs < min_values[1:])
+            min_values[1:][improved] = reduced_costs[improved]
+            previous_columns[1:][improved] = current_column
+
+            free_min_values = np.where(used[1:], np.inf, min_values[1:])
+            next_column = int(np.argmin(free_min_values)) + 1
+            delta = free_min_values[next_column - 1]
+
+            row_potentials[column_rows[used]] += delta
+            column_potentials[used] -= delta
+            min_values[~used] -= delta
+            current_column = next_column
+            if column_rows[current_column] == 0:
+                break
+
+        while current_column != 0:
+            previous_column = previous_columns[current_column]
+            column_rows[current_column] = column_rows[previous_column]
+            current_column = previous_column
+
+    columns = np.zeros(number_of_rows, dtype=np.int64)
+    for column in range(1, number_of_columns + 1):
+        if column_rows[column] != 0:
+            columns[column_rows[column] - 1] = column - 1
+    return columns
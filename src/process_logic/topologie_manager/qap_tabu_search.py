@@ -0,0 +1,154 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+class QapTabuSearch:
+    """Robust tabu search for large quadratic assignment problems (min sum_ij flow[i, j] * distance[position[i],
+    position[j]]). Every iteration makes the best pairwise swap of two stations, which isn't tabu (a swap is tabu, if
+    both stations would go back to positions they left in the last tenure iterations, unless it gives a new best
+    cost). Free positions without a station get dummy stations without flows, so moving a station to an empty
+    position is a swap with a dummy station. The cost deltas of all swaps are calculated from the current distances
+    between the stations in O(n) per swap (matrix products) instead of calculating the cost of every neighbour."""
+    flow_matrix: np.ndarray  # [station, station], dummy stations for the empty positions at the end
+    distance_matrix: np.ndarray  # [position, position]
+    movable_stations: np.ndarray  # True -> station isn't fixed
+    number_of_stations: int  # without dummy stations
+
+    def __init__(self, flow_matrix: np.ndarray, distance_matrix: np.ndarray, fixed_position_dict: dict[int, int],
+                 free_position_list: list[int], seed: int = 0, max_iterations: int | None = None,
+                 time_budget: float = 10.0):
+        """free_position_list: positions for the stations, which aren't fixed, max_iterations: None -> 100 * number
+        of movable stations, time_budget: max seconds of one search"""
+        flow_matrix = np.asarray(flow_matrix, dtype=np.float64)
+        self.number_of_stations = len(flow_matrix)
+        self.distance_matrix = np.asarray(distance_matrix, dtype=np.float64)
+        self.fixed_position_dict = fixed_position_dict
+        self.free_position_list = list(free_position_list)
+        self.seed = seed
+        self.time_budget = time_budget
+
+        number_of_free_stations = self.number_of_stations - len(fixed_position_dict)
+        number_of_dummy_stations = max(len(self.free_position_list) - number_of_free_stations, 0)
+        size = self.number_of_stations + number_of_dummy_stations
+        self.flow_matrix = np.zeros((size, size))
+        self.flow_matrix[:self.number_of_stations, :self.number_of_stations] = flow_matrix
+        self.movable_stations = np.ones(size, dtype=bool)
+        self.movable_stations[list(fixed_position_dict.keys())] = False
+        self.max_iterations = max_iterations if max_iterations is not None else \
+            100 * int(self.movable_stations.sum())
+
+    def solve(self) -> tuple[np.ndarray | None, float]:
+        """(position of every station, cost). None -> there are less free positions than free stations."""
+        if int(self.movable_stations.sum()) > len(self.free_position_list):
+            return None, float('inf')
+        random_generator = np.random.default_rng(self.seed)
+        deadline = time.perf_counter() + self.time_budget
+
+        assignment = self.create_start_assignment(random_generator)
+        cost = self.calculate_cost(assignment)
+        best_assignment, best_cost = assignment.copy(), cost
+
+        size = len(assignment)
+        number_of_movable_stations = int(self.movable_stations.sum())
+        tabu_matrix = np.zeros((size, len(self.distance_matrix)), dtype=np.int64)  # [station, position] tabu until
+        real_stations = np.arange(size) < self.number_of_stations
+        swap_mask = np.triu(np.outer(self.movable_stations, self.movable_stations), k=1) & \
+            (real_stations[:, np.newaxis] | real_stations[np.newaxis, :])  # swaps of two dummy stations change nothing
+        if not swap_mask.any():
+            return best_assignment[:self.number_of_stations], best_cost
+
+        for iteration in range(1, self.max_iterations + 1):
+            if time.perf_counter() > deadline:
+                break
+            delta_matrix = self.calculate_swap_delta_matrix(assignment)
+
+            is_tabu = (tabu_matrix[:, assignment].T > iteration) & (tabu_matrix[:, assignment] > iteration)
+            is_aspired = cost + delta_matrix < best_cost - 1e-9
+            allowed_swaps = swap_mask & (~is_tabu | is_aspired)
+            if not allowed_swaps.any():
+                allowed_swaps = swap_mask
+            candidate_deltas = np.where(allowed_swaps, delta_matrix, np.inf)
+            best_deltas = np.flatnonzero(candidate_deltas == candidate_deltas.min())
+            station_1, station_2 = np.unravel_index(random_generator.choice(best_deltas), delta_matrix.shape)
+
+            tenure = int(random_generator.integers(max(int(0.9 * number_of_movable_stations), 1),
+                                                   int(1.1 * number_of_movable_stations) + 2))
+            tabu_matrix[station_1, assignment[station_1]] = iteration + tenure
+            tabu_matrix[station_2, assignment[station_2]] = iteration + tenure
+            cost += delta_matrix[station_1, station_2]
+            assignment[[station_1, station_2]] = assignment[[station_2, station_1]]
+            if cost < best_cost - 1e-9:
+                best_assignment, best_cost = assignment.copy(), cost
+
+        return best_assignment[:self.number_of_stations], self.calculate_cost(best_assignment)
+
+    def create_start_assignment(self, random_generator: np.random.Generator) -> np.ndarray:
+        """Fixed stations on their positions, the other stations (and the dummy stations) randomly on the free
+        positions."""
+        assignment = np.zeros(len(self.flow_matrix), dtype=np.int64)
+        for station, position in self.fixed_position_dict.items():
+            assignment[station] = position
+        assignment[self.movable_stations] = random_generator.permutation(self.free_position_list)[
+                                            :int(self.movable_stations.sum())]
+        return assignment
+
+    def calculate_swap_delta_matrix(self, assignment: np.ndarray) -> np.ndarray:
+        """[station 1, station 2] cost change of swapping the positions of both stations. Per swap:
+        sum_k (f[r, k] - f[s, k]) * (d[s, k] - d[r, k]) + (f[k, r] - f[k, s]) * (d[k, s] - d[k, r]), corrected for
+        k = r and k = s (d: distances between the current positions of the stations)."""
+        station_distances = self.distance_matrix[np.ix_(assignment, assignment)]
+        outgoing_products = self.flow_matrix @ station_distances.T
+        incoming_products = self.flow_matrix.T @ station_distances
+        outgoing_costs = np.diag(outgoing_products)
+        incoming_costs = np.diag(incoming_products)
+        return outgoing_products + outgoing_products.T + incoming_products + incoming_products.T \
+            - (outgoing_costs + incoming_costs)[:, np.newaxis] - (outgoing_costs + incoming_costs)[np.newaxis, :] \
+            + (self.flow_matrix + self.flow_matrix.T) * (station_distances + station_distances.T)
+
+    def calculate_swap_delta(self, assignment: np.ndarray, station_1: int, station_2: int) -> float:
+        """Cost change of swapping the positions of the two stations in O(n)."""
+        position_1, position_2 = assignment[station_1], assignment[station_2]
+        other_stations = np.ones(len(assignment), dtype=bool)
+        other_stations[[station_1, station_2]] = False
+        other_positions = assignment[other_stations]
+        delta = np.dot(self.flow_matrix[station_1, other_stations] - self.flow_matrix[station_2, other_stations],
+                       self.distance_matrix[position_2, other_positions] -
+                       self.distance_matrix[position_1, other_positions]) + \
+            np.dot(self.flow_matrix[other_stations, station_1] - self.flow_matrix[other_stations, station_2],
+                   self.distance_matrix[other_positions, position_2] -
+                   self.distance_matrix[other_positions, position_1])
+        delta += (self.flow_matrix[station_1, station_2] - self.flow_matrix[station_2, station_1]) * \
+            (self.distance_matrix[position_2, position_1] - self.distance_matrix[position_1, position_2])
+        return float(delta)
+
+    def calculate_cost(self, assignment: np.ndarray) -> float:
+        return float((self.flow_matrix * self.distance_matrix[np.ix_(assignment, assignment)]).sum())
+
+
+def solve_with_tabu_search(flow_matrix: np.ndarray, distance_matrix: np.ndarray, fixed_position_dict: dict[int, int],
+                           free_position_list: list[int], seed: int, max_iterations: int | None,
+                           time_budget: float) -> tuple[np.ndarray | None, float]:
+    """One tabu search (worker of solve_multi_start_tabu_search)."""
+    return QapTabuSearch(flow_matrix, distance_matrix, fixed_position_dict, free_position_list, seed=seed,
+                         max_iterations=max_iterations, time_budget=time_budget).solve()
+
+
+def solve_multi_start_tabu_search(flow_matrix: np.ndarray, distance_matrix: np.ndarray,
+                                  fixed_position_dict: dict[int, int], free_position_list: list[int],
+                                  number_of_starts: int = 4, base_seed: int = 0, max_workers: int | None = None,
+                                  max_iterations: int | None = None, time_budget: float = 10.0) -> \
+        tuple[np.ndarray | None, float]:
+    """Best result of number_of_starts tabu searches with the seeds base_seed, base_seed + 1, ... (random start
+    assignments), which run in parallel processes (max_workers: None -> number of cores, 1 -> in this process)."""
+    max_workers = max_workers if max_workers is not None else os.cpu_count()
+    arguments = [(flow_matrix, distance_matrix, fixed_position_dict, free_position_list, base_seed + start,
+                  max_iterations, time_budget) for start in range(number_of_starts)]
+    if max_workers == 1 or number_of_starts == 1:
+        results = [solve_with_tabu_search(*argument) for argument in arguments]
+    else:
+        with ProcessPoolExecutor(max_workers=min(max_workers, number_of_starts)) as executor:
+            results = list(executor.map(solve_with_tabu_search, *zip(*arguments)))
+    return min(results, key=lambda result: result[1])
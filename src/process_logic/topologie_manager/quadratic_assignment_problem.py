@@ -1,16 +1,26 @@
 import copy
-import itertools
 from collections import defaultdict
+
+import numpy as np
+
 from src.entity.machine.machine import Machine
 from src.entity.sink import Sink
 from src.entity.source import Source
 from src.monitoring.data_analysis.transport_data.material_flow import MaterialFlow
 from src.process_logic.topologie_manager.positions_distance_matrix import PositionsDistanceMatrix
+from src.process_logic.topologie_manager.qap_branch_and_bound import QapBranchAndBound
+from src.process_logic.topologie_manager.qap_tabu_search import solve_multi_start_tabu_search
 
 
 class QuadraticAssignmentProblem:
-    def __init__(self, material_flow: MaterialFlow, position_distance_matrix: PositionsDistanceMatrix):
+    def __init__(self, material_flow: MaterialFlow, position_distance_matrix: PositionsDistanceMatrix,
+                 time_budget: float = 10.0, use_tabu_search: bool = False, seed: int = 0):
+        """time_budget: max seconds of the solver, use_tabu_search: False -> exact branch-and-bound, True -> tabu
+        search heuristic (multi-start with the seeds seed, seed + 1, ... in parallel processes) for many stations"""
         self.material_flow = material_flow
+        self.time_budget = time_budget
+        self.use_tabu_search = use_tabu_search
+        self.seed = seed
         self.class_position_distance_matrix = position_distance_matrix
         self.class_position_distance_matrix.start_creating_positions_distance_matrix()
         self.positions_distance_matrix = self.class_position_distance_matrix.positions_distance_matrix
@@ -46,7 +56,9 @@ class QuadraticAssignmentProblem:
         """
         Solves the quadratic assignment problem considering fixed assignments.
         Objective: Minimize total cost = material_flow * distance.
-        Fixed entities (sources, sinks, fixed machines) are pre-assigned and excluded from permutations.
+        Fixed entities (sources, sinks, fixed machines) are pre-assigned; the free stations are assigned with
+        branch-and-bound (QapBranchAndBound) or the tabu search (QapTabuSearch). If the time budget runs out, the best
+        assignment found so far is used.
         """
 
         # All available positions and stations
@@ -61,39 +73,41 @@ class QuadraticAssignmentProblem:
         free_positions = [pos for pos in all_positions if pos not in fixed_positions]
         free_stations = [st for st in all_stations if st not in fixed_stations]
 
-        best_assignment = []
-        best_cost = float('inf')
-
-        # Generate all possible permutations for free stations
-        for perm in itertools.permutations(free_positions, len(free_stations)):
-            # Build candidate assignment
-            candidate_assignment = copy.deepcopy(self.entity_fixed_assignment)
-            candidate_assignment.extend(zip(perm, free_stations))
-
-            # Map station to position for fast lookup
-            station_to_pos = {station: pos for pos, station in candidate_assignment}
-
-            # Compute total cost
-            total_cost = 0.0
-            for i in all_stations:
-                for j in all_stations:
-                    flow = self.material_flow_matrix.get(i, {}).get(j, 0)
-                    if flow == 0:
-                        continue
-
-                    pos_i = station_to_pos.get(i)
-                    pos_j = station_to_pos.get(j)
-                    if pos_i is None or pos_j is None:
-                        continue
-
-                    distance = self.positions_distance_matrix[pos_i][pos_j]
-                    total_cost += flow * distance
-
-            if total_cost < best_cost:
-                best_cost = total_cost
-                best_assignment = candidate_assignment
-
-        self.entity_assignment = best_assignment
+        position_index_dict = {pos: index for index, pos in enumerate(all_positions)}
+        station_index_dict = {station: index for index, station in enumerate(all_stations)}
+        flow_matrix, distance_matrix = self.create_flow_and_distance_matrices(all_stations, all_positions)
+        fixed_position_dict = {station_index_dict[station]: position_index_dict[pos] for pos, station in
+                               self.entity_fixed_assignment if station in station_index_dict}
+
+        free_position_indexes = [position_index_dict[pos] for pos in free_positions]
+        if self.use_tabu_search:
+            best_positions, best_cost = solve_multi_start_tabu_search(flow_matrix, distance_matrix, fixed_position_dict,
+                                                                      free_position_indexes, base_seed=self.seed,
+                                                                      time_budget=self.time_budget)
+        else:
+            branch_and_bound = QapBranchAndBound(flow_matrix, distance_matrix, fixed_position_dict,
+                                                 free_position_indexes, self.time_budget, seed=self.seed)
+            best_positions, best_cost, is_optimal = branch_and_bound.solve()
+            if best_positions is not None and not is_optimal:
+                print(f"QAP: time budget of {self.time_budget} s exceeded, best found cost: {best_cost}")
+        if best_positions is None:
+            self.entity_assignment = []
+            return
+
+        self.entity_assignment = copy.deepcopy(self.entity_fixed_assignment)
+        self.entity_assignment.extend((all_positions[best_positions[station_index_dict[station]]], station)
+                                      for station in free_stations)
+
+    def create_flow_and_distance_matrices(self, all_stations: list[str], all_positions: list[str]) -> \
+            tuple[np.ndarray, np.ndarray]:
+        """Material flows [station, station] and distances [position, position] as arrays (distance to the same
+        position: 0)."""
+        flow_matrix = np.array([[self.material_flow_matrix.get(i, {}).get(j, 0) if i != j else 0
+                                 for j in all_stations] for i in all_stations], dtype=np.float64)
+        distance_matrix = np.array([[self.positions_distance_matrix[pos_i].get(pos_j, 0) if pos_i != pos_j else 0
+                                     for pos_j in all_positions] for pos_i in all_positions], dtype=np.float64)
+        return flow_matrix.reshape(len(all_stations), len(all_stations)), \
+            distance_matrix.reshape(len(all_positions), len(all_positions))
 
     def validate_and_correct_assignment(self):
         """Validates and corrects final assignments if a position is assigned multiple times."""
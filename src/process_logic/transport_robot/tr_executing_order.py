@@ -187,13 +187,19 @@ class TrExecutingOrder:
                                  f"{tr.identification_str}")
 
             if len(path) > 0:
-                if self.path_finding.entity_move_service.move_entity_one_step(start_cell_coordinates, tr, path[0]) is True:
+                if path[0] == start_cell_coordinates.cell_id:
+                    # waiting step of a reserved route (cooperative path planning)
+                    tr.working_status.driving_route.pop(0)
+
+                elif self.path_finding.entity_move_service.move_entity_one_step(start_cell_coordinates, tr, path[0]) is True:
                     tr.working_status.driving_route.pop(0)
                     tr.working_status.waiting_time_on_path = self.waiting_time
 
                 else:
                     tr.working_status.waiting_time_on_path -= 1
-                    if tr.working_status.waiting_time_on_path == 0:
+                    # a blocked reserved route is calculated again immediately
+                    if tr.working_status.waiting_time_on_path == 0 or \
+                            self.path_finding.reservation_table.check_entity_has_reservations(tr.identification_str):
                         path = self.path_finding.get_path_for_entity(tr,
                                                                      tr.working_status.driving_destination_coordinates)
                         if isinstance(path, Exception):
@@ -215,10 +221,31 @@ class TrExecutingOrder:
             self.drive_side_step_route_one_step(tr, start_cell_coordinates)
             return False
 
+    def claim_route_segment_for_tr(self, tr: TransportRobot) -> tuple[int, list[Cell]]:
+        """Only with macro step movement: claims the next straight segment of the driving_route.
+        Return: (number of steps of the segment, claimed cells); (0, []) -> the tr drives one step."""
+        path = tr.working_status.driving_route
+        if self.path_finding.macro_step_movement is False or not isinstance(path, list) or \
+                isinstance(tr.working_status.side_step_driving_route, list):
+            return 0, []
+        start_cell = self.path_finding.get_start_cell_from_entity(tr)
+        return self.path_finding.entity_move_service.claim_route_segment(tr, start_cell, path)
+
+    def drive_tr_route_segment(self, tr: TransportRobot, number_of_steps: int,
+                               claimed_cell_list: list[Cell]) -> bool | Exception:
+        """Releases the claimed cells and drives every step of the segment. Returns like
+        drive_tr_one_step_trough_production for the last step."""
+        self.path_finding.entity_move_service.release_claimed_cells(claimed_cell_list)
+        driving_value = False
+        for _ in range(max(1, number_of_steps)):
+            driving_value = self.drive_tr_one_step_trough_production(tr)
+        return driving_value
+
     def drive_side_step_route_one_step(self, tr: TransportRobot, start_cell_coordinates: Coordinates):
         side_step_path = tr.working_status.side_step_driving_route
-        if self.path_finding.entity_move_service.move_entity_one_step(start_cell_coordinates, tr,
-                                                                      side_step_path[0]) is True:
+        if side_step_path[0] == start_cell_coordinates.cell_id or \
+                self.path_finding.entity_move_service.move_entity_one_step(start_cell_coordinates, tr,
+                                                                           side_step_path[0]) is True:
             tr.working_status.side_step_driving_route.pop(0)
 
         if len(tr.working_status.side_step_driving_route) == 0:
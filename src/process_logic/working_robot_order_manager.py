@@ -169,14 +169,21 @@ class WorkingRobotOrderManager:
 
             if path is not None:
                 if len(path) > 0:
-                    if self.path_finding.entity_move_service.move_entity_one_step(start_cell_coordinates, wr,
-                                                                                  path[0]) is True:
+                    if path[0] == start_cell_coordinates.cell_id:
+                        # waiting step of a reserved route (cooperative path planning)
+                        wr.working_status.driving_route.pop(0)
+
+                    elif self.path_finding.entity_move_service.move_entity_one_step(start_cell_coordinates, wr,
+                                                                                    path[0]) is True:
                         wr.working_status.driving_route.pop(0)
                         wr.working_status.waiting_time_on_path = self.waiting_time
 
                     else:
                         wr.working_status.waiting_time_on_path -= 1
-                        if wr.working_status.waiting_time_on_path == 0:
+                        # a blocked reserved route is calculated again immediately
+                        if wr.working_status.waiting_time_on_path == 0 or \
+                                self.path_finding.reservation_table.check_entity_has_reservations(
+                                    wr.identification_str):
                             path = self.path_finding.get_path_for_entity(wr,
                                                                          wr.working_status.driving_destination_coordinates)
 
@@ -200,10 +207,31 @@ class WorkingRobotOrderManager:
             self.drive_side_step_route_one_step(wr, start_cell_coordinates)
             return False
 
+    def claim_route_segment_for_wr(self, wr: WorkingRobot) -> tuple[int, list[Cell]]:
+        """Only with macro step movement: claims the next straight segment of the driving_route.
+        Return: (number of steps of the segment, claimed cells); (0, []) -> the wr drives one step."""
+        path = wr.working_status.driving_route
+        if self.path_finding.macro_step_movement is False or not isinstance(path, list) or \
+                isinstance(wr.working_status.side_step_driving_route, list):
+            return 0, []
+        start_cell = self.path_finding.get_start_cell_from_entity(wr)
+        return self.path_finding.entity_move_service.claim_route_segment(wr, start_cell, path)
+
+    def drive_wr_route_segment(self, wr: WorkingRobot, number_of_steps: int,
+                               claimed_cell_list: list[Cell]) -> bool | Exception:
+        """Releases the claimed cells and drives every step of the segment. Returns like
+        drive_wr_one_step_trough_production for the last step."""
+        self.path_finding.entity_move_service.release_claimed_cells(claimed_cell_list)
+        driving_bool = False
+        for _ in range(max(1, number_of_steps)):
+            driving_bool = self.drive_wr_one_step_trough_production(wr)
+        return driving_bool
+
     def drive_side_step_route_one_step(self, wr: WorkingRobot, start_cell_coordinates: Coordinates):
         side_step_path = wr.working_status.side_step_driving_route
-        if self.path_finding.entity_move_service.move_entity_one_step(start_cell_coordinates, wr,
-                                                                      side_step_path[0]) is True:
+        if side_step_path[0] == start_cell_coordinates.cell_id or \
+                self.path_finding.entity_move_service.move_entity_one_step(start_cell_coordinates, wr,
+                                                                           side_step_path[0]) is True:
             wr.working_status.side_step_driving_route.pop(0)
 
         if len(wr.working_status.side_step_driving_route) == 0:
@@ -245,6 +273,7 @@ class WorkingRobotOrderManager:
 
             for cell in cell_list_wr:
                 cell.placed_entity = None
+            self.path_finding.reservation_table.release(wr.identification_str)
 
             machine.working_status.working_robot_status = MachineWorkingRobotStatus.WR_PRESENT
 
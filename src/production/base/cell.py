@@ -1,7 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from src.entity.intermediate_store import IntermediateStore
 from src.production.base.coordinates import Coordinates
+from src.production.base.occupancy_grid import OccupancyGrid
 from src.entity.machine.machine import Machine
 from src.entity.sink import Sink
 from src.entity.source import Source
@@ -14,8 +15,19 @@ class Cell:
     # 400 mm x 400 mm ≙ 1 Cell
     cell_coordinates: Coordinates
     placed_entity: Machine | TransportRobot | WorkingRobot | Source | Sink | IntermediateStore | None
+    occupancy_grid: OccupancyGrid | None = field(default=None, repr=False, compare=False)
     neighbors_list = []
 
+    def __setattr__(self, name, value):
+        """Every change of placed_entity is written into the occupancy_grid of the production (if there is one)."""
+        object.__setattr__(self, name, value)
+        if name == "placed_entity":
+            occupancy_grid = getattr(self, "occupancy_grid", None)
+            if occupancy_grid is not None:
+                occupancy_grid.set_cell(self.cell_coordinates, value)
+        elif name == "occupancy_grid" and value is not None:
+            value.set_cell(self.cell_coordinates, self.placed_entity)
+
     @property  # only if cell_id is used; one time calculation -> is cached
     def cell_id(self) -> str:
         return f"{self.cell_coordinates.x}:{self.cell_coordinates.y}"
@@ -0,0 +1,87 @@
+import numpy as np
+
+
+class ClearanceMap:
+    """Clearance field of the production_layout for every footprint, which is used for movements. For the footprint
+    area_size the field movement_area_maps[(area_size_x, area_size_y)][y, x] is True if the area
+    [x, x + area_size_x) x [y - area_size_y, y + 2) is free (the same area as
+    Production.check_area_of_cells_is_free_for_entity_movement). Only the parts of the fields, which are affected by
+    changed cells of the occupancy_grid, are recalculated, with a summed-area table of the cells around them."""
+    movement_area_maps: dict[tuple[int, int], np.ndarray]  # {(area_size_x, area_size_y), bool array [y, x]}
+    static_movement_area_maps: dict[tuple[int, int], np.ndarray]  # same, but robots are not counted as obstacles
+
+    def __init__(self, occupancy_grid):
+        self.occupancy_grid = occupancy_grid
+        self.movement_area_maps = {}
+        self.static_movement_area_maps = {}
+        self.static_movement_area_maps_version = -1
+
+    def get_movement_area_map(self, area_size_x: int, area_size_y: int) -> np.ndarray:
+        self.update_movement_area_maps()
+        movement_area_map = self.movement_area_maps.get((area_size_x, area_size_y))
+        if movement_area_map is None:
+            movement_area_map = np.zeros(self.occupancy_grid.entity_id_grid.shape, dtype=bool)
+            self.movement_area_maps[(area_size_x, area_size_y)] = movement_area_map
+            self.calculate_movement_area_map(movement_area_map, area_size_x, area_size_y, 0, 0,
+                                             self.occupancy_grid.max_coordinate.x,
+                                             self.occupancy_grid.max_coordinate.y)
+        return movement_area_map
+
+    def get_static_movement_area_map(self, area_size_x: int, area_size_y: int) -> np.ndarray:
+        """Like get_movement_area_map, but only machines, intermediate stores, source and sink are obstacles. The
+        fields are recalculated completely if the static_version of the occupancy_grid has changed."""
+        if self.static_movement_area_maps_version != self.occupancy_grid.static_version:
+            self.static_movement_area_maps.clear()
+            self.static_movement_area_maps_version = self.occupancy_grid.static_version
+
+        static_movement_area_map = self.static_movement_area_maps.get((area_size_x, area_size_y))
+        if static_movement_area_map is None:
+            static_movement_area_map = np.zeros(self.occupancy_grid.entity_id_grid.shape, dtype=bool)
+            self.static_movement_area_maps[(area_size_x, area_size_y)] = static_movement_area_map
+            self.calculate_movement_area_map(static_movement_area_map, area_size_x, area_size_y, 0, 0,
+                                             self.occupancy_grid.max_coordinate.x,
+                                             self.occupancy_grid.max_coordinate.y,
+                                             self.occupancy_grid.get_static_summed_area_table())
+        return static_movement_area_map
+
+    def update_movement_area_maps(self):
+        """Recalculates every anchor cell whose area overlaps a changed area of the occupancy_grid."""
+        dirty_area_list = self.occupancy_grid.dirty_area_list
+        if len(dirty_area_list) == 0:
+            return
+
+        for (area_size_x, area_size_y), movement_area_map in self.movement_area_maps.items():
+            for x_min, y_min, x_max, y_max in dirty_area_list:
+                self.calculate_movement_area_map(movement_area_map, area_size_x, area_size_y,
+                                                 x_min - area_size_x + 1, y_min - 1, x_max, y_max + area_size_y)
+        dirty_area_list.clear()
+
+    def calculate_movement_area_map(self, movement_area_map: np.ndarray, area_size_x: int, area_size_y: int,
+                                    x_min: int, y_min: int, x_max: int, y_max: int, table: np.ndarray | None = None):
+        """Calculates the anchor cells [x_min, x_max) x [y_min, y_max) with a summed-area table of the cells in the
+        areas of these anchor cells (or the given summed-area table of the whole occupancy_grid)."""
+        width = self.occupancy_grid.max_coordinate.x
+        height = self.occupancy_grid.max_coordinate.y
+        x_min, y_min, x_max, y_max = self.occupancy_grid.clip_area(x_min, y_min, x_max, y_max)
+        if x_min >= x_max or y_min >= y_max:
+            return
+
+        x_area_min = np.arange(x_min, x_max)[np.newaxis, :]
+        y_anchor = np.arange(y_min, y_max)[:, np.newaxis]
+        x_area_max = np.minimum(x_area_min + area_size_x, width)
+        y_area_min = np.maximum(y_anchor - area_size_y, 0)
+        y_area_max = np.minimum(y_anchor + 2, height)
+
+        if table is None:
+            # the table only covers the cells of the areas: [x_min, x_max + area_size_x - 1) x [y_min - area_size_y,
+            # y_max + 1), its origin is moved to (x_table_min, y_table_min)
+            x_table_min, y_table_min = x_min, max(y_min - area_size_y, 0)
+            table = self.occupancy_grid.get_summed_area_table(x_table_min, y_table_min,
+                                                              min(x_max + area_size_x - 1, width),
+                                                              min(y_max + 1, height))
+            x_area_min, x_area_max = x_area_min - x_table_min, x_area_max - x_table_min
+            y_area_min, y_area_max = y_area_min - y_table_min, y_area_max - y_table_min
+
+        occupied_cells = table[y_area_max, x_area_max] - table[y_area_min, x_area_max] - \
+            table[y_area_max, x_area_min] + table[y_area_min, x_area_min]
+        movement_area_map[y_min:y_max, x_min:x_max] = occupied_cells == 0
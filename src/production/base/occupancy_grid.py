@@ -0,0 +1,170 @@
+import numpy as np
+
+from src.production.base.clearance_map import ClearanceMap
+from src.entity.transport_robot.transport_robot import TransportRobot
+from src.entity.working_robot.working_robot import WorkingRobot
+from src.production.base.coordinates import Coordinates
+
+
+class OccupancyGrid:
+    """Integer twin of Production.production_layout. entity_id_grid[y, x] holds the index of the entity placed in the
+    cell (0 -> free cell). Every Cell writes its placed_entity into this grid, so it is always in sync with the layout.
+    Summed-area tables of parts of the grid let the clearance_map answer "is this area free" with four lookups."""
+    entity_id_grid: np.ndarray
+    entity_index: dict[str, int]  # {entity.identification_str, index in entity_id_grid}
+    entity_list: list  # index -> entity; index 0 is reserved for free cells
+    entity_is_static: list[bool]  # index -> True for machines, intermediate stores, source and sink
+    dirty_area_list: list[list[int]]  # [x_min, y_min, x_max, y_max] changed since the last clearance_map update
+    entity_bounding_box_list: list[list[int] | None]  # index -> [x_min, y_min, x_max, y_max] around the entity cells
+    entity_bounding_box_is_outdated: list[bool]  # index -> True if a cell on the edge of the box was cleared
+
+    def __init__(self, max_coordinate: Coordinates):
+        self.max_coordinate = max_coordinate
+        self.entity_id_grid = np.zeros((max_coordinate.y, max_coordinate.x), dtype=np.int32)
+        self.entity_index = {}
+        self.entity_list = [None]
+        self.entity_is_static = [False]
+        self.entity_bounding_box_list = [None]
+        self.entity_bounding_box_is_outdated = [False]
+
+        self.version = 0  # is increased with every change of the occupancy
+        self.static_version = 0  # is only increased if a static entity is placed or removed
+
+        self.dirty_area_list = []
+        self.clearance_map = ClearanceMap(self)
+
+    def get_entity_index(self, entity) -> int:
+        """Returns the index of the entity in the entity_id_grid. Unknown entities get the next free index."""
+        if entity is None:
+            return 0
+        index = self.entity_index.get(entity.identification_str)
+        if index is None:
+            index = len(self.entity_list)
+            self.entity_index[entity.identification_str] = index
+            self.entity_list.append(entity)
+            self.entity_is_static.append(not isinstance(entity, TransportRobot | WorkingRobot))
+            self.entity_bounding_box_list.append(None)
+            self.entity_bounding_box_is_outdated.append(False)
+        else:
+            self.entity_list[index] = entity
+        return index
+
+    def set_cell(self, coordinates: Coordinates, entity):
+        index = self.get_entity_index(entity)
+        old_index = self.entity_id_grid[coordinates.y, coordinates.x]
+        if old_index != index:
+            self.entity_id_grid[coordinates.y, coordinates.x] = index
+            self.version += 1
+            if self.entity_is_static[old_index] or self.entity_is_static[index]:
+                self.static_version += 1
+            self.add_dirty_cell(coordinates.x, coordinates.y)
+            self.update_entity_bounding_boxes(coordinates.x, coordinates.y, old_index, index)
+
+    def update_entity_bounding_boxes(self, x: int, y: int, old_index: int, index: int):
+        """The box of the placed entity is expanded. The box of the removed entity is only marked as outdated if the
+        cell is on its edge; it is recalculated inside the old box by get_entity_bounding_box."""
+        old_bounding_box = self.entity_bounding_box_list[old_index]
+        if old_index > 0 and old_bounding_box is not None and \
+                (x in (old_bounding_box[0], old_bounding_box[2] - 1) or
+                 y in (old_bounding_box[1], old_bounding_box[3] - 1)):
+            self.entity_bounding_box_is_outdated[old_index] = True
+        if index > 0:
+            bounding_box = self.entity_bounding_box_list[index]
+            if bounding_box is None:
+                self.entity_bounding_box_list[index] = [x, y, x + 1, y + 1]
+            else:
+                bounding_box[0] = min(bounding_box[0], x)
+                bounding_box[1] = min(bounding_box[1], y)
+                bounding_box[2] = max(bounding_box[2], x + 1)
+                bounding_box[3] = max(bounding_box[3], y + 1)
+
+    def add_dirty_cell(self, x: int, y: int):
+        """Cells, which are changed one after another (e.g. by a moving entity), are collected in one dirty area."""
+        if len(self.dirty_area_list) > 0:
+            dirty_area = self.dirty_area_list[-1]
+            if dirty_area[0] - 1 <= x <= dirty_area[2] and dirty_area[1] - 1 <= y <= dirty_area[3]:
+                dirty_area[0] = min(dirty_area[0], x)
+                dirty_area[1] = min(dirty_area[1], y)
+                dirty_area[2] = max(dirty_area[2], x + 1)
+                dirty_area[3] = max(dirty_area[3], y + 1)
+                return
+        if len(self.dirty_area_list) >= 64:
+            self.dirty_area_list[:] = [[0, 0, self.max_coordinate.x, self.max_coordinate.y]]
+            return
+        self.dirty_area_list.append([x, y, x + 1, y + 1])
+
+    def get_summed_area_table(self, x_min: int, y_min: int, x_max: int, y_max: int) -> np.ndarray:
+        """summed_area_table[y, x] = number of occupied cells in the area [x_min, x_min + x) x [y_min, y_min + y) of
+        the (clipped) area [x_min, x_max) x [y_min, y_max). Only the cells of the area are read, so the table of a
+        small changed area doesn't cost a pass over the whole grid."""
+        occupied = (self.entity_id_grid[y_min:y_max, x_min:x_max] != 0).astype(np.int32)
+        summed_area_table = np.zeros((occupied.shape[0] + 1, occupied.shape[1] + 1), dtype=np.int32)
+        summed_area_table[1:, 1:] = occupied.cumsum(axis=0).cumsum(axis=1)
+        return summed_area_table
+
+    def get_static_summed_area_table(self) -> np.ndarray:
+        """Summed-area table of the whole grid, which only counts cells of machines, intermediate stores, source and
+        sink."""
+        static_cells = np.asarray(self.entity_is_static, dtype=np.int32)[self.entity_id_grid]
+        static_summed_area_table = np.zeros((self.max_coordinate.y + 1, self.max_coordinate.x + 1), dtype=np.int32)
+        static_summed_area_table[1:, 1:] = static_cells.cumsum(axis=0).cumsum(axis=1)
+        return static_summed_area_table
+
+    def clip_area(self, x_min: int, y_min: int, x_max: int, y_max: int) -> tuple[int, int, int, int]:
+        """Cuts the area [x_min, x_max) x [y_min, y_max) to the size of the production_layout."""
+        return (max(0, x_min), max(0, y_min), min(self.max_coordinate.x, x_max), min(self.max_coordinate.y, y_max))
+
+    def count_occupied_cells(self, x_min: int, y_min: int, x_max: int, y_max: int) -> int:
+        """Number of occupied cells in the (clipped) area [x_min, x_max) x [y_min, y_max)."""
+        x_min, y_min, x_max, y_max = self.clip_area(x_min, y_min, x_max, y_max)
+        if x_min >= x_max or y_min >= y_max:
+            return 0
+        return int(np.count_nonzero(self.entity_id_grid[y_min:y_max, x_min:x_max]))
+
+    def check_area_is_free(self, x_min: int, y_min: int, x_max: int, y_max: int, free_condition_entity) -> bool:
+        """True if every cell in the (clipped) area [x_min, x_max) x [y_min, y_max) is empty or occupied by the
+        free_condition_entity."""
+        if free_condition_entity is None:
+            return self.count_occupied_cells(x_min, y_min, x_max, y_max) == 0
+        return self.check_area_is_free_for_entity_index(x_min, y_min, x_max, y_max,
+                                                        self.entity_index.get(free_condition_entity.identification_str,
+                                                                              -1))
+
+    def check_area_is_free_for_entity_index(self, x_min: int, y_min: int, x_max: int, y_max: int, index: int) -> bool:
+        """Same as check_area_is_free, but the free_condition_entity is given by its index (-1 -> no entity)."""
+        occupied_cells = self.count_occupied_cells(x_min, y_min, x_max, y_max)
+        if occupied_cells == 0:
+            return True
+        if index <= 0:
+            return False
+
+        x_min, y_min, x_max, y_max = self.clip_area(x_min, y_min, x_max, y_max)
+        own_cells = int(np.count_nonzero(self.entity_id_grid[y_min:y_max, x_min:x_max] == index))
+        return occupied_cells == own_cells
+
+    def check_cell_is_free(self, coordinates: Coordinates, free_condition_entity) -> bool:
+        index = int(self.entity_id_grid[coordinates.y, coordinates.x])
+        if index == 0:
+            return True
+        return free_condition_entity is not None and \
+            self.entity_index.get(free_condition_entity.identification_str) == index
+
+    def get_entity_bounding_box(self, index: int) -> tuple[int, int, int, int] | None:
+        """Returns the area [x_min, x_max) x [y_min, y_max) around every cell of the entity (None -> no cells). Only
+        the cells inside the tracked box are searched and only if a cell on its edge was cleared."""
+        if index <= 0 or index >= len(self.entity_bounding_box_list):
+            return None
+        bounding_box = self.entity_bounding_box_list[index]
+        if bounding_box is not None and self.entity_bounding_box_is_outdated[index]:
+            x_min, y_min, x_max, y_max = bounding_box
+            y_list, x_list = np.nonzero(self.entity_id_grid[y_min:y_max, x_min:x_max] == index)
+            bounding_box = None if len(x_list) == 0 else \
+                [x_min + int(x_list.min()), y_min + int(y_list.min()), x_min + int(x_list.max()) + 1,
+                 y_min + int(y_list.max()) + 1]
+            self.entity_bounding_box_list[index] = bounding_box
+            self.entity_bounding_box_is_outdated[index] = False
+        return None if bounding_box is None else tuple(bounding_box)
+
+    def get_robot_cell_indices(self, robot_index_list: list[int]) -> np.ndarray:
+        """Returns the flat cell indices (y * max_coordinate.x + x) of every cell of the given entity indices."""
+        return np.flatnonzero(np.isin(self.entity_id_grid, robot_index_list))
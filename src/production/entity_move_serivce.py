@@ -39,6 +39,61 @@ class EntityMoveService:
 
         return False
 
+    def claim_route_segment(self, entity: WorkingRobot | TransportRobot, start_cell: Cell,
+                            path: list[str]) -> tuple[int, list[Cell]]:
+        """Segment at the beginning of the path: the following steps in the same direction as long as the cells, which
+        the entity drives over, are free (or the following waiting steps of a reserved route). The new cells of the
+        segment get the entity as placed_entity, so no other entity can drive into the segment until
+        release_claimed_cells. Return: (number of steps of the segment, claimed cells)"""
+        entity_cell_list = self.production.entities_located.get(entity.identification_str, [])
+        if len(path) == 0 or len(entity_cell_list) == 0:
+            return 0, []
+
+        x_edges = self.production.get_horizontal_edges_of_coordinates(entity_cell_list)
+        y_edges = self.production.get_vertical_edges_of_coordinates(entity_cell_list)
+        x, y = start_cell.cell_coordinates.x, start_cell.cell_coordinates.y
+        step_x, step_y = map(int, path[0].split(":"))
+        direction_x, direction_y = step_x - x, step_y - y
+        if abs(direction_x) + abs(direction_y) > 1:
+            return 0, []
+
+        number_of_steps = 0
+        claimed_cell_list = []
+        for path_step in path:
+            if path_step != f"{x + direction_x}:{y + direction_y}":
+                break
+            x, y = x + direction_x, y + direction_y
+            new_cell_list = self.get_new_cells_of_step(x_edges, y_edges, direction_x * (number_of_steps + 1),
+                                                       direction_y * (number_of_steps + 1))
+            if not all(self.production.coordinates_in_layout(coordinates) and
+                       self.production.get_cell(coordinates).placed_entity is None for coordinates in new_cell_list):
+                break
+            for coordinates in new_cell_list:
+                cell = self.production.get_cell(coordinates)
+                cell.placed_entity = entity
+                claimed_cell_list.append(cell)
+            number_of_steps += 1
+
+        return number_of_steps, claimed_cell_list
+
+    def get_new_cells_of_step(self, x_edges: tuple[int, int], y_edges: tuple[int, int], shift_x: int,
+                              shift_y: int) -> list[Coordinates]:
+        """Cells, which an entity with the edges x_edges, y_edges enters, if it is shifted by (shift_x, shift_y) and
+        the last step was in the direction of the shift (one of the shifts is 0)."""
+        if shift_x > 0:
+            return [Coordinates(x_edges[1] + shift_x, y) for y in range(y_edges[0], y_edges[1] + 1)]
+        if shift_x < 0:
+            return [Coordinates(x_edges[0] + shift_x, y) for y in range(y_edges[0], y_edges[1] + 1)]
+        if shift_y > 0:
+            return [Coordinates(x, y_edges[1] + shift_y) for x in range(x_edges[0], x_edges[1] + 1)]
+        if shift_y < 0:
+            return [Coordinates(x, y_edges[0] + shift_y) for x in range(x_edges[0], x_edges[1] + 1)]
+        return []
+
+    def release_claimed_cells(self, claimed_cell_list: list[Cell]):
+        for cell in claimed_cell_list:
+            cell.placed_entity = None
+
     def check_move_possible(self, new_coordinates: Coordinates) -> bool:
         check_coordinates_in_layout = self.production.coordinates_in_layout(new_coordinates)
         if check_coordinates_in_layout is True:
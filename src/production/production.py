@@ -7,6 +7,7 @@ from simpy import Store
 from src.entity.intermediate_store import IntermediateStore
 from src.production.base.cell import Cell
 from src.production.base.coordinates import Coordinates
+from src.production.base.occupancy_grid import OccupancyGrid
 from src.provide_input_data.entity_service import EntityService
 from src.provide_input_data.starting_condition_service import StartingConditionsService
 from src.entity.machine.machine import Machine
@@ -18,8 +19,9 @@ from src.entity.working_robot.working_robot import WorkingRobot
 
 class Production:
     production_layout: list[list[Cell]] = []
+    occupancy_grid: OccupancyGrid  # integer twin of the production_layout for fast area checks
 
-    service_starting_conditions = StartingConditionsService
+    service_starting_conditions: StartingConditionsService
     source_coordinates: Coordinates
     sink_coordinates: Coordinates
     wr_list: list[WorkingRobot]
@@ -36,6 +38,7 @@ class Production:
         self.env = simulation_environment
         self.service_entity = EntityService(simulation_environment)
         self.service_starting_conditions = service_starting_conditions
+        self.production_layout = []
         self.wr_list = []
         self.entities_located = {}
         self.entities_init_located = {}
@@ -68,11 +71,12 @@ class Production:
 
     def build_layout(self):
         """Forms a list in a list (production_layout), which represents a coordinate system consisting of the class
-        Cell"""
+        Cell. Every cell is connected to the occupancy_grid."""
+        self.occupancy_grid = OccupancyGrid(self.max_coordinate)
         for y in reversed(range(0, self.max_coordinate.y)):
             row: list[Cell] = []
             for x in range(0, self.max_coordinate.x):
-                cell = Cell(Coordinates(x, y), None)
+                cell = Cell(Coordinates(x, y), None, self.occupancy_grid)
                 row.append(cell)
             self.production_layout.append(row)
 
@@ -382,52 +386,38 @@ class Production:
             list[Cell]:
         """get a cell and is checking if the area downwards and to the right is free; if free
         -> return list with free cells; if not free -> if not free -> return empty list"""
-        list_of_checked_cells = []
         y_range_min = max(0, cell.cell_coordinates.y - free_area_size.y)
         y_range_max = cell.cell_coordinates.y
         x_range_min = cell.cell_coordinates.x
         x_range_max = cell.cell_coordinates.x + free_area_size.x
 
-        for y in range(y_range_min, y_range_max):
-            for x in range(x_range_min, x_range_max):
-
-                if self.coordinates_in_layout(Coordinates(x, y)) is False:
-                    break
-                checked_cell = self.get_cell(Coordinates(x, y))
-
-                if self.check_cell_is_free(checked_cell, free_condition_entity) is False:
-                    list_of_checked_cells = []
-                    return list_of_checked_cells
-
-                else:
-                    list_of_checked_cells.append(checked_cell)
-        return list_of_checked_cells
+        if self.occupancy_grid.check_area_is_free(x_range_min, y_range_min, x_range_max, y_range_max,
+                                                  free_condition_entity) is False:
+            return []
+        return self.get_cells_of_area(x_range_min, y_range_min, x_range_max, y_range_max)
 
     def check_area_of_cells_is_free_for_entity_movement(self, cell: Cell, free_area_size: Coordinates,
                                                         free_condition_entity: Machine | WorkingRobot | TransportRobot | None) -> \
             list[Cell]:
         """get a cell and is checking if the area downwards and to the right is free; if free
         -> return list with free cells; if not free -> if not free -> return empty list"""
-        list_of_checked_cells = []
         y_range_min = max(0, cell.cell_coordinates.y - free_area_size.y)
         y_range_max = cell.cell_coordinates.y + 2
         x_range_min = cell.cell_coordinates.x
         x_range_max = cell.cell_coordinates.x + free_area_size.x
 
-        for y in range(y_range_min, y_range_max):
-            for x in range(x_range_min, x_range_max):
-
-                if self.coordinates_in_layout(Coordinates(x, y)) is False:
-                    break
-                checked_cell = self.get_cell(Coordinates(x, y))
-
-                if self.check_cell_is_free(checked_cell, free_condition_entity) is False:
-                    list_of_checked_cells = []
-                    return list_of_checked_cells
-
-                else:
-                    list_of_checked_cells.append(checked_cell)
-        return list_of_checked_cells
+        if self.occupancy_grid.check_area_is_free(x_range_min, y_range_min, x_range_max, y_range_max,
+                                                  free_condition_entity) is False:
+            return []
+        return self.get_cells_of_area(x_range_min, y_range_min, x_range_max, y_range_max)
+
+    def get_cells_of_area(self, x_range_min: int, y_range_min: int, x_range_max: int, y_range_max: int) -> list[Cell]:
+        """Returns every cell of the area [x_range_min, x_range_max) x [y_range_min, y_range_max) which lies in the
+        production_layout (row by row, starting with the lowest y)."""
+        x_range_min, y_range_min, x_range_max, y_range_max = self.occupancy_grid.clip_area(x_range_min, y_range_min,
+                                                                                           x_range_max, y_range_max)
+        return [self.get_cell(Coordinates(x, y)) for y in range(y_range_min, y_range_max)
+                for x in range(x_range_min, x_range_max)]
 
     def check_cell_is_free(self, cell: Cell,
                            free_condition_entity: Machine | WorkingRobot | TransportRobot | None) -> bool:
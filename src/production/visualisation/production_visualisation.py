@@ -10,7 +10,7 @@ from src.simulation_environmnent.simulation_control import SimulationControl
 
 class ProductionVisualisation:
     production: Production
-    service_starting_conditions = StartingConditionsService()
+    service_starting_conditions: StartingConditionsService
     matplotlib_visualisation: MatplotlibVisualisation
     terminal_visualisation: TerminalVisualisation
     pygames_visualisation: PygameVisualisation
@@ -19,6 +19,7 @@ class ProductionVisualisation:
         self.production = production
         self.env = env
         self.simulation_control = simulation_control
+        self.service_starting_conditions = self.production.service_starting_conditions
         self.matplotlib_visualisation = MatplotlibVisualisation(self.production)
         self.terminal_visualisation = TerminalVisualisation(self.production)
         self.pygames_visualisation = PygameVisualisation(self.production, self.env, self.simulation_control)
@@ -27,3 +27,19 @@ class GeneticAlgorithmService:
 
     def get_points_of_separation(self) -> int:
         return self.ga_information_list["points_of_separation"]
+
+    def get_number_of_islands(self) -> int:
+        """1 -> one population, > 1 -> island model with one process per population"""
+        return self.ga_information_list.get("islands", 1)
+
+    def get_migration_interval(self) -> int:
+        """Generations between two migrations of the island model"""
+        return self.ga_information_list.get("migration_interval", 10)
+
+    def get_number_of_migrants(self) -> int:
+        """Best individuals of every island, which migrate to the next island"""
+        return self.ga_information_list.get("migrants_per_island", 2)
+
+    def get_fitness_cache_size(self) -> int:
+        """Max number of cached performances of individuals"""
+        return self.ga_information_list.get("fitness_cache_size", 100000)
@@ -0,0 +1,94 @@
+import json
+import pathlib
+from dataclasses import dataclass, replace
+from datetime import date, datetime
+
+from src import RESOURCES
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    """Validated starting conditions of one simulation. Built once from simulation_starting_conditions.json and
+    date_list.json and passed through the simulation, so several simulations can run in one process with different
+    configs."""
+    production_layout_size_x: int
+    production_layout_size_y: int
+    starting_date_of_simulation: date
+    number_of_simulation_runs: int
+    simulation_duration_in_days: int
+    production_day_duration_in_h: int
+    visualising_via_terminal: bool
+    visualising_via_matplotlib: bool
+    visualising_via_pygame: bool
+    cooperative_path_planning: bool
+    macro_step_movement: bool
+    event_driven_scheduling: bool
+    background_trace_writer: bool
+    compress_trace: bool
+    delta_trace: bool
+    columnar_trace: bool
+    online_kpi: bool
+    trace_queue_size: int
+    topology_manager_method: int  # No algorithm (1), QAP (2), GA (3), FDP(4), QAP tabu search (5)
+    date_list: tuple[date, ...]
+
+    def __post_init__(self):
+        for name in ["production_layout_size_x", "production_layout_size_y", "number_of_simulation_runs",
+                     "simulation_duration_in_days", "production_day_duration_in_h", "trace_queue_size"]:
+            if getattr(self, name) <= 0:
+                raise ValueError(f"{name} has to be positive: {getattr(self, name)}")
+        if self.topology_manager_method not in (1, 2, 3, 4, 5):
+            raise ValueError(f"Invalid topology manager method: {self.topology_manager_method}")
+
+    @classmethod
+    def from_resources(cls, resources: pathlib.Path = RESOURCES) -> "SimulationConfig":
+        with open(resources / "simulation_starting_conditions.json", 'r', encoding='utf-8') as psc:
+            data_process_starting_conditions = json.load(psc)
+        with open(resources / "date_list.json", 'r', encoding='utf-8') as d:
+            date_information = json.load(d)
+        return cls.from_dict(data_process_starting_conditions, date_information)
+
+    @classmethod
+    def from_dict(cls, data_process_starting_conditions: dict, date_information: list[str]) -> "SimulationConfig":
+        start_date_list = data_process_starting_conditions["starting_date_of_simulation"]
+        return cls(
+            production_layout_size_x=int(data_process_starting_conditions["production_layout_size_x"]),
+            production_layout_size_y=int(data_process_starting_conditions["production_layout_size_y"]),
+            starting_date_of_simulation=date(start_date_list[0], start_date_list[1], start_date_list[2]),
+            number_of_simulation_runs=int(data_process_starting_conditions["number_of_simulation_runs"]),
+            simulation_duration_in_days=int(data_process_starting_conditions["simulation_duration_in_days"]),
+            production_day_duration_in_h=int(data_process_starting_conditions["production_day_duration_in_h"]),
+            visualising_via_terminal=cls.convert_y_n(data_process_starting_conditions,
+                                                     "visualising_via_terminal(y/n)"),
+            visualising_via_matplotlib=cls.convert_y_n(data_process_starting_conditions,
+                                                       "visualising_via_matplotlib(y/n)"),
+            visualising_via_pygame=cls.convert_y_n(data_process_starting_conditions, "visualising_via_pygame(y/n)"),
+            cooperative_path_planning=cls.convert_y_n(data_process_starting_conditions,
+                                                      "cooperative_path_planning(y/n)", "n"),
+            macro_step_movement=cls.convert_y_n(data_process_starting_conditions, "macro_step_movement(y/n)", "n"),
+            event_driven_scheduling=cls.convert_y_n(data_process_starting_conditions,
+                                                    "event_driven_scheduling(y/n)", "n"),
+            background_trace_writer=cls.convert_y_n(data_process_starting_conditions,
+                                                    "background_trace_writer(y/n)", "n"),
+            compress_trace=cls.convert_y_n(data_process_starting_conditions, "compress_trace(y/n)", "n"),
+            delta_trace=cls.convert_y_n(data_process_starting_conditions, "delta_trace(y/n)", "n"),
+            columnar_trace=cls.convert_y_n(data_process_starting_conditions, "columnar_trace(y/n)", "n"),
+            online_kpi=cls.convert_y_n(data_process_starting_conditions, "online_kpi(y/n)", "n"),
+            trace_queue_size=int(data_process_starting_conditions.get("trace_queue_size", 10000)),
+            topology_manager_method=int(
+                data_process_starting_conditions["Topology_manager(No algorithm (1), QAP (2), GA (3), FDP(4)"]),
+            date_list=tuple(datetime.strptime(datum_str, "%Y-%m-%d").date() for datum_str in date_information)
+        )
+
+    @staticmethod
+    def convert_y_n(data_process_starting_conditions: dict, key: str, default: str | None = None) -> bool:
+        value = data_process_starting_conditions.get(key, default)
+        if value not in ("y", "n"):
+            raise ValueError(f"{key} has to be 'y' or 'n': {value}")
+        return value == "y"
+
+    def without_visualising(self) -> "SimulationConfig":
+        """Copy of the config with every visualisation switched off (e.g. replications running in the
+        background)."""
+        return replace(self, visualising_via_terminal=False, visualising_via_matplotlib=False,
+                       visualising_via_pygame=False)
@@ -1,63 +1,82 @@
-import json
-from datetime import date, datetime
+from datetime import date
 
-from src import RESOURCES
 from src.production.base.coordinates import Coordinates
+from src.provide_input_data.simulation_config import SimulationConfig
 
 
 class StartingConditionsService:
+    simulation_config: SimulationConfig
 
-    def __init__(self):
-        self.data_process_starting_conditions = None
-        self.date_information = None
-        self.get_starting_condition_files_for_init()
-
-    def get_starting_condition_files_for_init(self):
-        with open(RESOURCES / "simulation_starting_conditions.json", 'r', encoding='utf-8') as psc:
-            self.data_process_starting_conditions = json.load(psc)
-        with open(RESOURCES / "date_list.json", 'r', encoding='utf-8') as d:
-            self.date_information = json.load(d)
+    def __init__(self, simulation_config: SimulationConfig | None = None):
+        """simulation_config: None -> loaded from the resources once."""
+        self.simulation_config = simulation_config if simulation_config is not None else \
+            SimulationConfig.from_resources()
 
     def get_date_list(self) -> list[date]:
-        """Converts the loaded JSON list with strings into real datetime.date objects."""
-        return [datetime.strptime(datum_str, "%Y-%m-%d").date() for datum_str in self.date_information]
+        return list(self.simulation_config.date_list)
 
     def set_max_coordinates_for_production_layout(self) -> Coordinates:
-        return Coordinates(int(self.data_process_starting_conditions["production_layout_size_x"]),
-                           int(self.data_process_starting_conditions["production_layout_size_y"]))
+        return Coordinates(self.simulation_config.production_layout_size_x,
+                           self.simulation_config.production_layout_size_y)
 
     def set_simulation_duration_per_day(self):
-        number_of_days = int(self.data_process_starting_conditions["simulation_duration_in_days"])
-        duration_per_day_in_h = int(self.data_process_starting_conditions["production_day_duration_in_h"])
-        total_duration = (duration_per_day_in_h * 60 * 60) * number_of_days
+        total_duration = (self.simulation_config.production_day_duration_in_h * 60 * 60) * \
+                         self.simulation_config.simulation_duration_in_days
         return total_duration
 
     def set_starting_date_of_simulation(self) -> date:
-        start_date_list = self.data_process_starting_conditions["starting_date_of_simulation"]
-        starting_date = date(start_date_list[0], start_date_list[1], start_date_list[2])
-        return starting_date
+        return self.simulation_config.starting_date_of_simulation
 
     def set_visualising_via_terminal(self):
-        if self.data_process_starting_conditions["visualising_via_terminal(y/n)"] == "y":
-            return True
-        else:
-            return False
+        return self.simulation_config.visualising_via_terminal
 
     def set_visualising_via_matplotlib(self):
-        if self.data_process_starting_conditions["visualising_via_matplotlib(y/n)"] == "y":
-            return True
-        else:
-            return False
+        return self.simulation_config.visualising_via_matplotlib
 
     def set_visualising_via_pygames(self):
-        if self.data_process_starting_conditions["visualising_via_pygame(y/n)"] == "y":
-            return True
-        else:
-            return False
+        return self.simulation_config.visualising_via_pygame
+
+    def get_cooperative_path_planning(self) -> bool:
+        """Robots reserve their routes in space and time instead of waiting and recalculating blocked routes."""
+        return self.simulation_config.cooperative_path_planning
+
+    def get_macro_step_movement(self) -> bool:
+        """Robots drive a straight segment of their route with one simulation event instead of one event per cell."""
+        return self.simulation_config.macro_step_movement
+
+    def get_event_driven_scheduling(self) -> bool:
+        """The dispatchers of tr, wr and machines sleep until an entity has changed instead of checking every
+        second."""
+        return self.simulation_config.event_driven_scheduling
+
+    def get_background_trace_writer(self) -> bool:
+        """The trace files are saved by a writer thread instead of the simulation itself."""
+        return self.simulation_config.background_trace_writer
+
+    def get_compress_trace(self) -> bool:
+        return self.simulation_config.compress_trace
+
+    def get_delta_trace(self) -> bool:
+        """Only the changed fields of an entity are saved instead of a complete snapshot of every action."""
+        return self.simulation_config.delta_trace
+
+    def get_columnar_trace(self) -> bool:
+        """Every action is also saved as memory-mappable columns (timestamp, entity, status, x, y, quantity,
+        stations) for the analysis."""
+        return self.simulation_config.columnar_trace
+
+    def get_online_kpi(self) -> bool:
+        """Material flows, time in state and lead times are accumulated during the simulation; the topology manager
+        uses the material flows of the previous simulated day instead of the stored basis run."""
+        return self.simulation_config.online_kpi
+
+    def get_trace_queue_size(self) -> int:
+        """Max number of queued writing steps of the writer thread before the simulation waits."""
+        return self.simulation_config.trace_queue_size
 
     def get_topology_manager_method(self) -> int:
-        """Return int: No algorithm (1), QAP (2), GA (3), FDP(4)"""
-        return self.data_process_starting_conditions["Topology_manager(No algorithm (1), QAP (2), GA (3), FDP(4)"]
+        """Return int: No algorithm (1), QAP (2), GA (3), FDP(4), QAP tabu search (5)"""
+        return self.simulation_config.topology_manager_method
 
     def get_number_of_simulation_runs(self) -> int:
-        return int(self.data_process_starting_conditions["number_of_simulation_runs"])
\ No newline at end of file
+        return self.simulation_config.number_of_simulation_runs
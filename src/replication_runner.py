@@ -0,0 +1,97 @@
+import json
+import os
+import pathlib
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from src import ROOT, SIMULATION_RUNS, SIMULATION_OUTPUT_ROOT, OUTPUT_DIRECTORIES, ANALYSIS_SOLUTION, TR_STATISTICS, \
+    WR_STATISTICS, MACHINE_WORKLOAD
+from src.provide_input_data.simulation_config import SimulationConfig
+
+
+class ReplicationRunner:
+    """Runs number_of_simulation_runs replications of the simulation in parallel. Every replication is a separate
+    python process with its own output root (SIMULATION_OUTPUT_ROOT), its own seed and its own
+    EnvironmentSimulation, so the replications don't share any output files or global state."""
+    experiment_folder: pathlib.Path
+    result_files: dict[str, pathlib.Path]  # {result name, path relative to the output root of a replication}
+
+    def __init__(self, number_of_runs: int | None = None, base_seed: int = 0, max_workers: int | None = None,
+                 experiment_folder: pathlib.Path | None = None, resources_folder: pathlib.Path | None = None):
+        if number_of_runs is None:
+            number_of_runs = SimulationConfig.from_resources().number_of_simulation_runs
+        self.number_of_runs = number_of_runs
+        self.base_seed = base_seed
+        self.max_workers = max_workers if max_workers is not None else os.cpu_count()
+        self.experiment_folder = experiment_folder if experiment_folder is not None else SIMULATION_RUNS / "replications"
+        self.resources_folder = resources_folder  # None -> the replications read the default resources
+
+        self.result_files = {
+            "throughput_all_products": ANALYSIS_SOLUTION / "throughput_all_products.json",
+            "tr_workload": TR_STATISTICS / "tr_workload.json",
+            "wr_workload": WR_STATISTICS / "wr_workload.json",
+            "machine_workload": MACHINE_WORKLOAD / "machine_workload_grouped.json",
+        }
+        self.result_files = {name: path.relative_to(SIMULATION_OUTPUT_ROOT) for name, path in
+                             self.result_files.items()}
+
+    def run_replications(self) -> list[dict]:
+        """Runs every replication (at most max_workers at the same time) and saves the gathered results."""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            replication_results = list(executor.map(self.run_one_replication, range(1, self.number_of_runs + 1)))
+
+        self.save_replication_results(replication_results)
+        return replication_results
+
+    def run_one_replication(self, run_number: int) -> dict:
+        output_root = self.get_output_root(run_number)
+        seed = self.get_seed(run_number)
+        self.prepare_output_root(output_root)
+
+        env = os.environ.copy()
+        env["SIMULATION_OUTPUT_ROOT"] = str(output_root)
+        if self.resources_folder is not None:
+            env["SIMULATION_RESOURCES"] = str(self.resources_folder)
+        with open(output_root / "simulation_log.txt", "w", encoding="utf-8") as log_file:
+            completed_process = subprocess.run([sys.executable, "-m", "src.run_replication", str(seed)], cwd=ROOT,
+                                               env=env, stdout=log_file, stderr=subprocess.STDOUT)
+
+        print(f"Replication {run_number} (seed {seed}) finished with return code {completed_process.returncode}")
+        return {"run": run_number,
+                "seed": seed,
+                "return_code": completed_process.returncode,
+                "output_root": str(output_root),
+                "results": self.load_results(output_root)}
+
+    def get_output_root(self, run_number: int) -> pathlib.Path:
+        return self.experiment_folder / f"run_{run_number:03d}"
+
+    def get_seed(self, run_number: int) -> int:
+        return self.base_seed + run_number
+
+    def prepare_output_root(self, output_root: pathlib.Path):
+        """Creates the folder structure of simulation_output_data and analysis_solution below the output root."""
+        for directory in OUTPUT_DIRECTORIES:
+            (output_root / directory.relative_to(SIMULATION_OUTPUT_ROOT)).mkdir(parents=True, exist_ok=True)
+
+    def load_results(self, output_root: pathlib.Path) -> dict:
+        """KPIs of one replication (None, if the analysis didn't write the file)."""
+        results = {}
+        for name, relative_path in self.result_files.items():
+            file_path = output_root / relative_path
+            if file_path.exists():
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    results[name] = json.load(f)
+            else:
+                results[name] = None
+        return results
+
+    def save_replication_results(self, replication_results: list[dict]):
+        self.experiment_folder.mkdir(parents=True, exist_ok=True)
+        with open(self.experiment_folder / "replication_results.json", "w", encoding="utf-8") as f:
+            json.dump(replication_results, f, indent=4, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    ReplicationRunner().run_replications()
@@ -0,0 +1,17 @@
+import random
+import sys
+
+from src.simulation_starter import SimulationStarter
+
+
+def run_replication(seed: int):
+    """One replication of the ReplicationRunner. The output root is set by the environment variable
+    SIMULATION_OUTPUT_ROOT before this process is started."""
+    random.seed(seed)
+    command_line_service = SimulationStarter()
+    command_line_service.start_simulation(visualising=False)
+    command_line_service.start_analyse()
+
+
+if __name__ == '__main__':
+    run_replication(int(sys.argv[1]))
@@ -0,0 +1,99 @@
+import simpy
+
+from src.entity.machine.machine import Machine
+from src.entity.transport_robot.transport_robot import TransportRobot
+from src.entity.working_robot.working_robot import WorkingRobot
+
+
+class DispatchSignals:
+    """SimPy events, which wake the dispatcher processes of TrSimulation, WrSimulation and MachineSimulation instead of
+    checking every entity every second. The state of an entity is compared every time SavingSimulationData saves an
+    action of the entity; only a changed state is signalled, so driving steps don't wake a dispatcher.
+
+    Signals: "tr" -> TrSimulation, "wr" -> WrSimulation, "machine" -> MachineSimulation,
+    "producing" -> producing processes of the machines (every change).
+
+    A process, which has signalled a change itself, isn't woken by the same signal in the same time step (it checks
+    again one second later like the polling dispatchers). Otherwise processes, which react to the changes of each
+    other, could wake each other forever without the simulation time going on."""
+    signal_events: dict[str, simpy.Event]  # {signal name, event of the next change}
+    entity_state_dict: dict[str, tuple]  # {identification_str, state at the last saved action}
+    notifying_process_set: set[tuple[str, simpy.Process | None]]  # (signal name, process) of the current time step
+    max_idle_time = 60  # a sleeping dispatcher checks its entities at least once in this time
+
+    def __init__(self, env: simpy.Environment):
+        self.env = env
+        self.signal_events = {signal_name: env.event() for signal_name in ("tr", "wr", "machine", "producing")}
+        self.entity_state_dict = {}
+        self.notifying_process_set = set()
+        self.notification_time = None
+        self.number_of_signals = 0
+
+    def notify(self, signal_name: str):
+        """Triggers the event of the signal, if a process is waiting for it."""
+        if self.notification_time != self.env.now:
+            self.notification_time = self.env.now
+            self.notifying_process_set = set()
+        self.notifying_process_set.add((signal_name, self.env.active_process))
+
+        signal_event = self.signal_events[signal_name]
+        if signal_event.callbacks:
+            self.signal_events[signal_name] = self.env.event()
+            signal_event.succeed()
+            self.number_of_signals += 1
+
+    def notify_every_dispatcher(self):
+        for signal_name in self.signal_events:
+            self.notify(signal_name)
+
+    def wait(self, signal_name: str, max_waiting_time: float | None = None) -> simpy.Event:
+        """Event, which is triggered by the next change for the signal or after max_waiting_time (default:
+        max_idle_time)."""
+        if max_waiting_time is None:
+            max_waiting_time = self.max_idle_time
+        max_waiting_time = max(0, min(max_waiting_time, self.max_idle_time))
+        if self.check_process_has_notified(signal_name):
+            return self.env.timeout(min(max_waiting_time, 1))
+        return self.signal_events[signal_name] | self.env.timeout(max_waiting_time)
+
+    def check_process_has_notified(self, signal_name: str) -> bool:
+        """True -> the active process has triggered the signal in the current time step."""
+        return self.notification_time == self.env.now and \
+            (signal_name, self.env.active_process) in self.notifying_process_set
+
+    def entity_action_saved(self, entity):
+        """Listener of SavingSimulationData.save_entity_action."""
+        entity_state = self.get_entity_state(entity)
+        if entity_state is not None and self.entity_state_dict.get(entity.identification_str) == entity_state:
+            return
+        if entity_state is not None:
+            self.entity_state_dict[entity.identification_str] = entity_state
+
+        self.notify("producing")
+        if isinstance(entity, TransportRobot):
+            self.notify("tr")
+        elif isinstance(entity, WorkingRobot):
+            self.notify("wr")
+            self.notify("machine")
+        elif isinstance(entity, Machine):
+            self.notify_every_dispatcher()
+        else:
+            self.notify("tr")
+
+    def get_entity_state(self, entity) -> tuple | None:
+        """Working status of the entity, which is relevant for the dispatchers (None -> always signalled)."""
+        if isinstance(entity, TransportRobot):
+            return (entity.working_status.status, entity.working_status.working_on_status,
+                    len(entity.material_store.items))
+        elif isinstance(entity, WorkingRobot):
+            return entity.working_status.status, entity.working_status.working_on_status
+        elif isinstance(entity, Machine):
+            return (entity.working_status.process_status, entity.working_status.storage_status,
+                    entity.working_status.working_robot_status, entity.working_status.working_on_status,
+                    entity.working_status.waiting_for_arriving_of_tr, len(entity.processing_list),
+                    len(entity.machine_storage.storage_before_process.items),
+                    len(entity.machine_storage.storage_after_process.items))
+        return None
+
+    def get_state_of_entities(self, entity_list: list) -> tuple:
+        return tuple(self.get_entity_state(entity) for entity in entity_list)
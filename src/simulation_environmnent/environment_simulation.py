@@ -4,12 +4,11 @@ from src import SIMULATION_BASIS_FOR_TOPOLOGIE_MANAGER
 from src.entity.intermediate_store import IntermediateStore
 from src.monitoring.SavingSimulationData import SavingSimulationData
 from src.monitoring.data_analysis.convert_json_data import ConvertJsonData
-from src.monitoring.data_analysis.creating_intermediate_store_during_simulation_dict import \
-    CreatingIntermediateStoreDuringSimulationDict
-from src.monitoring.data_analysis.creating_machine_during_simulation_dict import CreatingMachineDuringSimulationDict
 from src.monitoring.data_analysis.creating_tr_during_simulation_dict import CreatingTrDuringSimulationDict
+from src.monitoring.data_analysis.trace_repository import get_trace_repository
 from src.monitoring.data_analysis.transport_data.material_flow import MaterialFlow
 from src.monitoring.deleting_data import DeletingData
+from src.monitoring.online_kpi_accumulator import OnlineKpiAccumulator
 from src.process_logic.machine.machine_execution import MachineExecution
 from src.process_logic.machine.machine_manager import MachineManager
 from src.process_logic.path_finding import PathFinding
@@ -26,7 +25,9 @@ from src.production.production import Production
 from src.process_logic.manufacturing_plan import ManufacturingPlan
 from src.production.store_manager import StoreManager
 from src.provide_input_data.order_service import OrderService
+from src.provide_input_data.simulation_config import SimulationConfig
 from src.provide_input_data.starting_condition_service import StartingConditionsService
+from src.simulation_environmnent.dispatch_signals import DispatchSignals
 from src.simulation_environmnent.machine_simulation import MachineSimulation
 from src.simulation_environmnent.monitoring_simulation import MonitoringSimulation
 from src.simulation_environmnent.simulation_control import SimulationControl
@@ -39,15 +40,16 @@ class EnvironmentSimulation:
     class_positions_distance_matrix: PositionsDistanceMatrix
     convert_json_data: ConvertJsonData
     creating_tr_during_simulation_dict: CreatingTrDuringSimulationDict
-    class_material_flow: MaterialFlow
+    class_material_flow: MaterialFlow | OnlineKpiAccumulator
     class_quadratic_assignment_problem: QuadraticAssignmentProblem
     repositioning_objects: RepositioningObjects
 
-    def __init__(self, order_service: OrderService):
+    def __init__(self, order_service: OrderService, simulation_config: SimulationConfig | None = None):
+        """simulation_config: None -> loaded from the resources."""
         self.simulation_control = SimulationControl(False, False)
         self.order_service = order_service
         self.env = simpy.Environment()
-        self.service_starting_conditions = StartingConditionsService()
+        self.service_starting_conditions = StartingConditionsService(simulation_config)
         self.production = Production(self.env, self.service_starting_conditions)
         self.store_manager = StoreManager(self.env)
         self.path_finding = PathFinding(self.production)
@@ -62,15 +64,30 @@ class EnvironmentSimulation:
                                                            self.store_manager)
         self.monitoring_simulation = MonitoringSimulation(self.env, self.saving_simulation_data)
 
+        # KPIs accumulated during the simulation (None -> only calculated from the traces after the simulation)
+        self.online_kpi_accumulator = None
+        if self.service_starting_conditions.get_online_kpi():
+            self.online_kpi_accumulator = OnlineKpiAccumulator(self.env, self.production)
+            self.saving_simulation_data.add_entity_action_listener(self.online_kpi_accumulator.entity_action_saved)
+            self.saving_simulation_data.add_goods_receipt_listener(self.online_kpi_accumulator.product_entered)
+            self.saving_simulation_data.add_order_completed_listener(self.online_kpi_accumulator.product_left)
+
+        # Event driven scheduling of the dispatchers (None -> every dispatcher checks its entities every second)
+        self.dispatch_signals = None
+        if self.service_starting_conditions.get_event_driven_scheduling():
+            self.dispatch_signals = DispatchSignals(self.env)
+            self.saving_simulation_data.add_entity_action_listener(self.dispatch_signals.entity_action_saved)
+
         self.wr_simulation = WrSimulation(self.env, self.working_robot_order_manager, self.saving_simulation_data,
-                                          self.simulation_control)
+                                          self.simulation_control, self.dispatch_signals)
 
         # Machine Execution Classes
         self.machine_execution = MachineExecution(self.env, self.manufacturing_plan, self.machine_manager,
                                                   self.store_manager, self.saving_simulation_data)
         self.machine_simulation = MachineSimulation(self.env, self.production, self.machine_manager,
                                                     self.machine_execution, self.store_manager,
-                                                    self.saving_simulation_data, self.simulation_control)
+                                                    self.saving_simulation_data, self.simulation_control,
+                                                    self.dispatch_signals)
 
         # Tr Manager Classes
         self.tr_order_manager = TrOrderManager(self.env, self.manufacturing_plan, self.machine_manager,
@@ -79,7 +96,8 @@ class EnvironmentSimulation:
                                                    self.machine_execution, self.machine_manager, self.store_manager,
                                                    self.saving_simulation_data)
         self.tr_simulation = TrSimulation(self.env, self.tr_order_manager, self.tr_executing_order,
-                                          self.saving_simulation_data, self.simulation_control)
+                                          self.saving_simulation_data, self.simulation_control,
+                                          self.dispatch_signals)
 
         # Deleting Class
         self.deleting_data = DeletingData()
@@ -99,6 +117,7 @@ class EnvironmentSimulation:
     def run_simulation(self):
         simulation_duration = self.production.service_starting_conditions.set_simulation_duration_per_day()
         self.env.run(until=simulation_duration)
+        self.saving_simulation_data.close_trace_files()
 
     def initialise_simulation_start(self):
         self.production.create_production()
@@ -111,9 +130,14 @@ class EnvironmentSimulation:
             self.saving_simulation_data.save_daily_manufacturing_plan(current_date,
                                                                       self.manufacturing_plan.daily_manufacturing_plan)
             self.topology_manager()
+            if self.dispatch_signals is not None:
+                self.dispatch_signals.notify_every_dispatcher()
             print("initialise_simulation_start")
             print(self.manufacturing_plan.daily_manufacturing_plan)
+            production_day = int(self.env.now // 28800)
             yield self.env.timeout(28800)  # 8h working time
+            print(f"path_cache (hits = saved A* searches): "
+                  f"{self.path_finding.path_cache.get_daily_statistics(production_day)}")
             current_date = self.manufacturing_plan.get_next_date(current_date)
             print(f"next_day: {current_date}")
 
@@ -132,41 +156,49 @@ class EnvironmentSimulation:
             yield self.env.timeout(60)
 
     def topology_manager(self):
+        algorithm = self.production.service_starting_conditions.get_topology_manager_method()
         if self.env.now < 1000:
-            self.convert_json_data = ConvertJsonData(SIMULATION_BASIS_FOR_TOPOLOGIE_MANAGER)
             self.class_positions_distance_matrix = PositionsDistanceMatrix(self.production)
-            self.creating_tr_during_simulation_dict = CreatingTrDuringSimulationDict(self.convert_json_data)
-            self.creating_intermediate_store_during_simulation_dict = CreatingIntermediateStoreDuringSimulationDict(
-                self.convert_json_data)
-            self.creating_machine_during_simulation_dict = CreatingMachineDuringSimulationDict(self.convert_json_data)
-            self.class_material_flow = MaterialFlow(self.creating_tr_during_simulation_dict,
-                                                    self.creating_machine_during_simulation_dict,
-                                                    self.creating_intermediate_store_during_simulation_dict)
+            if self.online_kpi_accumulator is not None:
+                self.class_material_flow = self.online_kpi_accumulator
+            else:
+                trace_repository = get_trace_repository(SIMULATION_BASIS_FOR_TOPOLOGIE_MANAGER)
+                self.convert_json_data = trace_repository.get_convert_json_data()
+                self.class_material_flow = self.create_material_flow_of_columnar_trace(self.convert_json_data)
+                if self.class_material_flow is None:
+                    self.creating_tr_during_simulation_dict = trace_repository.get_creating_tr_during_simulation_dict()
+                    self.creating_intermediate_store_during_simulation_dict = \
+                        trace_repository.get_creating_intermediate_store_during_simulation_dict()
+                    self.creating_machine_during_simulation_dict = \
+                        trace_repository.get_creating_machine_during_simulation_dict()
+                    self.class_material_flow = MaterialFlow(self.creating_tr_during_simulation_dict,
+                                                            self.creating_machine_during_simulation_dict,
+                                                            self.creating_intermediate_store_during_simulation_dict)
 
             self.repositioning_objects = RepositioningObjects(self.production)
-
-        algorithm = self.production.service_starting_conditions.get_topology_manager_method()
+            self.create_topology_manager_algorithm(algorithm)
 
         base = 28800
         current_time = self.env.now
         endtime = ((current_time // base) + 1) * base
+        start_time = current_time
+        keep_topology = algorithm == 1
+        if self.online_kpi_accumulator is not None:
+            # live material flows of the previous day instead of the same day of the stored basis run
+            start_time, endtime = max(current_time - base, 0), current_time
+            # no material flows of a full previous day yet -> the first day runs with the starting layout
+            keep_topology = keep_topology or current_time < base
 
-        if algorithm == 1:
+        if keep_topology:
             # No Topology changes
-            if self.env.now < 1000:
-                self.entity_assignment_current_status = EntityAssignmentCurrentStatus(self.production,
-                                                                                      self.class_positions_distance_matrix)
             entity_assignment = self.entity_assignment_current_status.get_entity_assignment()
             self.saving_simulation_data.save_daily_topology(entity_assignment, self.production.max_coordinate)
             print("Kein Topologie Manager wurde ausgeführt")
 
-        elif algorithm == 2:
-            # quadratic_assignment_problem
-            if self.env.now < 1000:
-                self.class_quadratic_assignment_problem = QuadraticAssignmentProblem(self.class_material_flow,
-                                                                                     self.class_positions_distance_matrix)
+        elif algorithm == 2 or algorithm == 5:
+            # quadratic_assignment_problem (2: branch-and-bound, 5: tabu search)
             entity_assignment = self.class_quadratic_assignment_problem.start_quadratic_assignment_problem(
-                start_time=self.env.now, end_time=endtime)
+                start_time=start_time, end_time=endtime)
             self.repositioning_objects.start_repositioning_objects_in_production(entity_assignment)
             self.saving_simulation_data.save_daily_topology(entity_assignment, self.production.max_coordinate)
             print("quadratic_assignment_problem wurde ausgeführt")
@@ -179,10 +211,7 @@ class EnvironmentSimulation:
 
         elif algorithm == 3:
             # Genetic algorithm
-            if self.env.now < 1000:
-                self.class_genetic_algorithm = GeneticAlgorithm(self.env, self.class_material_flow,
-                                                                self.class_positions_distance_matrix)
-            entity_assignment = self.class_genetic_algorithm.start_genetic_algorithm(start_time=self.env.now,
+            entity_assignment = self.class_genetic_algorithm.start_genetic_algorithm(start_time=start_time,
                                                                                      end_time=endtime)
             self.repositioning_objects.start_repositioning_objects_in_production(entity_assignment)
             self.saving_simulation_data.save_daily_topology(entity_assignment, self.production.max_coordinate)
@@ -195,11 +224,7 @@ class EnvironmentSimulation:
 
         elif algorithm == 4:
             # Force directed placement
-            if self.env.now < 1000:
-                self.class_forced_directed_placement = ForcedDirectedPlacement(self.env, self.production,
-                                                                               self.class_material_flow,
-                                                                               self.class_positions_distance_matrix)
-            entity_assignment = self.class_forced_directed_placement.start_fdp_algorithm(start_time=self.env.now,
+            entity_assignment = self.class_forced_directed_placement.start_fdp_algorithm(start_time=start_time,
                                                                                          end_time=endtime)
             self.repositioning_objects.start_repositioning_objects_in_production(entity_assignment)
             self.saving_simulation_data.save_daily_topology(entity_assignment, self.production.max_coordinate)
@@ -212,6 +237,32 @@ class EnvironmentSimulation:
 
         time_until_next_day = endtime - self.env.now + 10
 
+    def create_material_flow_of_columnar_trace(self, convert_json_data: ConvertJsonData) -> MaterialFlow | None:
+        """Material flows of the columnar trace of the basis run (None -> the basis run has no columnar trace)."""
+        columnar_trace_dict = {entity_type: convert_json_data.get_columnar_trace(entity_type) for entity_type in
+                               ["machine", "tr", "intermediate_store"]}
+        if None in columnar_trace_dict.values():
+            return None
+        return MaterialFlow.from_columnar_trace(
+            columnar_trace_dict["tr"], columnar_trace_dict["machine"].get_entity_identification_str_list(),
+            columnar_trace_dict["intermediate_store"].get_entity_identification_str_list())
+
+    def create_topology_manager_algorithm(self, algorithm: int):
+        """Objects of the topology manager method, created on the first day. The current assignment is needed by
+        every method (days without a topology change)."""
+        self.entity_assignment_current_status = EntityAssignmentCurrentStatus(self.production,
+                                                                              self.class_positions_distance_matrix)
+        if algorithm == 2 or algorithm == 5:
+            self.class_quadratic_assignment_problem = QuadraticAssignmentProblem(
+                self.class_material_flow, self.class_positions_distance_matrix, use_tabu_search=algorithm == 5)
+        elif algorithm == 3:
+            self.class_genetic_algorithm = GeneticAlgorithm(self.env, self.class_material_flow,
+                                                            self.class_positions_distance_matrix)
+        elif algorithm == 4:
+            self.class_forced_directed_placement = ForcedDirectedPlacement(self.env, self.production,
+                                                                           self.class_material_flow,
+                                                                           self.class_positions_distance_matrix)
+
     def start_simulation_visualisation_process(self):
         if self.service_starting_conditions.set_visualising_via_matplotlib() or self.service_starting_conditions.set_visualising_via_terminal() or self.service_starting_conditions.set_visualising_via_pygames():
             self.env.process(self.visualisation_simulation.visualize_layout())
@@ -7,13 +7,15 @@ from src.process_logic.machine.machine_execution import MachineExecution
 from src.process_logic.machine.machine_manager import MachineManager
 from src.production.production import Production
 from src.production.store_manager import StoreManager
+from src.simulation_environmnent.dispatch_signals import DispatchSignals
 from src.simulation_environmnent.simulation_control import SimulationControl
 
 
 class MachineSimulation:
     def __init__(self, env: simpy.Environment, production: Production, machine_manager: MachineManager,
                  machine_execution: MachineExecution, store_manager: StoreManager,
-                 saving_simulation_data: SavingSimulationData, simulation_control: SimulationControl):
+                 saving_simulation_data: SavingSimulationData, simulation_control: SimulationControl,
+                 dispatch_signals: DispatchSignals | None = None):
         self.env = env
         self.production = production
         self.machine_manager = machine_manager
@@ -21,11 +23,13 @@ class MachineSimulation:
         self.store_manager = store_manager
         self.saving_simulation_data = saving_simulation_data
         self.simulation_control = simulation_control
+        self.dispatch_signals = dispatch_signals  # None -> the dispatcher checks every machine every second
 
     def run_machine_process(self):
         while True:
             if self.simulation_control.stop_event is False and \
                     self.simulation_control.stop_production_processes is False:
+                dispatching_state = self.get_dispatching_state()
                 for machine in self.production.machine_list:
 
                     # set machine process status: idle
@@ -51,8 +55,25 @@ class MachineSimulation:
                         machine.working_status.working_on_status = True
                         self.env.process(self.producing_process(machine))
 
+                # event driven scheduling: sleep until a machine or wr has changed
+                if self.dispatch_signals is not None and dispatching_state == self.get_dispatching_state():
+                    yield self.dispatch_signals.wait("machine")
+                    continue
+
             yield self.env.timeout(1)
 
+    def get_dispatching_state(self) -> tuple | None:
+        """State of the machines, which is changed by the dispatcher (None -> polling every second)."""
+        if self.dispatch_signals is None:
+            return None
+        return self.dispatch_signals.get_state_of_entities(self.production.machine_list)
+
+    def wait_for_storage_change(self):
+        """Producing process: one second or (event driven scheduling) until an entity has changed."""
+        if self.dispatch_signals is None:
+            return self.env.timeout(1)
+        return self.dispatch_signals.wait("producing")
+
     def set_up_machine_process(self, machine: Machine):
         producing_item = machine.process_material_list[0].producing_material
 
@@ -71,6 +92,16 @@ class MachineSimulation:
             machine.working_status.working_on_status = False
             self.saving_simulation_data.save_entity_action(machine)
 
+    def set_producing_status(self, machine: Machine, process_status: MachineProcessStatus,
+                             storage_status: MachineStorageStatus):
+        """Only a changed status is saved (a saved change wakes the dispatchers with event driven scheduling)."""
+        if machine.working_status.process_status == process_status and \
+                machine.working_status.storage_status == storage_status:
+            return
+        machine.working_status.process_status = process_status
+        machine.working_status.storage_status = storage_status
+        self.saving_simulation_data.save_entity_action(machine)
+
     def producing_process(self, machine: Machine):
         required_material = machine.process_material_list[0].required_material
         producing_material = machine.process_material_list[0].producing_material
@@ -86,26 +117,35 @@ class MachineSimulation:
                         or self.store_manager.check_no_other_material_is_in_store(
                     machine.machine_storage.storage_after_process, producing_material) is False and \
                         machine.working_status.process_status != MachineProcessStatus.FINISHED_TO_PRODUCE:
-                    machine.working_status.process_status = MachineProcessStatus.PRODUCING_PAUSED
-                    machine.working_status.storage_status = MachineStorageStatus.OUTPUT_FULL
-                    self.saving_simulation_data.save_entity_action(machine)
+                    self.set_producing_status(machine, MachineProcessStatus.PRODUCING_PAUSED,
+                                              MachineStorageStatus.OUTPUT_FULL)
 
-                    yield self.env.timeout(1)
+                    if self.dispatch_signals is None:
+                        yield self.env.timeout(1)
 
                 # check if material is in input_store
                 elif self.machine_manager.check_required_material_in_storage_before_process(machine,
                                                                                             required_material) is False \
                         and machine.working_status.process_status != MachineProcessStatus.FINISHED_TO_PRODUCE:
-                    machine.working_status.process_status = MachineProcessStatus.PRODUCING_PAUSED
-                    machine.working_status.storage_status = MachineStorageStatus.INPUT_EMPTY
+                    self.set_producing_status(machine, MachineProcessStatus.PRODUCING_PAUSED,
+                                              MachineStorageStatus.INPUT_EMPTY)
 
-                    self.saving_simulation_data.save_entity_action(machine)
-                    yield self.env.timeout(1)
+                    if self.dispatch_signals is None:
+                        yield self.env.timeout(1)
 
                 elif machine.working_status.process_status != MachineProcessStatus.FINISHED_TO_PRODUCE:
-                    machine.working_status.process_status = MachineProcessStatus.READY_TO_PRODUCE
-                    machine.working_status.storage_status = MachineStorageStatus.STORAGES_READY_FOR_PRODUCTION
-                    self.saving_simulation_data.save_entity_action(machine)
+                    # start producing process (a producing machine isn't set back to ready to produce)
+                    if machine.working_status.working_robot_status == MachineWorkingRobotStatus.WR_PRESENT:
+                        self.set_producing_status(machine, MachineProcessStatus.PRODUCING_PRODUCT,
+                                                  MachineStorageStatus.STORAGES_READY_FOR_PRODUCTION)
+
+                        if machine.working_status.producing_item is False:
+                            machine.working_status.producing_item = True
+                            self.env.process(self.machine_execution.produce_one_item(machine, required_material,
+                                                                                     producing_material))
+                    else:
+                        self.set_producing_status(machine, MachineProcessStatus.READY_TO_PRODUCE,
+                                                  MachineStorageStatus.STORAGES_READY_FOR_PRODUCTION)
 
                 elif machine.working_status.process_status == MachineProcessStatus.FINISHED_TO_PRODUCE:
                     machine.working_status.working_on_status = False
@@ -118,15 +158,4 @@ class MachineSimulation:
 
                 else:
                     raise Exception(self.env.now)
-
-                # start producing process
-                if machine.working_status.process_status == MachineProcessStatus.READY_TO_PRODUCE and \
-                        machine.working_status.working_robot_status == MachineWorkingRobotStatus.WR_PRESENT:
-                    machine.working_status.process_status = MachineProcessStatus.PRODUCING_PRODUCT
-
-                    if machine.working_status.producing_item is False:
-                        machine.working_status.producing_item = True
-                        self.env.process(self.machine_execution.produce_one_item(machine, required_material,
-                                                                                 producing_material))
-                    self.saving_simulation_data.save_entity_action(machine)
-            yield self.env.timeout(1)
+            yield self.wait_for_storage_change()
@@ -18,9 +18,5 @@ class MonitoringSimulation:
 
         # continuous saving the simulation data
         while True:
-            self.saving_simulation_data.convert_simulating_machine_data_to_json()
-            self.saving_simulation_data.convert_simulating_tr_data_to_json()
-            self.saving_simulation_data.convert_simulating_wr_data_to_json()
-            self.saving_simulation_data.convert_simulating_sink_data_to_json()
-            self.saving_simulation_data.convert_simulating_intermediate_store_data_to_json()
+            self.saving_simulation_data.save_simulation_data()
             yield self.env.timeout(120)
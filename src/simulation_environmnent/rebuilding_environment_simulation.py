@@ -3,13 +3,7 @@ import time
 
 from src import SIMULATION_OUTPUT_DATA
 from src.monitoring.SavingSimulationData import SavingSimulationData
-from src.monitoring.data_analysis.convert_json_data import ConvertJsonData
-from src.monitoring.data_analysis.creating_intermediate_store_during_simulation_dict import \
-    CreatingIntermediateStoreDuringSimulationDict
-from src.monitoring.data_analysis.creating_machine_during_simulation_dict import CreatingMachineDuringSimulationDict
-from src.monitoring.data_analysis.creating_sink_during_simulation_dict import CreatingSinkDuringSimulationDict
-from src.monitoring.data_analysis.creating_tr_during_simulation_dict import CreatingTrDuringSimulationDict
-from src.monitoring.data_analysis.creating_wr_during_simulation_dict import CreatingWrDuringSimulationDict
+from src.monitoring.data_analysis.trace_repository import get_trace_repository
 from src.process_logic.machine.machine_execution import MachineExecution
 from src.process_logic.machine.machine_manager import MachineManager
 from src.process_logic.manufacturing_plan import ManufacturingPlan
@@ -20,6 +14,7 @@ from src.process_logic.working_robot_order_manager import WorkingRobotOrderManag
 from src.production.production import Production
 from src.production.store_manager import StoreManager
 from src.provide_input_data.order_service import OrderService
+from src.provide_input_data.simulation_config import SimulationConfig
 from src.provide_input_data.starting_condition_service import StartingConditionsService
 from src.rebuild_simulation.entities_specifc_simulation_time import EntitiesSpecificSimulationTime
 from src.simulation_environmnent.machine_simulation import MachineSimulation
@@ -31,11 +26,11 @@ from src.simulation_environmnent.wr_simulation import WrSimulation
 
 
 class RebuildingEnvironmentSimulation:
-    def __init__(self, order_service: OrderService, control_time):
+    def __init__(self, order_service: OrderService, control_time, simulation_config: SimulationConfig | None = None):
         self.simulation_control = SimulationControl(False, False)
 
         self.env = simpy.Environment()
-        self.service_starting_conditions = StartingConditionsService()
+        self.service_starting_conditions = StartingConditionsService(simulation_config)
         self.production = Production(self.env, self.service_starting_conditions)
         self.store_manager = StoreManager(self.env)
         self.path_finding = PathFinding(self.production)
@@ -72,12 +67,14 @@ class RebuildingEnvironmentSimulation:
         self.production.create_production()
         self.control_time = control_time
 
-        self.convert = ConvertJsonData(SIMULATION_OUTPUT_DATA)
-        self.creating_machine_during_simulation_dict = CreatingMachineDuringSimulationDict(self.convert)
-        self.creating_tr_during_simulation_dict = CreatingTrDuringSimulationDict(self.convert)
-        self.creating_wr_during_simulation_dict = CreatingWrDuringSimulationDict(self.convert)
-        self.creating_sink_during_simulation_dict = CreatingSinkDuringSimulationDict(self.convert)
-        self.creating_intermediate_store_during_simulation_dict = CreatingIntermediateStoreDuringSimulationDict(self.convert)
+        trace_repository = get_trace_repository(SIMULATION_OUTPUT_DATA)
+        self.convert = trace_repository.get_convert_json_data()
+        self.creating_machine_during_simulation_dict = trace_repository.get_creating_machine_during_simulation_dict()
+        self.creating_tr_during_simulation_dict = trace_repository.get_creating_tr_during_simulation_dict()
+        self.creating_wr_during_simulation_dict = trace_repository.get_creating_wr_during_simulation_dict()
+        self.creating_sink_during_simulation_dict = trace_repository.get_creating_sink_during_simulation_dict()
+        self.creating_intermediate_store_during_simulation_dict = \
+            trace_repository.get_creating_intermediate_store_during_simulation_dict()
 
         self.entities_status = EntitiesSpecificSimulationTime(self.env, self.control_time, self.production,
                                                               self.creating_machine_during_simulation_dict,
@@ -98,6 +95,7 @@ class RebuildingEnvironmentSimulation:
 
     def run_simulation(self, until: int):
         self.env.run(until=until)
+        self.saving_simulation_data.close_trace_files()
 
     def initialise_simulation_start(self):
 
@@ -8,17 +8,20 @@ from src.entity.transport_robot.transport_robot import TransportRobot
 from src.monitoring.SavingSimulationData import SavingSimulationData
 from src.process_logic.transport_robot.tr_executing_order import TrExecutingOrder
 from src.process_logic.transport_robot.tr_order_manager import TrOrderManager
+from src.simulation_environmnent.dispatch_signals import DispatchSignals
 from src.simulation_environmnent.simulation_control import SimulationControl
 
 
 class TrSimulation:
     def __init__(self, env: simpy.Environment, tr_order_manager: TrOrderManager, tr_executing_order: TrExecutingOrder,
-                 saving_simulation_data: SavingSimulationData, simulation_control: SimulationControl):
+                 saving_simulation_data: SavingSimulationData, simulation_control: SimulationControl,
+                 dispatch_signals: DispatchSignals | None = None):
         self.env = env
         self.tr_order_manager = tr_order_manager
         self.tr_executing_order = tr_executing_order
         self.saving_simulation_data = saving_simulation_data
         self.simulation_control = simulation_control
+        self.dispatch_signals = dispatch_signals  # None -> the dispatcher checks every tr every second
 
         self.control_value = 1
 
@@ -26,6 +29,7 @@ class TrSimulation:
         while True:
             if self.simulation_control.stop_event is False and \
                     self.simulation_control.stop_production_processes is False:
+                dispatching_state = self.get_dispatching_state()
 
                 self.tr_order_manager.create_transport_request_list_from_machines()
                 self.tr_order_manager.every_idle_tr_get_order()
@@ -78,8 +82,28 @@ class TrSimulation:
                             if self.tr_executing_order.start__moving_to_waiting__process_for_tr(tr):
                                 self.env.process(self.tr_drive_to_destination_process(tr))
 
+                # event driven scheduling: sleep until a tr, machine or store has changed
+                if self.dispatch_signals is not None and dispatching_state == self.get_dispatching_state():
+                    yield self.dispatch_signals.wait("tr", self.get_time_until_next_waiting_error_time())
+                    continue
+
             yield self.env.timeout(1)
 
+    def get_dispatching_state(self) -> tuple | None:
+        """State of the tr and machines, which is changed by the dispatcher (None -> polling every second)."""
+        if self.dispatch_signals is None:
+            return None
+        return (self.dispatch_signals.get_state_of_entities(self.tr_order_manager.tr_list),
+                self.dispatch_signals.get_state_of_entities(self.tr_order_manager.machine_list))
+
+    def get_time_until_next_waiting_error_time(self) -> float | None:
+        waiting_error_time_list = [tr.working_status.waiting_error_time for tr in self.tr_order_manager.tr_list if
+                                   tr.working_status.waiting_error_time is not None and
+                                   tr.working_status.waiting_error_time > self.env.now]
+        if len(waiting_error_time_list) == 0:
+            return None
+        return min(waiting_error_time_list) - self.env.now
+
     def tr_drive_to_destination_process(self, tr: TransportRobot):
         driving_speed = self.tr_order_manager.get_driving_speed_per_cell()
 
@@ -87,8 +111,10 @@ class TrSimulation:
             if self.simulation_control.stop_event is False and \
                     self.simulation_control.stop_production_processes is False:
                 self.saving_simulation_data.save_entity_action(tr)
-                yield self.env.timeout(1 / driving_speed)
-                driving_value = self.tr_executing_order.drive_tr_one_step_trough_production(tr)
+                # macro step movement: one event for the whole straight segment of the route
+                number_of_steps, claimed_cell_list = self.tr_executing_order.claim_route_segment_for_tr(tr)
+                yield self.env.timeout(max(1, number_of_steps) / driving_speed)
+                driving_value = self.tr_executing_order.drive_tr_route_segment(tr, number_of_steps, claimed_cell_list)
 
                 if driving_value is True:
                     tr.working_status.waiting_error_time = self.env.now + 60
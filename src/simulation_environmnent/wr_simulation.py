@@ -4,21 +4,25 @@ from src.constant.constant import WorkingRobotStatus, MachineWorkingRobotStatus
 from src.entity.working_robot.working_robot import WorkingRobot
 from src.monitoring.SavingSimulationData import SavingSimulationData
 from src.process_logic.working_robot_order_manager import WorkingRobotOrderManager
+from src.simulation_environmnent.dispatch_signals import DispatchSignals
 from src.simulation_environmnent.simulation_control import SimulationControl
 
 
 class WrSimulation:
     def __init__(self, env: simpy.Environment, working_robot_order_manager: WorkingRobotOrderManager,
-                 saving_simulation_data: SavingSimulationData, simulation_control: SimulationControl):
+                 saving_simulation_data: SavingSimulationData, simulation_control: SimulationControl,
+                 dispatch_signals: DispatchSignals | None = None):
         self.env = env
         self.working_robot_order_manager = working_robot_order_manager
         self.saving_simulation_data = saving_simulation_data
         self.simulation_control = simulation_control
+        self.dispatch_signals = dispatch_signals  # None -> the dispatcher checks every wr every second
 
     def start_every_wr_process(self):
         while True:
             if self.simulation_control.stop_event is False and \
                     self.simulation_control.stop_production_processes is False:
+                dispatching_state = self.get_dispatching_state()
 
                 self.working_robot_order_manager.sort_process_order_list_for_wr()
                 self.working_robot_order_manager.every_idle_wr_get_order()
@@ -64,17 +68,35 @@ class WrSimulation:
                     if wr.working_status.status == WorkingRobotStatus.WAITING_IN_MACHINE_TO_EXIT and \
                             wr.working_status.working_on_status is False:
                         self.env.process(self.wr_exit_machine_process(wr))
-                yield self.env.timeout(1)
+
+                # event driven scheduling: sleep until a wr or machine has changed
+                if self.dispatch_signals is not None and dispatching_state == self.get_dispatching_state():
+                    yield self.dispatch_signals.wait("wr")
+                else:
+                    yield self.env.timeout(1)
             else:
                 yield self.env.timeout(1)
 
+    def get_dispatching_state(self) -> tuple | None:
+        """State of the wr and machines, which is changed by the dispatcher (None -> polling every second)."""
+        if self.dispatch_signals is None:
+            return None
+        return (self.dispatch_signals.get_state_of_entities(self.working_robot_order_manager.wr_list),
+                self.dispatch_signals.get_state_of_entities(
+                    self.working_robot_order_manager.manufacturing_plan.production.machine_list))
+
     def drive_wr_to_destination_process(self, wr: WorkingRobot):
         driving_speed = self.working_robot_order_manager.get_driving_speed_per_cell()
 
         while True:
             if self.simulation_control.stop_event is False and \
                     self.simulation_control.stop_production_processes is False:
-                driving_bool = self.working_robot_order_manager.drive_wr_one_step_trough_production(wr)
+                # macro step movement: one event for the whole straight segment of the route
+                number_of_steps, claimed_cell_list = self.working_robot_order_manager.claim_route_segment_for_wr(wr)
+                if number_of_steps > 1:
+                    yield self.env.timeout((number_of_steps - 1) / driving_speed)
+                driving_bool = self.working_robot_order_manager.drive_wr_route_segment(wr, number_of_steps,
+                                                                                      claimed_cell_list)
                 if driving_bool is True:
                     if wr.working_status.status == WorkingRobotStatus.MOVING_TO_MACHINE:
                         wr.working_status.status = WorkingRobotStatus.WAITING_IN_FRONT_OF_MACHINE
@@ -1,13 +1,8 @@
 from src import SIMULATION_OUTPUT_DATA
-from src.monitoring.data_analysis.convert_json_data import ConvertJsonData
-from src.monitoring.data_analysis.creating_intermediate_store_during_simulation_dict import \
-    CreatingIntermediateStoreDuringSimulationDict
-from src.monitoring.data_analysis.creating_machine_during_simulation_dict import CreatingMachineDuringSimulationDict
-from src.monitoring.data_analysis.creating_tr_during_simulation_dict import CreatingTrDuringSimulationDict
-from src.monitoring.data_analysis.creating_wr_during_simulation_dict import CreatingWrDuringSimulationDict
 from src.monitoring.data_analysis.machine_data.machine_processing_time import MachineProcessingTime
 from src.monitoring.data_analysis.machine_data.machine_workload import MachineWorkload
 from src.monitoring.data_analysis.product_throughput import ProductThroughput
+from src.monitoring.data_analysis.trace_repository import get_trace_repository
 from src.monitoring.data_analysis.transport_data.material_flow import MaterialFlow
 from src.monitoring.data_analysis.transport_data.material_flow_heatmap import MaterialFlowHeatmap
 from src.monitoring.data_analysis.transport_data.product_transporting_time import ProductTransportingTime
@@ -17,6 +12,7 @@ from src.monitoring.data_analysis.wr_data.wr_workload import WrWorkload
 from src.monitoring.deleting_data import DeletingData
 from src.monitoring.simulation_data_saver import SimulationDataSaver
 from src.provide_input_data.order_service import OrderService
+from src.provide_input_data.simulation_config import SimulationConfig
 from src.simulation_environmnent.environment_simulation import EnvironmentSimulation
 
 
@@ -27,9 +23,12 @@ class SimulationStarter:
         self.simulation_data_saver = SimulationDataSaver()
         self.order_service = OrderService()
 
-    def start_simulation(self):
+    def start_simulation(self, visualising: bool = True):
         # start simulation
-        self.environment_simulation = EnvironmentSimulation(self.order_service)
+        simulation_config = SimulationConfig.from_resources()
+        if visualising is False:
+            simulation_config = simulation_config.without_visualising()
+        self.environment_simulation = EnvironmentSimulation(self.order_service, simulation_config)
         self.environment_simulation.initialise_simulation_start()
         self.environment_simulation.run_simulation()
 
@@ -39,10 +38,14 @@ class SimulationStarter:
         deleting_data = DeletingData()
         deleting_data.delete_analysis_data()
 
-        convert = ConvertJsonData(SIMULATION_OUTPUT_DATA)
+        trace_repository = get_trace_repository(SIMULATION_OUTPUT_DATA)
+        convert = trace_repository.get_convert_json_data()
+        # columns of the entity actions (simulation with columnar_trace(y/n)), used instead of the snapshots by the
+        # material flow and the workloads (None -> no columnar trace)
+        columnar_trace_dict = {entity_type: convert.get_columnar_trace(entity_type) for entity_type in
+                               ["machine", "tr", "wr", "intermediate_store"]}
         visualize_product_material_throughput = VisualizeProductionMaterialThroughput(convert)
         product_throughput = ProductThroughput(convert)
-        creating_intermediate_store_during_simulation_dict = CreatingIntermediateStoreDuringSimulationDict(convert)
 
         # Analyse Throughput of Material in Production/ Machines
         visualize_product_material_throughput.plot_and_save_for_all_product_groups()
@@ -50,13 +53,20 @@ class SimulationStarter:
         product_throughput.calculate_throughput_for_all_groups()
 
         # Analyse Machine Processing_time
-        creating_machine_during_simulation_dict = CreatingMachineDuringSimulationDict(convert)
+        creating_machine_during_simulation_dict = trace_repository.get_creating_machine_during_simulation_dict()
         machine_processing_time = MachineProcessingTime(creating_machine_during_simulation_dict)
 
         # Analyse Materialflow in a matrix
-        creating_tr_during_simulation_dict = CreatingTrDuringSimulationDict(convert)
-        material_flow = MaterialFlow(creating_tr_during_simulation_dict, creating_machine_during_simulation_dict,
-                                     creating_intermediate_store_during_simulation_dict)
+        creating_tr_during_simulation_dict = trace_repository.get_creating_tr_during_simulation_dict()
+        if None not in columnar_trace_dict.values():
+            material_flow = MaterialFlow.from_columnar_trace(
+                columnar_trace_dict["tr"], columnar_trace_dict["machine"].get_entity_identification_str_list(),
+                columnar_trace_dict["intermediate_store"].get_entity_identification_str_list())
+        else:
+            creating_intermediate_store_during_simulation_dict = \
+                trace_repository.get_creating_intermediate_store_during_simulation_dict()
+            material_flow = MaterialFlow(creating_tr_during_simulation_dict, creating_machine_during_simulation_dict,
+                                         creating_intermediate_store_during_simulation_dict)
         material_flow.create_material_flow_matrix()
 
         # Analyse Materialflow with a heatmap
@@ -64,18 +74,21 @@ class SimulationStarter:
         material_flow_heatmap.plot()
 
         # Analyse Workload of TR
-        tr_workload = TrWorkload(creating_tr_during_simulation_dict)
+        tr_workload = TrWorkload(creating_tr_during_simulation_dict, columnar_trace=columnar_trace_dict["tr"])
         tr_workload.save_workload_statistics()
         product_transporting_time = ProductTransportingTime(creating_tr_during_simulation_dict)
         product_transporting_time.calculate_transporting_time()
 
         # Analyse Workload of WR
-        creating_wr_during_simulation_dict = CreatingWrDuringSimulationDict(convert)
-        wr_workload = WrWorkload(creating_wr_during_simulation_dict)
+        if columnar_trace_dict["wr"] is not None:
+            wr_workload = WrWorkload(None, columnar_trace=columnar_trace_dict["wr"])
+        else:
+            wr_workload = WrWorkload(trace_repository.get_creating_wr_during_simulation_dict())
         wr_workload.save_workload_statistics()
 
         # Analyse Workload of Machine
-        machine_workload = MachineWorkload(creating_machine_during_simulation_dict)
+        machine_workload = MachineWorkload(creating_machine_during_simulation_dict,
+                                           columnar_trace=columnar_trace_dict["machine"])
         machine_workload.save_workload_statistics()
 
     def secure_simulation_data(self, experiment_number: int):
@@ -10,7 +10,7 @@ from src import RESOURCES, ANALYSIS_SOLUTION
 from src.simulation_starter import SimulationStarter
 
 days_dict = {"3 Tage": "3", "2 Tage": "2", "1 Tag": "1"}
-algorithmus_dict = {"Kein Algorithmus": 1, "QAPFA": 2, "GA": 3, "FDP": 4}
+algorithmus_dict = {"Kein Algorithmus": 1, "QAPFA": 2, "GA": 3, "FDP": 4, "QAP Tabu Search": 5}
 visualization_dict = {0: "n", 1: "y"}
 
 
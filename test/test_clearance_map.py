@@ -0,0 +1,61 @@
+import random
+
+import numpy as np
+
+from src.entity.source import Source
+from src.production.base.cell import Cell
+from src.production.base.coordinates import Coordinates
+from src.production.base.occupancy_grid import OccupancyGrid
+
+
+def test_get_movement_area_map__cells_changed__equal_to_new_calculation():
+    # given
+    random.seed(3)
+    occupancy_grid = OccupancyGrid(Coordinates(20, 15))
+    obstacle = Source(0, 0, 0)
+    cell_list = [Cell(Coordinates(x, y), None, occupancy_grid) for y in range(0, 15) for x in range(0, 20)]
+    occupancy_grid.clearance_map.get_movement_area_map(3, 4)
+
+    # when
+    for _ in range(0, 200):
+        cell = random.choice(cell_list)
+        cell.placed_entity = obstacle if cell.placed_entity is None else None
+        if random.random() < 0.2:
+            occupancy_grid.clearance_map.get_movement_area_map(3, 4)
+    movement_area_map = occupancy_grid.clearance_map.get_movement_area_map(3, 4)
+
+    # then
+    new_occupancy_grid = OccupancyGrid(Coordinates(20, 15))
+    for cell in cell_list:
+        Cell(cell.cell_coordinates, cell.placed_entity, new_occupancy_grid)
+    assert np.array_equal(movement_area_map, new_occupancy_grid.clearance_map.get_movement_area_map(3, 4))
+
+
+def test_get_movement_area_map__obstacle__anchor_cells_around_obstacle_not_free():
+    # given
+    occupancy_grid = OccupancyGrid(Coordinates(10, 10))
+    Cell(Coordinates(5, 5), Source(0, 0, 0), occupancy_grid)
+
+    # when
+    movement_area_map = occupancy_grid.clearance_map.get_movement_area_map(2, 2)
+
+    # then
+    blocked_anchor_cells = {(int(x), int(y)) for y, x in zip(*np.nonzero(~movement_area_map))}
+    assert blocked_anchor_cells == {(x, y) for x in (4, 5) for y in (4, 5, 6, 7)}
+
+
+def test_get_movement_area_map__one_cell_changed__summed_area_table_only_around_the_cell(mocker):
+    # given
+    occupancy_grid = OccupancyGrid(Coordinates(300, 300))
+    cell = Cell(Coordinates(150, 150), None, occupancy_grid)
+    occupancy_grid.clearance_map.get_movement_area_map(3, 4)
+    summed_area_table_spy = mocker.spy(occupancy_grid, "get_summed_area_table")
+
+    # when
+    cell.placed_entity = Source(0, 0, 0)
+    movement_area_map = occupancy_grid.clearance_map.get_movement_area_map(3, 4)
+
+    # then
+    assert summed_area_table_spy.call_count == 1
+    assert summed_area_table_spy.spy_return.shape[0] * summed_area_table_spy.spy_return.shape[1] < 100
+    assert not movement_area_map[150, 150] and movement_area_map[150, 151]
@@ -0,0 +1,91 @@
+import numpy as np
+
+from src.monitoring.columnar_trace import ColumnarTraceWriter, ColumnarTrace, find_columnar_trace, \
+    PRODUCT_COLUMN_DTYPE_DICT
+from src.monitoring.data_analysis.convert_json_data import ConvertJsonData
+
+
+def create_tr_data_entry(timestamp: float, identification_str: str, status: str, quantity: int) -> dict:
+    return {"timestamp": timestamp,
+            "entities": [{"x": timestamp, "y": 5, "entity_type": "TransportRobot", "entity_id": None,
+                          "entity_data": {"identification_str": identification_str,
+                                          "working_status": {"status": status},
+                                          "transport_order": {"pick up station": "Ma: 1",
+                                                              "unload destination": "Ma: 2",
+                                                              "quantity": quantity}}}]}
+
+
+def test_flush__two_flushes__every_row_readable_as_columns(tmp_path):
+    # given
+    columnar_trace_writer = ColumnarTraceWriter(tmp_path, "tr")
+    columnar_trace_writer.add_data_entry(create_tr_data_entry(0, "TR: 1", "IDLE", 0))
+    columnar_trace_writer.add_data_entry(create_tr_data_entry(1, "TR: 2", "IDLE", 0))
+
+    # when
+    columnar_trace_writer.flush()
+    columnar_trace_writer.add_data_entry(create_tr_data_entry(4, "TR: 1", "LOADING", 10))
+    columnar_trace_writer.close()
+    columnar_trace = ColumnarTrace(tmp_path, "tr")
+
+    # then
+    assert columnar_trace.number_of_rows == 3
+    assert columnar_trace.get_column("timestamp").tolist() == [0, 1, 4]
+    assert columnar_trace.get_entity_identification_str_list() == ["TR: 1", "TR: 2"]
+    assert columnar_trace.get_strings("unload_station", columnar_trace.get_column("unload_station")) == \
+           ["Ma: 2"] * 3
+
+
+def test_get_entity_columns__entity_with_two_actions__rows_of_the_entity_only(tmp_path):
+    # given
+    columnar_trace_writer = ColumnarTraceWriter(tmp_path, "tr")
+    for data_entry in [create_tr_data_entry(0, "TR: 1", "IDLE", 0), create_tr_data_entry(1, "TR: 2", "IDLE", 0),
+                       create_tr_data_entry(4, "TR: 1", "LOADING", 10)]:
+        columnar_trace_writer.add_data_entry(data_entry)
+    columnar_trace_writer.close()
+
+    # when
+    entity_columns = ColumnarTrace(tmp_path, "tr").get_entity_columns("TR: 1")
+
+    # then
+    assert entity_columns["timestamp"].tolist() == [0, 4]
+    assert entity_columns["quantity"].tolist() == [0, 10]
+    assert np.array_equal(entity_columns["status"], [0, 1])
+
+
+def test_find_columnar_trace__nothing_saved__none(tmp_path):
+    # when
+    columnar_trace = find_columnar_trace(tmp_path, "wr")
+
+    # then
+    assert columnar_trace is None
+
+
+def test_get_rows_by_entity__actions_of_two_entities__rows_of_every_entity_sorted_by_timestamp(tmp_path):
+    # given
+    columnar_trace_writer = ColumnarTraceWriter(tmp_path, "tr")
+    for data_entry in [create_tr_data_entry(0, "TR: 1", "IDLE", 0), create_tr_data_entry(1, "TR: 2", "IDLE", 0),
+                       create_tr_data_entry(4, "TR: 1", "LOADING", 10)]:
+        columnar_trace_writer.add_data_entry(data_entry)
+    columnar_trace_writer.close()
+
+    # when
+    rows, offsets = ColumnarTrace(tmp_path, "tr").get_rows_by_entity()
+
+    # then
+    assert rows.tolist() == [0, 2, 1]
+    assert offsets.tolist() == [0, 2, 3]
+
+
+def test_get_products_df__columnar_product_trace__products_df_of_the_columns(tmp_path):
+    # given
+    columnar_trace_writer = ColumnarTraceWriter(tmp_path, "data_goods_entering_production", PRODUCT_COLUMN_DTYPE_DICT)
+    columnar_trace_writer.add_product_event(0, "Blech", 10)
+    columnar_trace_writer.add_product_event(60, "Rohr", 5)
+    columnar_trace_writer.close()
+
+    # when
+    products_df = ConvertJsonData(tmp_path).goods_receipt_production_df
+
+    # then
+    assert products_df.to_dict("records") == [{"Time": 0, "Product Group": "Blech", "Quantity": 10},
+                                              {"Time": 60, "Product Group": "Rohr", "Quantity": 5}]
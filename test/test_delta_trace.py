@@ -0,0 +1,45 @@
+import copy
+import json
+
+from src.monitoring.delta_trace import DeltaTraceEncoder, DeltaTraceDecoder
+
+
+def create_tr_data_entry(timestamp: float, x: int, status: str, loaded_products: list) -> dict:
+    return {"timestamp": timestamp,
+            "entities": [{"x": x, "y": 5, "entity_type": "TransportRobot", "entity_id": None,
+                          "entity_data": {"identification_str": "TR: 1",
+                                          "working_status": {"status": status, "waiting_time": 0},
+                                          "material_store": {"Loaded Products": loaded_products},
+                                          "transport_order": {}}}]}
+
+
+def test_encode_decode__changing_tr__complete_snapshots_rebuilt():
+    # given
+    data_entries = [create_tr_data_entry(0, 1, "IDLE", []),
+                    create_tr_data_entry(1, 2, "MOVING_TO_PICKUP", []),
+                    create_tr_data_entry(2, 2, "LOADING", [{"id": "ONE", "quantity": 10}])]
+    delta_trace_encoder = DeltaTraceEncoder()
+
+    # when
+    records = [delta_trace_encoder.encode(copy.deepcopy(data_entry)) for data_entry in data_entries]
+    decoded_entries = DeltaTraceDecoder().decode_records(json.loads(json.dumps(records)))
+
+    # then
+    assert "keyframe" in records[0]
+    assert sorted(path for path, _ in records[1]["set"]) == [["entity_data", "working_status", "status"], ["x"]]
+    assert decoded_entries == data_entries
+
+
+def test_encode__unchanged_entity__skipped_and_saved_at_the_end_as_empty_change():
+    # given
+    delta_trace_encoder = DeltaTraceEncoder()
+    delta_trace_encoder.encode(create_tr_data_entry(0, 1, "IDLE", []))
+
+    # when
+    skipped_records = [delta_trace_encoder.encode(create_tr_data_entry(timestamp, 1, "IDLE", []))
+                       for timestamp in range(1, 100)]
+    closing_records = delta_trace_encoder.get_closing_records()
+
+    # then
+    assert skipped_records == [None] * 99
+    assert closing_records == [{"timestamp": 99, "key": "TransportRobot:TR: 1", "set": []}]
@@ -0,0 +1,118 @@
+import os
+import subprocess
+import sys
+
+import simpy
+
+from src import ROOT
+from src.simulation_environmnent.dispatch_signals import DispatchSignals
+
+# runs a simulation with event driven scheduling step by step and prints the simulation time at the end
+EVENT_DRIVEN_SIMULATION_SCRIPT = """
+import random
+import sys
+from dataclasses import replace
+
+from src import OUTPUT_DIRECTORIES
+from src.provide_input_data.order_service import OrderService
+from src.provide_input_data.simulation_config import SimulationConfig
+from src.simulation_environmnent.environment_simulation import EnvironmentSimulation
+
+random.seed(0)
+for directory in OUTPUT_DIRECTORIES:
+    directory.mkdir(parents=True, exist_ok=True)
+simulation_config = replace(SimulationConfig.from_resources().without_visualising(), event_driven_scheduling=True,
+                            topology_manager_method=1)
+environment_simulation = EnvironmentSimulation(OrderService(), simulation_config)
+environment_simulation.initialise_simulation_start()
+simulation_time, max_steps = float(sys.argv[1]), int(sys.argv[2])
+for _ in range(max_steps):
+    if environment_simulation.env.peek() > simulation_time:
+        break
+    environment_simulation.env.step()
+print(f"simulation_time={environment_simulation.env.now}")
+"""
+
+
+def test_notify__waiting_dispatcher__woken_up_at_time_of_signal():
+    # given
+    env = simpy.Environment()
+    dispatch_signals = DispatchSignals(env)
+    wake_up_time_list = []
+
+    def dispatcher():
+        yield dispatch_signals.wait("tr")
+        wake_up_time_list.append(env.now)
+
+    def signal_after_five_seconds():
+        yield env.timeout(5)
+        dispatch_signals.notify("tr")
+
+    env.process(dispatcher())
+    env.process(signal_after_five_seconds())
+
+    # when
+    env.run(until=100)
+
+    # then
+    assert wake_up_time_list == [5]
+    assert dispatch_signals.number_of_signals == 1
+
+
+def test_wait__no_signal__woken_up_after_max_waiting_time():
+    # given
+    env = simpy.Environment()
+    dispatch_signals = DispatchSignals(env)
+    wake_up_time_list = []
+
+    def dispatcher():
+        yield dispatch_signals.wait("wr", 10)
+        wake_up_time_list.append(env.now)
+        yield dispatch_signals.wait("wr")
+        wake_up_time_list.append(env.now)
+
+    env.process(dispatcher())
+
+    # when
+    env.run(until=1000)
+
+    # then
+    assert wake_up_time_list == [10, 10 + DispatchSignals.max_idle_time]
+    assert dispatch_signals.number_of_signals == 0
+
+
+def test_notify__process_notified_itself__not_woken_up_in_the_same_time_step():
+    # given
+    env = simpy.Environment()
+    dispatch_signals = DispatchSignals(env)
+    wake_up_time_list = []
+
+    def process_reacting_to_changes(name):
+        while len(wake_up_time_list) < 10:
+            dispatch_signals.notify("producing")
+            yield dispatch_signals.wait("producing")
+            wake_up_time_list.append((name, env.now))
+
+    env.process(process_reacting_to_changes("a"))
+    env.process(process_reacting_to_changes("b"))
+
+    # when
+    env.run(until=100)
+
+    # then
+    assert wake_up_time_list[:4] == [("a", 1), ("b", 1), ("a", 2), ("b", 2)]
+
+
+def test_environment_simulation__event_driven_scheduling__simulation_time_goes_on(tmp_path):
+    # given
+    env = os.environ.copy()
+    env["SIMULATION_OUTPUT_ROOT"] = str(tmp_path)
+
+    # when
+    completed_process = subprocess.run([sys.executable, "-c", EVENT_DRIVEN_SIMULATION_SCRIPT, "600", "200000"],
+                                       cwd=ROOT, env=env, capture_output=True, text=True, timeout=600)
+
+    # then
+    assert completed_process.returncode == 0, completed_process.stderr
+    simulation_time = float(completed_process.stdout.strip().splitlines()[-1].split("=")[1])
+    assert simulation_time >= 600
@@ -142,6 +142,37 @@ def test_move_entity_one_step__move_out_of_bounds__moved_no_step(mocker, start_c
     assert get_cell(production_layout, start_coordinate).placed_entity is moving_working_robot
 
 
+def test_claim_route_segment__obstacle_after_straight_run__segment_ends_before_obstacle(mocker):
+    # given
+    production_layout = create_testing_layout()
+    obstacle_entity = Source(0, 0, 0)
+
+    mock_production: Production = mocker.Mock()
+    entity_move_service = EntityMoveService(mock_production)
+
+    mock_wr_working_status = mocker.Mock()
+    moving_working_robot = WorkingRobot(1, Coordinates(1, 1), 1, 1, mock_wr_working_status)
+
+    start_cell = Cell(Coordinates(2, 5), moving_working_robot)
+    production_layout = place_cell(production_layout, start_cell)
+    production_layout = place_cell(production_layout, Cell(Coordinates(6, 5), obstacle_entity))
+
+    mock_production.entities_located = {moving_working_robot.identification_str: [start_cell]}
+    mock_production.get_horizontal_edges_of_coordinates.return_value = (2, 2)
+    mock_production.get_vertical_edges_of_coordinates.return_value = (5, 5)
+    mock_production.get_cell.side_effect = lambda coordinates: get_cell(production_layout, coordinates)
+    mock_production.coordinates_in_layout.return_value = True
+
+    # when
+    number_of_steps, claimed_cell_list = entity_move_service.claim_route_segment(
+        moving_working_robot, start_cell, ["3:5", "4:5", "5:5", "6:5", "7:5"])
+
+    # then
+    assert number_of_steps == 3
+    assert [cell.cell_id for cell in claimed_cell_list] == ["3:5", "4:5", "5:5"]
+    assert get_cell(production_layout, Coordinates(5, 5)).placed_entity is moving_working_robot
+
+
 def create_testing_layout() -> list[list[Cell]]:
     production_layout = []
     for y in reversed(range(0, 10)):
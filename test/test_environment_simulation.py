@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+
+from src.simulation_environmnent.environment_simulation import EnvironmentSimulation
+from src.simulation_environmnent.rebuilding_environment_simulation import RebuildingEnvironmentSimulation
+
+
+def create_environment_simulation(mocker, now: int) -> EnvironmentSimulation:
+    """Online KPIs and the QAP (topology manager method 2), every object of the topology manager is a mock."""
+    mocker.patch("src.simulation_environmnent.environment_simulation.PositionsDistanceMatrix")
+    mocker.patch("src.simulation_environmnent.environment_simulation.RepositioningObjects")
+    environment_simulation = EnvironmentSimulation.__new__(EnvironmentSimulation)
+    environment_simulation.env = SimpleNamespace(now=now)
+    environment_simulation.production = mocker.Mock(production_layout=[])
+    environment_simulation.production.service_starting_conditions.get_topology_manager_method.return_value = 2
+    environment_simulation.online_kpi_accumulator = mocker.Mock()
+    environment_simulation.saving_simulation_data = mocker.Mock()
+    environment_simulation.repositioning_objects = mocker.Mock()
+    environment_simulation.entity_assignment_current_status = mocker.Mock()
+    environment_simulation.class_quadratic_assignment_problem = mocker.Mock()
+    mocker.patch.object(environment_simulation, "create_topology_manager_algorithm")
+    return environment_simulation
+
+
+def test_topology_manager__online_kpi_on_the_first_day__starting_layout_kept(mocker):
+    # given
+    environment_simulation = create_environment_simulation(mocker, 0)
+
+    # when
+    environment_simulation.topology_manager()
+
+    # then
+    environment_simulation.class_quadratic_assignment_problem.start_quadratic_assignment_problem.assert_not_called()
+    environment_simulation.entity_assignment_current_status.get_entity_assignment.assert_called_once()
+
+
+def test_topology_manager__online_kpi_on_the_second_day__material_flows_of_the_first_day(mocker):
+    # given
+    environment_simulation = create_environment_simulation(mocker, 28800)
+
+    # when
+    environment_simulation.topology_manager()
+
+    # then
+    environment_simulation.class_quadratic_assignment_problem.start_quadratic_assignment_problem.\
+        assert_called_once_with(start_time=0, end_time=28800)
+    environment_simulation.repositioning_objects.start_repositioning_objects_in_production.assert_called_once()
+
+
+def test_run_simulation__rebuilding_simulation_finished__trace_files_closed(mocker):
+    # given
+    rebuilding_environment_simulation = RebuildingEnvironmentSimulation.__new__(RebuildingEnvironmentSimulation)
+    rebuilding_environment_simulation.env = mocker.Mock()
+    rebuilding_environment_simulation.saving_simulation_data = mocker.Mock()
+
+    # when
+    rebuilding_environment_simulation.run_simulation(until=100)
+
+    # then
+    rebuilding_environment_simulation.env.run.assert_called_once_with(until=100)
+    rebuilding_environment_simulation.saving_simulation_data.close_trace_files.assert_called_once()
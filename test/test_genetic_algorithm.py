@@ -0,0 +1,199 @@
+import random
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.process_logic.topologie_manager.genetic_algorithm import GeneticAlgorithm, merge_generation_statistics, \
+    FitnessCache
+
+
+def create_genetic_algorithm(mocker) -> GeneticAlgorithm:
+    """4 positions in a row (distance 1 between neighbours), 3 stations with a flow chain Ma: 1 -> Ma: 2 -> Ma: 3."""
+    position_list = ["0:0", "1:0", "2:0", "3:0"]
+    positions_distance_matrix = {pos_i: {pos_j: abs(i - j) for j, pos_j in enumerate(position_list) if pos_j != pos_i}
+                                 for i, pos_i in enumerate(position_list)}
+    position_distance_matrix = SimpleNamespace(positions_distance_matrix=positions_distance_matrix,
+                                               production=SimpleNamespace(production_layout=[]),
+                                               start_creating_positions_distance_matrix=lambda: None)
+    material_flow = mocker.Mock()
+    material_flow.create_material_flow_matrix.return_value = {"Ma: 1": {"Ma: 2": 10, "Ma: 3": 0},
+                                                              "Ma: 2": {"Ma: 1": 0, "Ma: 3": 5},
+                                                              "Ma: 3": {"Ma: 1": 0, "Ma: 2": 0}}
+    genetic_algorithm = GeneticAlgorithm(mocker.Mock(now=0), material_flow, position_distance_matrix)
+    genetic_algorithm.get_material_flow_matrix()
+    genetic_algorithm.create_encoding()
+    genetic_algorithm.random_generator = np.random.default_rng(0)
+    return genetic_algorithm
+
+
+def test_calculate_performance__population__flow_times_distance_of_every_individual(mocker):
+    # given
+    genetic_algorithm = create_genetic_algorithm(mocker)
+    population = np.array([[0, 1, 2],
+                           [0, 3, 1]])
+
+    # when
+    performance_scores = genetic_algorithm.calculate_performance(population)
+
+    # then
+    assert performance_scores.tolist() == [10 * 1 + 5 * 1, 10 * 3 + 5 * 2]
+
+
+def test_crossover__pairs_of_parents__children_without_double_occupancy(mocker):
+    # given
+    genetic_algorithm = create_genetic_algorithm(mocker)
+    parents1 = np.array([[0, 1, 2], [3, 2, 1]])
+    parents2 = np.array([[1, 0, 2], [1, 2, 3]])
+
+    # when
+    children1, children2 = genetic_algorithm.crossover(parents1, parents2)
+
+    # then
+    for child in np.concatenate([children1, children2]):
+        assert len(set(child.tolist())) == 3
+
+
+def test_replace_duplicate_positions__double_occupancy__missing_positions_of_the_parent():
+    # given
+    genetic_algorithm = GeneticAlgorithm.__new__(GeneticAlgorithm)
+    genetic_algorithm.distance_matrix = np.zeros((4, 4))
+    children = np.array([[0, 0, 2]])
+    parents = np.array([[3, 0, 2]])
+
+    # when
+    children = genetic_algorithm.replace_duplicate_positions(children, parents)
+
+    # then
+    assert children.tolist() == [[0, 3, 2]]
+
+
+def test_validate_and_correct_assignment__double_occupancy__station_with_less_flow_moved(mocker):
+    # given
+    genetic_algorithm = create_genetic_algorithm(mocker)
+    population = np.array([[1, 1, 2]])
+
+    # when
+    population = genetic_algorithm.validate_and_correct_assignment(population)
+
+    # then
+    assert population[0, 1] == 1
+    assert len(set(population[0].tolist())) == 3
+
+
+def test_start_genetic_algorithm__flow_chain__stations_next_to_each_other(mocker):
+    # given
+    random.seed(0)
+    genetic_algorithm = create_genetic_algorithm(mocker)
+    mocker.patch.object(genetic_algorithm, "plot_performance")
+    mocker.patch.object(genetic_algorithm, "save_performance_data")
+
+    # when
+    entity_assignment = genetic_algorithm.start_genetic_algorithm()
+
+    # then
+    position_dict = {station: int(pos[0]) for pos, station in entity_assignment}
+    assert abs(position_dict["Ma: 1"] - position_dict["Ma: 2"]) == 1
+    assert abs(position_dict["Ma: 2"] - position_dict["Ma: 3"]) == 1
+
+
+def test_merge_generation_statistics__two_islands__statistics_of_every_individual():
+    # given
+    island_scores = [np.array([1.0, 3.0]), np.array([5.0, 7.0, 9.0])]
+    generation_statistics_list = [np.array([[len(scores), scores.sum(), np.square(scores).sum(), scores.min()]])
+                                  for scores in island_scores]
+
+    # when
+    avg_performances, best_performances, std_devs = merge_generation_statistics(generation_statistics_list)
+
+    # then
+    all_scores = np.concatenate(island_scores)
+    assert avg_performances == [all_scores.mean()]
+    assert best_performances == [1.0]
+    assert np.isclose(std_devs[0], all_scores.std())
+
+
+def test_start_genetic_algorithm__island_model__statistics_of_every_generation(mocker):
+    # given
+    random.seed(0)
+    genetic_algorithm = create_genetic_algorithm(mocker)
+    genetic_algorithm.number_of_islands = 2
+    genetic_algorithm.number_of_iterations = 5
+    genetic_algorithm.migration_interval = 2
+    mocker.patch.object(genetic_algorithm, "plot_performance")
+    save_performance_data = mocker.patch.object(genetic_algorithm, "save_performance_data")
+
+    # when
+    entity_assignment = genetic_algorithm.start_genetic_algorithm()
+
+    # then
+    avg_performances, best_performances, std_devs = save_performance_data.call_args.args
+    assert len(avg_performances) == len(best_performances) == len(std_devs) == 5
+    assert len(set(pos for pos, _ in entity_assignment)) == 3
+
+
+def test_get_performance_scores__cached_and_duplicate_individuals__every_layout_calculated_once():
+    # given
+    fitness_cache = FitnessCache(max_size=10)
+    calculated_rows = []
+
+    def calculate_performance(population):
+        calculated_rows.extend(population.tolist())
+        return population.sum(axis=1).astype(np.float64)
+
+    fitness_cache.get_performance_scores(np.array([[0, 1], [1, 0]]), calculate_performance)
+
+    # when
+    performance_scores = fitness_cache.get_performance_scores(np.array([[0, 1], [2, 3], [2, 3]]),
+                                                              calculate_performance)
+
+    # then
+    assert performance_scores.tolist() == [1.0, 5.0, 5.0]
+    assert calculated_rows == [[0, 1], [1, 0], [2, 3]]
+    assert fitness_cache.hits == 2
+    assert fitness_cache.evaluations == 3
+
+
+def test_get_performance_scores__cache_full__least_recently_used_removed():
+    # given
+    fitness_cache = FitnessCache(max_size=2)
+
+    def calculate_performance(population):
+        return population.sum(axis=1).astype(np.float64)
+
+    fitness_cache.get_performance_scores(np.array([[0, 1]]), calculate_performance)
+    fitness_cache.get_performance_scores(np.array([[1, 2]]), calculate_performance)
+    fitness_cache.get_performance_scores(np.array([[0, 1]]), calculate_performance)
+
+    # when
+    fitness_cache.get_performance_scores(np.array([[2, 3]]), calculate_performance)
+
+    # then
+    assert len(fitness_cache.performance_dict) == 2
+    assert np.array([1, 2]).tobytes() not in fitness_cache.performance_dict
+
+
+def test_replace_duplicate_individuals__child_equal_to_survivor__child_mutated(mocker):
+    # given
+    genetic_algorithm = create_genetic_algorithm(mocker)
+    survivors = np.array([[0, 1, 2]])
+    children = np.array([[0, 1, 2], [3, 1, 2]])
+
+    # when
+    children = genetic_algorithm.replace_duplicate_individuals(survivors, children)
+
+    # then
+    assert children[0].tolist() != [0, 1, 2]
+    assert children[1].tolist() == [3, 1, 2]
+
+
+def test_start_genetic_algorithm__every_station_fixed__fixed_assignment(mocker):
+    # given
+    genetic_algorithm = create_genetic_algorithm(mocker)
+    mocker.patch.object(genetic_algorithm, "save_fixed_assignment")
+    genetic_algorithm.entity_fixed_assignment = [("0:0", "Ma: 1"), ("1:0", "Ma: 2"), ("2:0", "Ma: 3")]
+
+    # when
+    entity_assignment = genetic_algorithm.start_genetic_algorithm()
+
+    # then
+    assert entity_assignment == [("0:0", "Ma: 1"), ("1:0", "Ma: 2"), ("2:0", "Ma: 3")]
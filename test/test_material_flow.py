@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+from src.monitoring.columnar_trace import ColumnarTraceWriter, ColumnarTrace
+from src.monitoring.data_analysis.transport_data.material_flow import MaterialFlow
+
+
+def create_tr_snapshot(timestamp: int, from_station: str, to_station: str, quantity: int) -> dict:
+    return {"timestamp": timestamp,
+            "entities": [{"x": 0, "y": 0, "entity_data": {"identification_str": "TR: 1",
+                                                          "working_status": {"status": "MOVING_TO_DROP_OFF"},
+                                                          "transport_order": {"pick up station": from_station,
+                                                                              "unload destination": to_station,
+                                                                              "quantity": quantity}}}]}
+
+
+def create_tr_snapshot_list() -> list[dict]:
+    return [create_tr_snapshot(0, "Ma: 1", "Ma: 2", 0), create_tr_snapshot(5, "Ma: 1", "Ma: 2", 10),
+            create_tr_snapshot(8, "Ma: 1", "Ma: 2", 10), create_tr_snapshot(20, "Ma: 2", "Ma: 3", 5)]
+
+
+def create_material_flow(tr_snapshot_list: list[dict] | None = None) -> MaterialFlow:
+    creating_tr_during_simulation_dict = SimpleNamespace(
+        every_tr_during_simulation_data={"TR: 1": tr_snapshot_list or create_tr_snapshot_list()},
+        every_tr_identification_str_list=["TR: 1"])
+    creating_machine_during_simulation_dict = SimpleNamespace(
+        every_machine_identification_str_list=["Ma: 1", "Ma: 2", "Ma: 3"])
+    creating_intermediate_store_during_simulation_dict = SimpleNamespace(
+        every_intermediate_store_identification_str_list=[])
+    return MaterialFlow(creating_tr_during_simulation_dict, creating_machine_during_simulation_dict,
+                        creating_intermediate_store_during_simulation_dict)
+
+
+def test_create_material_flow_matrix__whole_simulation__every_order_counted_once():
+    # given
+    material_flow = create_material_flow()
+
+    # when
+    material_flow_matrix = material_flow.create_material_flow_matrix()
+
+    # then
+    assert material_flow_matrix["Ma: 1"] == {"Ma: 2": 10, "Ma: 3": 0}
+    assert material_flow_matrix["Ma: 2"] == {"Ma: 1": 0, "Ma: 3": 5}
+
+
+def test_create_material_flow_matrix__order_started_before_time_window__counted_in_the_time_window():
+    # given
+    material_flow = create_material_flow()
+
+    # when
+    material_flow_matrix = material_flow.create_material_flow_matrix(8, 30)
+
+    # then
+    assert material_flow_matrix["Ma: 1"]["Ma: 2"] == 10
+    assert material_flow_matrix["Ma: 2"]["Ma: 3"] == 5
+
+
+def test_create_material_flow_matrix__two_time_windows__new_matrix_per_call():
+    # given
+    material_flow = create_material_flow()
+    first_material_flow_matrix = material_flow.create_material_flow_matrix(0, 10)
+
+    # when
+    second_material_flow_matrix = material_flow.create_material_flow_matrix(21, 30)
+
+    # then
+    assert first_material_flow_matrix is not second_material_flow_matrix
+    assert first_material_flow_matrix["Ma: 1"]["Ma: 2"] == 10
+    assert second_material_flow_matrix["Ma: 1"]["Ma: 2"] == 0
+
+
+def test_from_columnar_trace__same_tr_actions__same_material_flow_matrices_as_the_snapshots(tmp_path):
+    # given
+    tr_snapshot_list = create_tr_snapshot_list() + [create_tr_snapshot(25, "Ma: 3", None, None),
+                                                    create_tr_snapshot(30, "Ma: 2", "Ma: 3", 5)]
+    columnar_trace_writer = ColumnarTraceWriter(tmp_path, "tr")
+    for tr_snapshot in tr_snapshot_list:
+        columnar_trace_writer.add_data_entry(tr_snapshot)
+    columnar_trace_writer.close()
+    material_flow = create_material_flow(tr_snapshot_list)
+
+    # when
+    columnar_material_flow = MaterialFlow.from_columnar_trace(ColumnarTrace(tmp_path, "tr"),
+                                                              ["Ma: 1", "Ma: 2", "Ma: 3"], [])
+
+    # then
+    for start_time, end_time in [(0, float('inf')), (8, 30), (21, 30)]:
+        assert columnar_material_flow.create_material_flow_matrix(start_time, end_time) == \
+               material_flow.create_material_flow_matrix(start_time, end_time)
@@ -0,0 +1,84 @@
+import random
+
+import numpy as np
+
+from src.entity.source import Source
+from src.entity.working_robot.working_robot import WorkingRobot
+from src.production.base.cell import Cell
+from src.production.base.coordinates import Coordinates
+from src.production.base.occupancy_grid import OccupancyGrid
+
+
+def test_set_placed_entity__cell_connected_to_grid__grid_is_updated(mocker):
+    # given
+    occupancy_grid = OccupancyGrid(Coordinates(10, 10))
+    moving_working_robot = WorkingRobot(1, Coordinates(1, 1), 1, 1, mocker.Mock())
+    cell = Cell(Coordinates(3, 4), None, occupancy_grid)
+
+    # when
+    cell.placed_entity = moving_working_robot
+
+    # then
+    assert occupancy_grid.entity_id_grid[4, 3] == occupancy_grid.get_entity_index(moving_working_robot)
+    assert occupancy_grid.count_occupied_cells(0, 0, 10, 10) == 1
+
+    # when
+    cell.placed_entity = None
+
+    # then
+    assert occupancy_grid.entity_id_grid[4, 3] == 0
+    assert occupancy_grid.count_occupied_cells(0, 0, 10, 10) == 0
+
+
+def test_check_area_is_free__own_entity_in_area__area_is_free(mocker):
+    # given
+    occupancy_grid = OccupancyGrid(Coordinates(10, 10))
+    moving_working_robot = WorkingRobot(1, Coordinates(2, 2), 1, 1, mocker.Mock())
+    for x in range(2, 4):
+        for y in range(2, 4):
+            Cell(Coordinates(x, y), moving_working_robot, occupancy_grid)
+
+    # when
+    area_is_free_for_robot = occupancy_grid.check_area_is_free(1, 1, 5, 5, moving_working_robot)
+    area_is_free_for_nobody = occupancy_grid.check_area_is_free(1, 1, 5, 5, None)
+
+    # then
+    assert area_is_free_for_robot is True
+    assert area_is_free_for_nobody is False
+
+
+def test_check_area_is_free__obstacle_in_area__area_is_not_free(mocker):
+    # given
+    occupancy_grid = OccupancyGrid(Coordinates(10, 10))
+    moving_working_robot = WorkingRobot(1, Coordinates(1, 1), 1, 1, mocker.Mock())
+    Cell(Coordinates(2, 2), moving_working_robot, occupancy_grid)
+    Cell(Coordinates(4, 4), Source(0, 0, 0), occupancy_grid)
+
+    # when
+    area_is_free = occupancy_grid.check_area_is_free(0, 0, 8, 8, moving_working_robot)
+    area_next_to_obstacle_is_free = occupancy_grid.check_area_is_free(5, 0, 12, 12, moving_working_robot)
+
+    # then
+    assert area_is_free is False
+    assert area_next_to_obstacle_is_free is True
+
+
+def test_get_entity_bounding_box__robot_moved_and_cells_cleared__box_equal_to_full_scan(mocker):
+    # given
+    random.seed(1)
+    occupancy_grid = OccupancyGrid(Coordinates(20, 15))
+    moving_working_robot = WorkingRobot(1, Coordinates(2, 2), 1, 1, mocker.Mock())
+    cell_list = [Cell(Coordinates(x, y), None, occupancy_grid) for y in range(0, 15) for x in range(0, 20)]
+    index = occupancy_grid.get_entity_index(moving_working_robot)
+
+    for _ in range(0, 300):
+        # when
+        cell = random.choice(cell_list)
+        cell.placed_entity = moving_working_robot if cell.placed_entity is None else None
+        bounding_box = occupancy_grid.get_entity_bounding_box(index)
+
+        # then
+        y_list, x_list = np.nonzero(occupancy_grid.entity_id_grid == index)
+        expected_bounding_box = None if len(x_list) == 0 else \
+            (int(x_list.min()), int(y_list.min()), int(x_list.max()) + 1, int(y_list.max()) + 1)
+        assert bounding_box == expected_bounding_box
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.monitoring.online_kpi_accumulator import OnlineKpiAccumulator
+
+
+def create_online_kpi_accumulator() -> OnlineKpiAccumulator:
+    production = SimpleNamespace(machine_list=[SimpleNamespace(identification_str="Ma: 1")],
+                                 intermediate_store_list=[])
+    return OnlineKpiAccumulator(SimpleNamespace(now=0), production)
+
+
+def create_tr(from_station: str, to_station: str, quantity: int) -> SimpleNamespace:
+    return SimpleNamespace(identification_str="TR: 1", transport_order=SimpleNamespace(
+        pick_up_station=SimpleNamespace(identification_str=from_station),
+        unload_destination=SimpleNamespace(identification_str=to_station), quantity=quantity))
+
+
+def test_create_material_flow_matrix__order_seen_twice__counted_once_in_its_time_window():
+    # given
+    online_kpi_accumulator = create_online_kpi_accumulator()
+    for now, quantity in [(0, 0), (10, 5), (12, 5)]:
+        online_kpi_accumulator.env.now = now
+        online_kpi_accumulator.update_material_flow(create_tr("Source", "Ma: 1", quantity))
+
+    # when
+    material_flow_matrix = online_kpi_accumulator.create_material_flow_matrix(0, 28800)
+    next_day_material_flow_matrix = online_kpi_accumulator.create_material_flow_matrix(28800, 57600)
+
+    # then
+    assert material_flow_matrix == {"Source": {"Ma: 1": 5}, "Ma: 1": {"Source": 0}}
+    assert next_day_material_flow_matrix == {"Ma: 1": {}}
+
+
+def test_create_material_flow_matrix__several_stations__stations_in_order_of_the_production():
+    # given
+    online_kpi_accumulator = create_online_kpi_accumulator()
+    online_kpi_accumulator.production.machine_list.append(SimpleNamespace(identification_str="Ma: 2"))
+    online_kpi_accumulator.production.intermediate_store_list.append(SimpleNamespace(identification_str="IS: 1"))
+    for now, (from_station, to_station) in enumerate([("Ma: 2", "Sink"), ("Source", "Ma: 1")], start=1):
+        online_kpi_accumulator.env.now = now
+        online_kpi_accumulator.update_material_flow(create_tr(from_station, to_station, 1))
+
+    # when
+    material_flow_matrix = online_kpi_accumulator.create_material_flow_matrix()
+
+    # then
+    assert list(material_flow_matrix.keys()) == ["Ma: 1", "Ma: 2", "IS: 1", "Sink", "Source"]
+    assert list(material_flow_matrix["Ma: 2"].keys()) == ["Ma: 1", "IS: 1", "Sink", "Source"]
+
+
+def test_get_status_times__status_changes__current_status_counts_until_now():
+    # given
+    online_kpi_accumulator = create_online_kpi_accumulator()
+    online_kpi_accumulator.update_status("WR: 1", "IDLE")
+    online_kpi_accumulator.env.now = 30
+    online_kpi_accumulator.update_status("WR: 1", "WORKING_ON_MACHINE")
+
+    # when
+    online_kpi_accumulator.env.now = 40
+    status_times = online_kpi_accumulator.get_status_times()
+
+    # then
+    assert status_times == {"WR: 1": {"IDLE": 30.0, "WORKING_ON_MACHINE": 10.0}}
+
+
+def test_get_lead_time_statistics__two_receipts__fifo_lead_times():
+    # given
+    online_kpi_accumulator = create_online_kpi_accumulator()
+    online_kpi_accumulator.product_entered("ONE", 1, 0)
+    online_kpi_accumulator.product_entered("ONE", 1, 10)
+
+    # when
+    online_kpi_accumulator.product_left("ONE", 2, 30)
+
+    # then
+    assert online_kpi_accumulator.get_lead_time_statistics() == {"ONE": {"quantity": 2, "mean": 25.0,
+                                                                         "std": pytest.approx(5.0)}}
@@ -0,0 +1,95 @@
+import shutil
+
+import src.parameter_sweep
+from src import RESOURCES
+from src.parameter_sweep import ParameterSweep, SweepPoint
+
+
+def test_create_latin_hypercube__every_level_once__each_value_used_once_per_parameter(tmp_path):
+    # given
+    parameter_sweep = ParameterSweep(sweep_folder=tmp_path)
+    parameter_values = {"number_of_tr": [1, 2, 3, 4], "tr_capacity": [25, 50, 75, 100],
+                        "number_of_wr": [1, 2, 3, 4], "topology_method": [1, 2, 3, 4]}
+
+    # when
+    sweep_points = parameter_sweep.create_latin_hypercube(parameter_values, number_of_points=4, seed=3)
+
+    # then
+    assert len(sweep_points) == 4
+    assert sorted(sweep_point.number_of_tr for sweep_point in sweep_points) == [1, 2, 3, 4]
+    assert sorted(sweep_point.tr_capacity for sweep_point in sweep_points) == [25, 50, 75, 100]
+
+
+def test_create_config_files__sweep_point__robot_and_topology_values_changed(tmp_path):
+    # given
+    parameter_sweep = ParameterSweep(sweep_folder=tmp_path)
+    sweep_point = SweepPoint(number_of_tr=3, tr_capacity=75, number_of_wr=2, topology_method=4)
+
+    # when
+    config_files = parameter_sweep.create_config_files(sweep_point)
+
+    # then
+    tr_data = config_files["simulation_production_transport_robot_data.json"]["transport_robot"][0]
+    wr_data = config_files["simulation_production_working_robot_data.json"]["working_robot"][0]
+    assert tr_data["number_of_robots_in_production"] == "3"
+    assert tr_data["max_loading_capacity"] == "75"
+    assert wr_data["number_of_robots_in_production"] == "2"
+    assert config_files["simulation_starting_conditions.json"][
+               "Topology_manager(No algorithm (1), QAP (2), GA (3), FDP(4)"] == 4
+
+
+def test_create_results_table__completed_sweep_point__one_row_per_replication_with_kpis(tmp_path):
+    # given
+    parameter_sweep = ParameterSweep(sweep_folder=tmp_path, number_of_replications=1)
+    sweep_point = SweepPoint(number_of_tr=1, tr_capacity=100, number_of_wr=4, topology_method=1)
+    parameter_sweep.get_sweep_point_folder(sweep_point).mkdir(parents=True)
+    results = {"throughput_all_products": {"GLOBAL_WEIGHTED_AVERAGE": {"average": "1:00:30", "std_dev": "0:10:00"}},
+               "tr_workload": {"TR: 1": {"Wartend": 30.0, "Be- und Entladen": 10.0}},
+               "wr_workload": None,
+               "machine_workload": None}
+    parameter_sweep.save_sweep_point_results(sweep_point, [{"run": 1, "seed": 1, "return_code": 0,
+                                                            "output_root": "", "results": results}])
+
+    # when
+    results_table = parameter_sweep.create_results_table([sweep_point])
+
+    # then
+    assert parameter_sweep.check_sweep_point_completed(sweep_point) is True
+    assert len(results_table) == 1
+    assert results_table.loc[0, "throughput_time_average_s"] == 3630
+    assert results_table.loc[0, "tr_share_Wartend"] == 0.75
+
+
+def test_get_sweep_point_folder__default_resources_changed__other_folder(tmp_path, monkeypatch):
+    # given
+    resources_folder = tmp_path / "resources"
+    shutil.copytree(RESOURCES, resources_folder)
+    monkeypatch.setattr(src.parameter_sweep, "RESOURCES", resources_folder)
+    sweep_point = SweepPoint(number_of_tr=1, tr_capacity=100, number_of_wr=4, topology_method=1)
+    sweep_point_folder = ParameterSweep(sweep_folder=tmp_path).get_sweep_point_folder(sweep_point)
+
+    # when
+    with open(resources_folder / "product_information.json", "a", encoding="utf-8") as f:
+        f.write("\n")
+    changed_sweep_point_folder = ParameterSweep(sweep_folder=tmp_path).get_sweep_point_folder(sweep_point)
+
+    # then
+    assert changed_sweep_point_folder != sweep_point_folder
+    assert ParameterSweep(sweep_folder=tmp_path).get_sweep_point_folder(sweep_point) == changed_sweep_point_folder
+
+
+def test_check_sweep_point_completed__failed_replication__not_completed_but_in_results_table(tmp_path):
+    # given
+    parameter_sweep = ParameterSweep(sweep_folder=tmp_path, number_of_replications=2)
+    sweep_point = SweepPoint(number_of_tr=1, tr_capacity=100, number_of_wr=4, topology_method=1)
+    parameter_sweep.get_sweep_point_folder(sweep_point).mkdir(parents=True)
+    parameter_sweep.save_sweep_point_results(sweep_point, [
+        {"run": 1, "seed": 1, "return_code": 0, "output_root": "", "results": {}},
+        {"run": 2, "seed": 2, "return_code": 1, "output_root": "", "results": {}}])
+
+    # when
+    is_completed = parameter_sweep.check_sweep_point_completed(sweep_point)
+
+    # then
+    assert is_completed is False
+    assert parameter_sweep.create_results_table([sweep_point])["return_code"].tolist() == [0, 1]
@@ -0,0 +1,46 @@
+from src.process_logic.path_cache import PathCache
+
+
+def test_add_path__cache_full__least_recently_used_path_removed():
+    # given
+    path_cache = PathCache(max_size=2)
+    path_cache.add_path((0, 1, 2, 3), ["1:0"], [1])
+    path_cache.add_path((0, 2, 2, 3), ["2:0"], [2])
+    path_cache.get_path((0, 1, 2, 3), 0)
+
+    # when
+    path_cache.add_path((0, 3, 2, 3), ["3:0"], [3])
+
+    # then
+    assert path_cache.get_path((0, 1, 2, 3), 0) == (("1:0",), (1,))
+    assert path_cache.get_path((0, 2, 2, 3), 0) is None
+    assert path_cache.get_path((0, 3, 2, 3), 0) == (("3:0",), (3,))
+
+
+def test_get_path__static_version_changed__cache_is_emptied():
+    # given
+    path_cache = PathCache()
+    path_cache.add_path((0, 1, 2, 3), ["1:0"], [1])
+
+    # when
+    cached_path = path_cache.get_path((0, 1, 2, 3), 1)
+
+    # then
+    assert cached_path is None
+    assert len(path_cache.cached_paths) == 0
+
+
+def test_count_hit__two_production_days__statistics_per_day():
+    # given
+    path_cache = PathCache()
+
+    # when
+    path_cache.count_hit(0)
+    path_cache.count_hit(0)
+    path_cache.count_miss(0)
+    path_cache.count_miss(1)
+
+    # then
+    assert path_cache.get_daily_statistics(0) == {"hits": 2, "misses": 1}
+    assert path_cache.get_daily_statistics(1) == {"hits": 0, "misses": 1}
+    assert path_cache.hits == 2
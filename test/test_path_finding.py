@@ -0,0 +1,135 @@
+import src.process_logic.path_finding
+from src.entity.source import Source
+from src.entity.working_robot.working_robot import WorkingRobot
+from src.process_logic.path_finding import PathFinding
+from src.production.base.cell import Cell
+from src.production.base.coordinates import Coordinates
+from src.production.base.occupancy_grid import OccupancyGrid
+
+
+def create_testing_production(mocker, max_coordinate: Coordinates):
+    mock_production = mocker.Mock()
+    mock_production.max_coordinate = max_coordinate
+    mock_production.occupancy_grid = OccupancyGrid(max_coordinate)
+    return mock_production
+
+
+def test_run_a_star_algorithm__no_obstacle__straight_path(mocker):
+    # given
+    mock_production = create_testing_production(mocker, Coordinates(10, 10))
+    path_finding = PathFinding(mock_production)
+    moving_working_robot = WorkingRobot(1, Coordinates(1, 1), 1, 1, mocker.Mock())
+    start_cell = Cell(Coordinates(1, 5), moving_working_robot, mock_production.occupancy_grid)
+
+    # when
+    path_found = path_finding.run_a_star_algorithm(start_cell, Cell(Coordinates(5, 5), None), moving_working_robot)
+
+    # then
+    assert path_found is True
+    assert path_finding.path_line_list == ["2:5", "3:5", "4:5", "5:5"]
+
+
+def test_run_a_star_algorithm__destination_enclosed__no_path(mocker):
+    # given
+    mock_production = create_testing_production(mocker, Coordinates(10, 10))
+    path_finding = PathFinding(mock_production)
+    moving_working_robot = WorkingRobot(1, Coordinates(1, 1), 1, 1, mocker.Mock())
+    start_cell = Cell(Coordinates(1, 1), moving_working_robot, mock_production.occupancy_grid)
+    obstacle = Source(0, 0, 0)
+    for y in range(0, 10):
+        Cell(Coordinates(6, y), obstacle, mock_production.occupancy_grid)
+
+    # when
+    path_found = path_finding.run_a_star_algorithm(start_cell, Cell(Coordinates(8, 5), None), moving_working_robot)
+
+    # then
+    assert path_found is False
+
+
+def test_run_a_star_algorithm__repeated_search__buffers_are_reused(mocker):
+    # given
+    mock_production = create_testing_production(mocker, Coordinates(10, 10))
+    path_finding = PathFinding(mock_production)
+    moving_working_robot = WorkingRobot(1, Coordinates(1, 1), 1, 1, mocker.Mock())
+    start_cell = Cell(Coordinates(1, 5), moving_working_robot, mock_production.occupancy_grid)
+    path_finding.run_a_star_algorithm(start_cell, Cell(Coordinates(1, 8), None), moving_working_robot)
+    g_score_buffer = path_finding.g_score
+
+    # when
+    path_found = path_finding.run_a_star_algorithm(start_cell, Cell(Coordinates(3, 5), None), moving_working_robot)
+
+    # then
+    assert path_found is True
+    assert path_finding.path_line_list == ["2:5", "3:5"]
+    assert path_finding.g_score is g_score_buffer
+
+
+def test_get_cooperative_path__column_reserved__robot_waits_until_column_is_free(mocker):
+    # given
+    mock_production = create_testing_production(mocker, Coordinates(10, 10))
+    mock_production.env.now = 0
+    path_finding = PathFinding(mock_production)
+    moving_working_robot = WorkingRobot(1, Coordinates(1, 1), 1, 1, mocker.Mock())
+    start_cell = Cell(Coordinates(1, 5), moving_working_robot, mock_production.occupancy_grid)
+    for y in range(0, 10):
+        path_finding.reservation_table.reserve_cell("WR: 2", y * 10 + 3, 0.0, 3.0)
+
+    # when
+    path_line_list = path_finding.get_cooperative_path(start_cell, Cell(Coordinates(5, 5), None), moving_working_robot)
+
+    # then
+    assert len(path_line_list) == 7
+    assert path_line_list[-3:] == ["3:5", "4:5", "5:5"]
+    assert path_finding.reservation_table.check_cell_is_free(55, 100.0, 200.0, "WR: 2") is False
+
+
+def test_get_cooperative_path__other_robot_parked_on_destination__no_search_and_no_route(mocker):
+    # given
+    mock_production = create_testing_production(mocker, Coordinates(10, 10))
+    mock_production.env.now = 0
+    path_finding = PathFinding(mock_production)
+    moving_working_robot = WorkingRobot(1, Coordinates(1, 1), 1, 1, mocker.Mock())
+    start_cell = Cell(Coordinates(1, 5), moving_working_robot, mock_production.occupancy_grid)
+    path_finding.reservation_table.reserve_cell("TR: 9", 55, 0.0, float("inf"))
+    heappop_spy = mocker.spy(src.process_logic.path_finding, "heappop")
+
+    # when
+    path_line_list = path_finding.get_cooperative_path(start_cell, Cell(Coordinates(5, 5), None), moving_working_robot)
+
+    # then
+    assert path_line_list is None
+    assert heappop_spy.call_count == 0
+    assert path_finding.reservation_table.check_entity_has_reservations(moving_working_robot.identification_str) \
+        is False
+
+
+def test_check_path_is_free__own_cells_in_movement_area__path_is_free_without_clearance_map(mocker):
+    # given
+    mock_production = create_testing_production(mocker, Coordinates(10, 10))
+    path_finding = PathFinding(mock_production)
+    moving_working_robot = WorkingRobot(1, Coordinates(1, 1), 1, 1, mocker.Mock())
+    Cell(Coordinates(2, 4), moving_working_robot, mock_production.occupancy_grid)
+    movement_area_map_spy = mocker.spy(mock_production.occupancy_grid.clearance_map, "get_movement_area_map")
+
+    # when
+    path_is_free = path_finding.check_path_is_free((52, 53, 54, 55), moving_working_robot)
+
+    # then
+    assert path_is_free is True
+    assert movement_area_map_spy.call_count == 0
+
+
+def test_check_path_is_free__other_robot_in_movement_area_next_to_path__path_is_not_free(mocker):
+    # given
+    mock_production = create_testing_production(mocker, Coordinates(10, 10))
+    path_finding = PathFinding(mock_production)
+    moving_working_robot = WorkingRobot(1, Coordinates(1, 1), 1, 1, mocker.Mock())
+    other_working_robot = WorkingRobot(2, Coordinates(1, 1), 1, 1, mocker.Mock())
+    Cell(Coordinates(1, 5), moving_working_robot, mock_production.occupancy_grid)
+    Cell(Coordinates(4, 3), other_working_robot, mock_production.occupancy_grid)
+
+    # when
+    path_is_free = path_finding.check_path_is_free((52, 53, 54, 55), moving_working_robot)
+
+    # then
+    assert path_is_free is False
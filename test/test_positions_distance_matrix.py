@@ -0,0 +1,95 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.process_logic.topologie_manager.positions_distance_matrix import PositionsDistanceMatrix, \
+    count_cells_in_footprints, run_multi_source_breadth_first_search
+from src.production.base.cell import Cell
+from src.production.base.coordinates import Coordinates
+
+
+def create_positions_distance_matrix(tmp_path, position_list: list[str]) -> PositionsDistanceMatrix:
+    """Empty 20 x 10 layout, objects with a size of 3 x 3 and a TR with a size of 1 x 1."""
+    production_layout = [[Cell(Coordinates(x, y), None) for x in range(20)] for y in reversed(range(10))]
+    production = SimpleNamespace(production_layout=production_layout, max_coordinate=Coordinates(20, 10),
+                                 machine_list=[SimpleNamespace(size=Coordinates(3, 3))], intermediate_store_list=[],
+                                 tr_list=[SimpleNamespace(size=Coordinates(1, 1))])
+    positions_distance_matrix = PositionsDistanceMatrix(production)
+    positions_distance_matrix.cache_folder = tmp_path
+    positions_distance_matrix.data_position_identification_str_list = position_list
+    positions_distance_matrix.save_cells()
+    return positions_distance_matrix
+
+
+def test_run_multi_source_breadth_first_search__wall__way_around_the_wall():
+    # given
+    free_grid = np.ones((3, 5), dtype=bool)
+    free_grid[0:2, 2] = False
+    start_grid = np.zeros((3, 5), dtype=bool)
+    start_grid[0, 0] = True
+
+    # when
+    distances = run_multi_source_breadth_first_search(free_grid, start_grid)
+
+    # then
+    assert distances[0, 4] == 8
+    assert np.isinf(distances[0, 2])
+
+
+def test_count_cells_in_footprints__robot_of_two_cells__cells_below_and_right_of_the_position():
+    # given
+    grid = np.zeros((3, 3), dtype=bool)
+    grid[1, 1] = True
+
+    # when
+    counts = count_cells_in_footprints(grid, (1, 2))
+
+    # then
+    assert counts[1, 1] == 1
+    assert counts[2, 1] == 1
+    assert counts[0, 1] == 2  # footprint outside of the layout
+
+
+def test_calculate_driving_distance_between_positions__object_in_between__way_around_the_object(tmp_path):
+    # given
+    positions_distance_matrix = create_positions_distance_matrix(tmp_path, ["2:6", "8:6", "14:6"])
+
+    # when
+    positions_distance_matrix.calculate_driving_distance_between_positions()
+
+    # then
+    distances = positions_distance_matrix.positions_distance_matrix
+    assert distances["2:6"]["8:6"] == 2
+    assert distances["2:6"]["14:6"] > distances["2:6"]["8:6"] + 3
+    assert positions_distance_matrix.distance_array[positions_distance_matrix.position_index_dict["8:6"],
+                                                    positions_distance_matrix.position_index_dict["2:6"]] == 2
+
+
+def test_calculate_driving_distance_between_positions__second_run__matrix_loaded_from_cache(tmp_path, mocker):
+    # given
+    create_positions_distance_matrix(tmp_path, ["2:6", "8:6"]).calculate_driving_distance_between_positions()
+    positions_distance_matrix = create_positions_distance_matrix(tmp_path, ["2:6", "8:6"])
+    run_breadth_first_searches = mocker.spy(positions_distance_matrix, "run_breadth_first_searches")
+
+    # when
+    positions_distance_matrix.calculate_driving_distance_between_positions()
+
+    # then
+    run_breadth_first_searches.assert_not_called()
+    assert positions_distance_matrix.positions_distance_matrix["2:6"]["8:6"] == 2
+
+
+def test_calculate_driving_distance_between_positions__damaged_cache_file__matrix_calculated_again(tmp_path):
+    # given
+    create_positions_distance_matrix(tmp_path, ["2:6", "8:6"]).calculate_driving_distance_between_positions()
+    cache_file, = tmp_path.glob("*.npy")
+    cache_file.write_bytes(cache_file.read_bytes()[:20])
+    positions_distance_matrix = create_positions_distance_matrix(tmp_path, ["2:6", "8:6"])
+
+    # when
+    positions_distance_matrix.calculate_driving_distance_between_positions()
+
+    # then
+    assert positions_distance_matrix.positions_distance_matrix["2:6"]["8:6"] == 2
+    assert np.load(cache_file).shape == (2, 2)
+    assert [path.name for path in tmp_path.iterdir()] == [cache_file.name]
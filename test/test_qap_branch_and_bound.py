@@ -0,0 +1,120 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from src.process_logic.topologie_manager.qap_branch_and_bound import QapBranchAndBound, solve_linear_assignment
+from src.process_logic.topologie_manager.qap_tabu_search import QapTabuSearch
+
+
+def create_distance_matrix(number_of_positions: int) -> np.ndarray:
+    """Positions in a row with a distance of 1 between neighbours."""
+    positions = np.arange(number_of_positions)
+    return np.abs(positions[:, np.newaxis] - positions[np.newaxis, :]).astype(np.float64)
+
+
+def calculate_best_cost_by_enumeration(flow_matrix: np.ndarray, distance_matrix: np.ndarray,
+                                       fixed_position_dict: dict[int, int], free_position_list: list[int]) -> float:
+    free_station_list = [station for station in range(len(flow_matrix)) if station not in fixed_position_dict]
+    best_cost = float('inf')
+    for permutation in itertools.permutations(free_position_list, len(free_station_list)):
+        assignment = np.zeros(len(flow_matrix), dtype=np.int64)
+        for station, position in fixed_position_dict.items():
+            assignment[station] = position
+        assignment[free_station_list] = permutation
+        best_cost = min(best_cost, float((flow_matrix * distance_matrix[np.ix_(assignment, assignment)]).sum()))
+    return best_cost
+
+
+def test_solve_linear_assignment__more_columns_than_rows__cheapest_assignment():
+    # given
+    cost_matrix = np.array([[4.0, 1.0, 3.0, 9.0],
+                            [2.0, 0.0, 5.0, 9.0],
+                            [3.0, 2.0, 2.0, 9.0]])
+
+    # when
+    columns = solve_linear_assignment(cost_matrix)
+
+    # then
+    assert len(set(columns.tolist())) == 3
+    assert cost_matrix[np.arange(3), columns].sum() == 5.0
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_solve__random_flows__same_cost_as_enumeration(seed):
+    # given
+    random_generator = np.random.default_rng(seed)
+    flow_matrix = random_generator.integers(0, 10, size=(6, 6)).astype(np.float64)
+    np.fill_diagonal(flow_matrix, 0)
+    distance_matrix = create_distance_matrix(7)
+    branch_and_bound = QapBranchAndBound(flow_matrix, distance_matrix, {}, list(range(7)))
+
+    # when
+    assignment, cost, is_optimal = branch_and_bound.solve()
+
+    # then
+    assert is_optimal
+    assert len(set(assignment.tolist())) == 6
+    assert cost == calculate_best_cost_by_enumeration(flow_matrix, distance_matrix, {}, list(range(7)))
+
+
+def test_solve__fixed_station__fixed_station_keeps_its_position():
+    # given
+    flow_matrix = np.array([[0, 5, 0, 0],
+                            [0, 0, 5, 0],
+                            [0, 0, 0, 5],
+                            [1, 0, 0, 0]], dtype=np.float64)
+    distance_matrix = create_distance_matrix(5)
+    fixed_position_dict = {0: 4}
+    branch_and_bound = QapBranchAndBound(flow_matrix, distance_matrix, fixed_position_dict, [0, 1, 2, 3])
+
+    # when
+    assignment, cost, is_optimal = branch_and_bound.solve()
+
+    # then
+    assert assignment[0] == 4
+    assert cost == calculate_best_cost_by_enumeration(flow_matrix, distance_matrix, fixed_position_dict,
+                                                      [0, 1, 2, 3])
+
+
+def test_solve__less_free_positions_than_stations__no_assignment():
+    # given
+    branch_and_bound = QapBranchAndBound(np.ones((3, 3)), create_distance_matrix(2), {}, [0, 1])
+
+    # when
+    assignment, cost, is_optimal = branch_and_bound.solve()
+
+    # then
+    assert assignment is None
+    assert is_optimal is False
+
+
+def test_solve__time_budget_exceeded__best_found_assignment():
+    # given
+    random_generator = np.random.default_rng(0)
+    flow_matrix = random_generator.integers(0, 10, size=(12, 12)).astype(np.float64)
+    distance_matrix = create_distance_matrix(12)
+    branch_and_bound = QapBranchAndBound(flow_matrix, distance_matrix, {}, list(range(12)), time_budget=0)
+
+    # when
+    assignment, cost, is_optimal = branch_and_bound.solve()
+
+    # then
+    assert is_optimal is False
+    assert assignment is None or len(set(assignment.tolist())) == 12
+
+
+def test_create_incumbent__random_sparse_flows__incumbent_of_the_tabu_search_before_branching():
+    # given
+    random_generator = np.random.default_rng(0)
+    flow_matrix = random_generator.integers(1, 10, size=(12, 12)) * (random_generator.random((12, 12)) < 0.2)
+    distance_matrix = create_distance_matrix(14)
+    branch_and_bound = QapBranchAndBound(flow_matrix, distance_matrix, {}, list(range(14)), seed=3)
+
+    # when
+    branch_and_bound.create_incumbent()
+
+    # then
+    _, tabu_search_cost = QapTabuSearch(flow_matrix, distance_matrix, {}, list(range(14)), seed=3).solve()
+    assert branch_and_bound.best_cost == tabu_search_cost
+    assert len(set(branch_and_bound.best_assignment.tolist())) == 12
@@ -0,0 +1,78 @@
+import numpy as np
+
+from src.process_logic.topologie_manager.qap_branch_and_bound import QapBranchAndBound
+from src.process_logic.topologie_manager.qap_tabu_search import QapTabuSearch, solve_multi_start_tabu_search
+
+
+def create_random_problem(seed: int, number_of_stations: int, number_of_positions: int) -> \
+        tuple[np.ndarray, np.ndarray]:
+    random_generator = np.random.default_rng(seed)
+    flow_matrix = random_generator.integers(0, 10, size=(number_of_stations, number_of_stations)).astype(np.float64)
+    np.fill_diagonal(flow_matrix, 0)
+    distance_matrix = random_generator.integers(1, 10, size=(number_of_positions, number_of_positions))
+    distance_matrix = (distance_matrix + distance_matrix.T).astype(np.float64)
+    np.fill_diagonal(distance_matrix, 0)
+    return flow_matrix, distance_matrix
+
+
+def test_calculate_swap_delta_matrix__every_swap__same_as_cost_difference():
+    # given
+    flow_matrix, distance_matrix = create_random_problem(0, 5, 7)
+    tabu_search = QapTabuSearch(flow_matrix, distance_matrix, {0: 6}, list(range(6)))
+    assignment = tabu_search.create_start_assignment(np.random.default_rng(0))
+
+    # when
+    delta_matrix = tabu_search.calculate_swap_delta_matrix(assignment)
+
+    # then
+    for station_1 in range(len(assignment)):
+        for station_2 in range(station_1 + 1, len(assignment)):
+            swapped_assignment = assignment.copy()
+            swapped_assignment[[station_1, station_2]] = assignment[[station_2, station_1]]
+            cost_difference = tabu_search.calculate_cost(swapped_assignment) - tabu_search.calculate_cost(assignment)
+            assert np.isclose(delta_matrix[station_1, station_2], cost_difference)
+            assert np.isclose(tabu_search.calculate_swap_delta(assignment, station_1, station_2), cost_difference)
+
+
+def test_solve__small_problem_with_fixed_station__optimal_cost_and_fixed_position():
+    # given
+    flow_matrix, distance_matrix = create_random_problem(1, 6, 8)
+    fixed_position_dict = {2: 7}
+    tabu_search = QapTabuSearch(flow_matrix, distance_matrix, fixed_position_dict, list(range(7)))
+
+    # when
+    assignment, cost = tabu_search.solve()
+
+    # then
+    assert assignment[2] == 7
+    assert len(set(assignment.tolist())) == 6
+    assert cost == QapBranchAndBound(flow_matrix, distance_matrix, fixed_position_dict, list(range(7))).solve()[1]
+
+
+def test_solve__same_seed__same_assignment():
+    # given
+    flow_matrix, distance_matrix = create_random_problem(2, 12, 14)
+
+    # when
+    assignment_1, cost_1 = QapTabuSearch(flow_matrix, distance_matrix, {}, list(range(14)), seed=5,
+                                         max_iterations=50).solve()
+    assignment_2, cost_2 = QapTabuSearch(flow_matrix, distance_matrix, {}, list(range(14)), seed=5,
+                                         max_iterations=50).solve()
+
+    # then
+    assert assignment_1.tolist() == assignment_2.tolist()
+    assert cost_1 == cost_2
+
+
+def test_solve_multi_start_tabu_search__several_starts__best_start_is_returned():
+    # given
+    flow_matrix, distance_matrix = create_random_problem(3, 10, 10)
+    single_start_costs = [QapTabuSearch(flow_matrix, distance_matrix, {}, list(range(10)), seed=seed,
+                                        max_iterations=5).solve()[1] for seed in range(3)]
+
+    # when
+    assignment, cost = solve_multi_start_tabu_search(flow_matrix, distance_matrix, {}, list(range(10)),
+                                                     number_of_starts=3, max_workers=1, max_iterations=5)
+
+    # then
+    assert cost == min(single_start_costs)
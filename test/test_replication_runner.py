@@ -0,0 +1,35 @@
+import json
+
+from src.replication_runner import ReplicationRunner
+
+
+def test_prepare_output_root__new_run__every_output_directory_below_own_root(tmp_path):
+    # given
+    replication_runner = ReplicationRunner(number_of_runs=2, base_seed=100, experiment_folder=tmp_path)
+
+    # when
+    output_root = replication_runner.get_output_root(2)
+    replication_runner.prepare_output_root(output_root)
+
+    # then
+    assert output_root == tmp_path / "run_002"
+    assert replication_runner.get_seed(2) == 102
+    assert (output_root / "simulation_output_data" / "entities_during_simulation_data" / "machine").is_dir()
+    assert (output_root / "analysis_solution" / "machine_statistics" / "workload").is_dir()
+
+
+def test_load_results__only_tr_workload_written__missing_results_are_none(tmp_path):
+    # given
+    replication_runner = ReplicationRunner(number_of_runs=1, experiment_folder=tmp_path)
+    output_root = replication_runner.get_output_root(1)
+    replication_runner.prepare_output_root(output_root)
+    with open(output_root / "analysis_solution" / "tr_statistics" / "tr_workload.json", "w") as f:
+        json.dump({"TR: 1": {"Wartend": 10.0}}, f)
+
+    # when
+    results = replication_runner.load_results(output_root)
+
+    # then
+    assert results["tr_workload"] == {"TR: 1": {"Wartend": 10.0}}
+    assert results["throughput_all_products"] is None
+    assert results["machine_workload"] is None
@@ -0,0 +1,31 @@
+from src.process_logic.reservation_table import ReservationTable
+
+
+def test_check_cell_is_free__overlapping_reservation_of_other_robot__not_free():
+    # given
+    reservation_table = ReservationTable()
+    reservation_table.reserve_cell("TR: 1", 12, 2.0, 4.0)
+
+    # when
+    cell_is_free_for_other_robot = reservation_table.check_cell_is_free(12, 4.0, 5.0, "TR: 2")
+    cell_is_free_for_own_robot = reservation_table.check_cell_is_free(12, 3.0, 5.0, "TR: 1")
+
+    # then
+    assert cell_is_free_for_other_robot is False
+    assert cell_is_free_for_own_robot is True
+
+
+def test_release__robot_with_reservations__every_reservation_removed():
+    # given
+    reservation_table = ReservationTable()
+    reservation_table.reserve_cell("TR: 1", 12, 2.0, 4.0)
+    reservation_table.reserve_cell("TR: 1", 13, 4.0, float("inf"))
+    reservation_table.reserve_cell("TR: 2", 13, 0.0, 1.0)
+
+    # when
+    reservation_table.release("TR: 1")
+
+    # then
+    assert reservation_table.check_entity_has_reservations("TR: 1") is False
+    assert reservation_table.check_cell_is_free(12, 0.0, 10.0, "TR: 3") is True
+    assert reservation_table.check_cell_is_free(13, 0.0, 1.0, "TR: 3") is False
@@ -0,0 +1,55 @@
+from datetime import date
+
+import pytest
+
+from src.provide_input_data.simulation_config import SimulationConfig
+
+
+def create_starting_conditions_dict() -> dict:
+    return {"production_layout_size_x": "100",
+            "production_layout_size_y": "80",
+            "starting_date_of_simulation": [2024, 5, 2],
+            "number_of_simulation_runs": "3",
+            "simulation_duration_in_days": "2",
+            "production_day_duration_in_h": "8",
+            "visualising_via_terminal(y/n)": "n",
+            "visualising_via_matplotlib(y/n)": "n",
+            "visualising_via_pygame(y/n)": "y",
+            "Topology_manager(No algorithm (1), QAP (2), GA (3), FDP(4)": 2}
+
+
+def test_from_dict__starting_conditions__converted_and_missing_flags_default_to_n():
+    # when
+    simulation_config = SimulationConfig.from_dict(create_starting_conditions_dict(), ["2024-05-02", "2024-05-03"])
+
+    # then
+    assert simulation_config.production_layout_size_y == 80
+    assert simulation_config.starting_date_of_simulation == date(2024, 5, 2)
+    assert simulation_config.visualising_via_pygame is True
+    assert simulation_config.event_driven_scheduling is False
+    assert simulation_config.topology_manager_method == 2
+    assert simulation_config.date_list == (date(2024, 5, 2), date(2024, 5, 3))
+    assert simulation_config.without_visualising().visualising_via_pygame is False
+
+
+def test_from_dict__invalid_values__value_error():
+    # given
+    invalid_flag = create_starting_conditions_dict()
+    invalid_flag["visualising_via_pygame(y/n)"] = "yes"
+    invalid_topology_manager = create_starting_conditions_dict()
+    invalid_topology_manager["Topology_manager(No algorithm (1), QAP (2), GA (3), FDP(4)"] = 6
+
+    # when / then
+    with pytest.raises(ValueError):
+        SimulationConfig.from_dict(invalid_flag, [])
+    with pytest.raises(ValueError):
+        SimulationConfig.from_dict(invalid_topology_manager, [])
+
+
+def test_from_resources__default_resources__valid_config():
+    # when
+    simulation_config = SimulationConfig.from_resources()
+
+    # then
+    assert simulation_config.number_of_simulation_runs > 0
+    assert len(simulation_config.date_list) > 0
@@ -0,0 +1,35 @@
+import pandas as pd
+
+from src.monitoring.data_analysis.trace_index import TraceIndex
+
+
+def create_data_entry(timestamp: float, entity_type: str, identification_str: str) -> dict:
+    return {"timestamp": timestamp,
+            "entities": [{"x": 1, "y": 1, "entity_type": entity_type, "entity_id": None,
+                          "entity_data": {"identification_str": identification_str}}]}
+
+
+def test_trace_index__unsorted_chunks_of_two_entities__grouped_and_sorted_by_timestamp():
+    # given
+    simulation_df = pd.DataFrame([[create_data_entry(5, "TransportRobot", "TR: 1"),
+                                   create_data_entry(5, "TransportRobot", "TR: 2")],
+                                  [create_data_entry(0, "TransportRobot", "TR: 1"), None]])
+
+    # when
+    trace_index = TraceIndex(simulation_df)
+
+    # then
+    assert trace_index.get_identification_str_list() == ["TR: 1", "TR: 2"]
+    assert [entry["timestamp"] for entry in trace_index.get_entity_data("TR: 1")] == [0, 5]
+    assert len(trace_index.get_entity_type_data("TransportRobot")) == 3
+
+
+def test_get_entity_data__unknown_entity__empty_list():
+    # given
+    trace_index = TraceIndex(pd.DataFrame([[create_data_entry(0, "Sink", "Sink")]]))
+
+    # when
+    entity_data = trace_index.get_entity_data("TR: 1")
+
+    # then
+    assert entity_data == []
@@ -0,0 +1,71 @@
+from src.monitoring.data_analysis.trace_repository import TraceRepository, get_files_signature
+from src.monitoring.trace_writer import TraceWriter
+
+
+def save_tr_trace(base_path, timestamps: list[int]):
+    trace_writer = TraceWriter()
+    trace_writer.append_records(
+        base_path / "entities_during_simulation_data" / "transport_robot" / "simulation_tr_trace.jsonl",
+        [{"timestamp": timestamp,
+          "entities": [{"x": 1, "y": 1, "entity_type": "TransportRobot", "entity_id": None,
+                        "entity_data": {"identification_str": "TR: 1"}}]} for timestamp in timestamps])
+    trace_writer.close()
+
+
+def test_get_trace_index__unchanged_folder__loaded_from_cache(tmp_path):
+    # given
+    save_tr_trace(tmp_path, [0, 1])
+    TraceRepository(tmp_path).get_trace_index("tr")
+    folder = tmp_path / "entities_during_simulation_data" / "transport_robot"
+
+    # when
+    cached_trace_index = TraceRepository(tmp_path).load_cached_trace_index("tr", get_files_signature(folder))
+
+    # then
+    assert cached_trace_index is not None
+    assert len(cached_trace_index.get_entity_data("TR: 1")) == 2
+
+
+def test_get_trace_index__trace_changed__loaded_again(tmp_path):
+    # given
+    save_tr_trace(tmp_path, [0, 1])
+    trace_repository = TraceRepository(tmp_path)
+    trace_repository.get_trace_index("tr")
+
+    # when
+    save_tr_trace(tmp_path, [2])
+    trace_index = trace_repository.get_trace_index("tr")
+
+    # then
+    assert [entry["timestamp"] for entry in trace_index.get_entity_data("TR: 1")] == [0, 1, 2]
+
+
+def test_get_files_signature__trace_cache__not_part_of_the_signature(tmp_path):
+    # given
+    save_tr_trace(tmp_path, [0])
+    signature = get_files_signature(tmp_path)
+
+    # when
+    (tmp_path / "trace_cache").mkdir()
+    (tmp_path / "trace_cache" / "tr_trace_index.pickle").write_bytes(b"cache")
+
+    # then
+    assert get_files_signature(tmp_path) == signature
+
+
+def test_load_cached_trace_index__unreadable_cache__none_and_cache_written_again(tmp_path):
+    # given
+    save_tr_trace(tmp_path, [0, 1])
+    (tmp_path / "trace_cache").mkdir()
+    (tmp_path / "trace_cache" / "tr_trace_index.pickle").write_bytes(b"\x80\x09unsupported protocol")
+    trace_repository = TraceRepository(tmp_path)
+    folder = tmp_path / "entities_during_simulation_data" / "transport_robot"
+
+    # when
+    cached_trace_index = trace_repository.load_cached_trace_index("tr", get_files_signature(folder))
+    trace_repository.get_trace_index("tr")
+
+    # then
+    assert cached_trace_index is None
+    assert TraceRepository(tmp_path).load_cached_trace_index("tr", get_files_signature(folder)) is not None
+    assert [path.name for path in (tmp_path / "trace_cache").iterdir()] == ["tr_trace_index.pickle"]
@@ -0,0 +1,74 @@
+import pytest
+
+from src.monitoring.trace_writer import TraceWriter, BackgroundTraceWriter, read_trace_file, find_trace_file
+
+
+def test_append_records__two_appends__every_record_in_saving_order(tmp_path):
+    # given
+    trace_file = tmp_path / "transport_robot" / "simulation_tr_trace.jsonl"
+    trace_writer = TraceWriter()
+
+    # when
+    trace_writer.append_records(trace_file, [{"timestamp": 0, "entities": []}, {"timestamp": 1, "entities": []}])
+    trace_writer.flush()
+    trace_writer.append_records(trace_file, [{"timestamp": 5, "entities": []}])
+    trace_writer.close()
+
+    # then
+    assert [record["timestamp"] for record in read_trace_file(trace_file)] == [0, 1, 5]
+
+
+def test_append_records__no_records__no_file_created(tmp_path):
+    # given
+    trace_file = tmp_path / "simulation_wr_trace.jsonl"
+    trace_writer = TraceWriter()
+
+    # when
+    trace_writer.append_records(trace_file, [])
+    trace_writer.close()
+
+    # then
+    assert trace_file.exists() is False
+
+
+def test_read_trace_file__incomplete_last_line__complete_records_returned(tmp_path):
+    # given
+    trace_file = tmp_path / "simulation_machine_trace.jsonl"
+    trace_file.write_text('{"timestamp": 0}\n{"timestamp": 1}\n{"timest', encoding="utf-8")
+
+    # when
+    records = read_trace_file(trace_file)
+
+    # then
+    assert records == [{"timestamp": 0}, {"timestamp": 1}]
+
+
+def test_background_trace_writer__small_queue_and_compression__every_record_saved_after_close(tmp_path):
+    # given
+    trace_file = tmp_path / "simulation_machine_trace.jsonl"
+    background_trace_writer = BackgroundTraceWriter(TraceWriter(compress=True), max_queue_size=2)
+
+    # when
+    for timestamp in range(100):
+        background_trace_writer.append_records(trace_file, [{"timestamp": timestamp}])
+    background_trace_writer.flush()
+    background_trace_writer.close()
+
+    # then
+    saved_trace_file = find_trace_file(trace_file)
+    assert saved_trace_file.name == "simulation_machine_trace.jsonl.gz"
+    assert [record["timestamp"] for record in read_trace_file(saved_trace_file)] == list(range(100))
+
+
+def test_background_trace_writer__writing_fails__error_raised_in_simulation(tmp_path):
+    # given
+    blocking_file = tmp_path / "no_folder"
+    blocking_file.write_text("")
+    background_trace_writer = BackgroundTraceWriter(TraceWriter())
+
+    # when
+    background_trace_writer.append_records(blocking_file / "simulation_wr_trace.jsonl", [{"timestamp": 0}])
+
+    # then
+    with pytest.raises(RuntimeError):
+        background_trace_writer.close()
@@ -0,0 +1,140 @@
+import json
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.constant.constant import MachineWorkingRobotStatus, MachineStorageStatus
+from src.monitoring.columnar_trace import ColumnarTraceWriter, ColumnarTrace
+from src.monitoring.data_analysis.machine_data.machine_workload import MachineWorkload
+import src.monitoring.data_analysis.machine_data.machine_workload
+from src.monitoring.data_analysis.workload_engine import WorkloadEngine
+
+
+def create_workload_engine() -> WorkloadEngine:
+    return WorkloadEngine({"TR: 1": [(0, "Wartend"), (10, "In Bewegung"), (15, "Wartend"), (30, "Wartend")],
+                           "TR: 2": [(5, "In Bewegung")]})
+
+
+def create_machine_data_entry(timestamp: float, identification_str: str, wr_status: MachineWorkingRobotStatus,
+                              number_of_processing_orders: int) -> dict:
+    return {"timestamp": timestamp,
+            "entities": [{"x": 0, "y": 0,
+                          "entity_data": {"identification_str": identification_str,
+                                          "working_status": {
+                                              "working_robot_status": wr_status.value,
+                                              "storage_status": MachineStorageStatus.INPUT_EMPTY.value},
+                                          "Processing Order List": [{}] * number_of_processing_orders}}]}
+
+
+def test_calculate_status_times__no_time_window__time_counts_for_the_status_of_the_first_action():
+    # given
+    workload_engine = create_workload_engine()
+
+    # when
+    status_times_dict = workload_engine.calculate_status_times()
+
+    # then
+    assert status_times_dict == {"TR: 1": {"Wartend": 25.0, "In Bewegung": 5.0}, "TR: 2": {}}
+
+
+def test_calculate_status_times__time_window__only_actions_inside_the_window():
+    # given
+    workload_engine = create_workload_engine()
+
+    # when
+    status_times_dict = workload_engine.calculate_status_times(start_time=10, end_time=15)
+
+    # then
+    assert status_times_dict["TR: 1"] == {"In Bewegung": 5.0, "Wartend": 0.0}
+
+
+def test_calculate_status_times_per_window__two_windows__intervals_cut_at_the_window_edge():
+    # given
+    workload_engine = create_workload_engine()
+
+    # when
+    status_times_dict = workload_engine.calculate_status_times_per_window([0, 12, 30])
+
+    # then
+    assert workload_engine.status_list == ["Wartend", "In Bewegung"]
+    assert np.array_equal(status_times_dict["TR: 1"], [[10, 2], [15, 3]])
+    assert np.array_equal(status_times_dict["TR: 2"], [[0, 0], [0, 0]])
+
+
+def test_from_snapshots__action_of_another_entity__skipped():
+    # given
+    every_tr_during_simulation_data = {
+        "TR: 1": [{"timestamp": 0, "entities": [{"entity_data": {"identification_str": "TR: 2", "status": "B"}}]},
+                  {"timestamp": 1, "entities": [{"entity_data": {"identification_str": "TR: 1", "status": "A"}}]},
+                  {"timestamp": 4, "entities": [{"entity_data": {"identification_str": "TR: 1", "status": "B"}}]}]}
+
+    # when
+    workload_engine = WorkloadEngine.from_snapshots(every_tr_during_simulation_data,
+                                                    lambda entity_data: entity_data["status"])
+
+    # then
+    assert workload_engine.calculate_status_times() == {"TR: 1": {"A": 3.0, "B": 0.0}}
+
+
+def test_from_columnar_trace__machine_actions__same_machine_workload_as_from_snapshots(tmp_path):
+    # given
+    every_machine_during_simulation_data = {
+        "Ma: 1": [create_machine_data_entry(0, "Ma: 1", MachineWorkingRobotStatus.NO_WR, 0),
+                  create_machine_data_entry(10, "Ma: 1", MachineWorkingRobotStatus.NO_WR, 1),
+                  create_machine_data_entry(15, "Ma: 1", MachineWorkingRobotStatus.WR_PRESENT, 1),
+                  create_machine_data_entry(40, "Ma: 1", MachineWorkingRobotStatus.NO_WR, 0)],
+        "Ma: 2": [create_machine_data_entry(5, "Ma: 2", MachineWorkingRobotStatus.WAITING_WR, 2),
+                  create_machine_data_entry(30, "Ma: 2", MachineWorkingRobotStatus.WR_PRESENT, 2)]}
+    columnar_trace_writer = ColumnarTraceWriter(tmp_path, "machine")
+    for data_entry in sorted([data_entry for data_entry_list in every_machine_during_simulation_data.values()
+                              for data_entry in data_entry_list], key=lambda data_entry: data_entry["timestamp"]):
+        columnar_trace_writer.add_data_entry(data_entry)
+    columnar_trace_writer.close()
+    creating_machine_during_simulation_dict = SimpleNamespace(
+        every_machine_during_simulation_data=every_machine_during_simulation_data,
+        every_machine_identification_str_list=["Ma: 1", "Ma: 2"])
+
+    # when
+    columnar_machine_workload = MachineWorkload(None, columnar_trace=ColumnarTrace(tmp_path, "machine"))
+
+    # then
+    machine_workload = MachineWorkload(creating_machine_during_simulation_dict)
+    assert columnar_machine_workload.workload_dict == machine_workload.workload_dict == \
+           {"Ma: 1": {"Wartet auf Material": 25.0, "Leerlauf": 10.0, "Wartet auf WR": 5.0},
+            "Ma: 2": {"Wartet auf WR": 25.0}}
+    assert columnar_machine_workload.workload_engine.status_list == machine_workload.workload_engine.status_list
+
+
+def test_calculate_status_time_dicts_per_window__two_windows__status_times_of_every_window():
+    # given
+    workload_engine = create_workload_engine()
+
+    # when
+    status_time_dicts = workload_engine.calculate_status_time_dicts_per_window([0, 12, 30])
+
+    # then
+    assert status_time_dicts["TR: 1"] == [{"Wartend": 10.0, "In Bewegung": 2.0}, {"Wartend": 15.0, "In Bewegung": 3.0}]
+    assert status_time_dicts["TR: 2"] == [{}, {}]
+
+
+def test_save_workload_per_day__two_production_days__grouped_status_times_and_chart_per_day(tmp_path, monkeypatch):
+    # given
+    monkeypatch.setattr(src.monitoring.data_analysis.machine_data.machine_workload, "MACHINE_WORKLOAD", tmp_path)
+    creating_machine_during_simulation_dict = SimpleNamespace(
+        every_machine_during_simulation_data={
+            "Ma: 1": [create_machine_data_entry(0, "Ma: 1", MachineWorkingRobotStatus.NO_WR, 0),
+                      create_machine_data_entry(28000, "Ma: 1", MachineWorkingRobotStatus.NO_WR, 1),
+                      create_machine_data_entry(30000, "Ma: 1", MachineWorkingRobotStatus.NO_WR, 1)]},
+        every_machine_identification_str_list=["Ma: 1"])
+    machine_workload = MachineWorkload(creating_machine_during_simulation_dict)
+
+    # when
+    machine_workload.save_workload_per_day()
+
+    # then
+    with open(tmp_path / "machine_workload_per_day.json", encoding="utf-8") as f:
+        workload_per_day = json.load(f)
+    assert workload_per_day["window_edges"] == [0, 28800, 57600]
+    assert workload_per_day["workload"]["Ma: 1"] == [{"Leerlauf": 28000.0, "Wartet auf WR": 800.0},
+                                                     {"Wartet auf WR": 1200.0}]
+    assert (tmp_path / "Ma-_1_status_per_day_chart.png").exists()